@@ -0,0 +1 @@
+# mb-keyword-analysis retrieval package
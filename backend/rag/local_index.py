@@ -0,0 +1,325 @@
+"""
+Quantized, memory-mapped vector index for the knowledge base.
+
+A read-only alternative to Chroma for retrieval. RAGPipeline exports the
+collection into a directory; loading it maps the embedding matrix instead of
+opening SQLite and an HNSW graph, and queries run an exact brute-force top-k
+with vectorized metadata filtering.
+
+Index directory layout:
+- manifest.json     dtype, dimension, count and the metadata column schema
+- embeddings.npy    (count, dim) int8 or float16 matrix, memory-mapped on load
+- scales.npy        per-row dequantization scale (int8 only)
+- sq_norms.npy      squared L2 norm of each original float32 row
+- columns.npz       one array per metadata key (category codes or numbers)
+- documents.bin     UTF-8 chunk texts back to back
+- doc_offsets.npy   (count + 1) byte offsets into documents.bin
+
+Distances are squared L2, matching Chroma's default collection space, so
+results are drop-in for code that consumes `collection.query(...)` output.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_INDEX_PATH = os.path.join(BASE_DIR, "backend", "knowledge_base", "vector_index")
+
+FORMAT_VERSION = 1
+SUPPORTED_DTYPES = ("int8", "float16")
+
+
+# ---- Writer ---------------------------------------------------------------
+
+
+def _column_kind(values: Sequence[object]) -> str:
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return "bool"
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    return "str"
+
+
+def write_local_index(
+    path: str,
+    ids: Sequence[str],
+    documents: Sequence[str],
+    metadatas: Sequence[Dict[str, object]],
+    embeddings,
+    dtype: str = "int8",
+) -> int:
+    """Write an index directory from parallel id/document/metadata/embedding lists."""
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}. Choose from {', '.join(SUPPORTED_DTYPES)}")
+    os.makedirs(path, exist_ok=True)
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    count = len(ids)
+    if matrix.ndim != 2 or matrix.shape[0] != count:
+        raise ValueError(f"Expected {count} embeddings, got array of shape {matrix.shape}")
+
+    np.save(os.path.join(path, "sq_norms.npy"), np.einsum("ij,ij->i", matrix, matrix))
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        np.save(os.path.join(path, "embeddings.npy"), codes)
+        np.save(os.path.join(path, "scales.npy"), scales.astype(np.float32))
+    else:
+        np.save(os.path.join(path, "embeddings.npy"), matrix.astype(np.float16))
+
+    encoded = [doc.encode("utf-8") for doc in documents]
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    with open(os.path.join(path, "documents.bin"), "wb") as f:
+        for blob in encoded:
+            f.write(blob)
+    np.save(os.path.join(path, "doc_offsets.npy"), offsets)
+
+    keys = sorted({k for meta in metadatas for k in meta})
+    columns: Dict[str, np.ndarray] = {}
+    schema: Dict[str, Dict[str, object]] = {}
+    for key in keys:
+        values = [meta.get(key) for meta in metadatas]
+        kind = _column_kind(values)
+        if kind == "str":
+            vocab = sorted({str(v) for v in values if v is not None})
+            lookup = {v: i for i, v in enumerate(vocab)}
+            columns[key] = np.array(
+                [lookup[str(v)] if v is not None else -1 for v in values], dtype=np.int32
+            )
+            schema[key] = {"kind": kind, "vocab": vocab}
+        else:
+            columns[key] = np.array(
+                [float(v) if v is not None else np.nan for v in values], dtype=np.float64
+            )
+            schema[key] = {"kind": kind}
+    np.savez(os.path.join(path, "columns.npz"), **columns)
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "dtype": dtype,
+        "count": count,
+        "dimension": int(matrix.shape[1]) if count else 0,
+        "space": "l2",
+        "ids": list(ids),
+        "columns": schema,
+    }
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return count
+
+
+# ---- Reader ---------------------------------------------------------------
+
+
+def default_embedding_function() -> Callable[[List[str]], List[List[float]]]:
+    """Chroma's default MiniLM embedder, so query vectors match the exported ones."""
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    return DefaultEmbeddingFunction()
+
+
+class LocalVectorIndex:
+    """Exact top-k search over an exported index, mirroring Chroma's query/count/get API."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    ):
+        self.path = path
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index version in {path}: {self.manifest.get('version')}")
+
+        self.ids: List[str] = self.manifest["ids"]
+        self.dtype: str = self.manifest["dtype"]
+        self._schema: Dict[str, Dict[str, object]] = self.manifest["columns"]
+        self._embeddings = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        self._scales = (
+            np.load(os.path.join(path, "scales.npy")) if self.dtype == "int8" else None
+        )
+        self._sq_norms = np.load(os.path.join(path, "sq_norms.npy"))
+        self._offsets = np.load(os.path.join(path, "doc_offsets.npy"))
+        # np.memmap refuses empty files, which an empty export produces.
+        if self._offsets[-1]:
+            self._documents = np.memmap(os.path.join(path, "documents.bin"), dtype=np.uint8, mode="r")
+        else:
+            self._documents = np.zeros(0, dtype=np.uint8)
+        with np.load(os.path.join(path, "columns.npz")) as columns:
+            self._columns = {key: columns[key] for key in columns.files}
+        self._embedding_function = embedding_function
+
+    # -- Chroma-compatible surface -----------------------------------------
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        query_embeddings=None,
+        n_results: int = 10,
+        where: Optional[Dict[str, object]] = None,
+        include: Sequence[str] = ("documents", "metadatas", "distances"),
+    ) -> Dict[str, list]:
+        if query_embeddings is None:
+            if query_texts is None:
+                raise ValueError("Provide query_texts or query_embeddings")
+            if self._embedding_function is None:
+                self._embedding_function = default_embedding_function()
+            query_embeddings = self._embedding_function(list(query_texts))
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+
+        candidates = np.flatnonzero(self._filter_mask(where))
+        results: Dict[str, list] = {"ids": []}
+        for key in include:
+            results[key] = []
+
+        for query in queries:
+            top, distances = self._top_k(query, candidates, n_results)
+            results["ids"].append([self.ids[i] for i in top])
+            if "documents" in include:
+                results["documents"].append([self._document(i) for i in top])
+            if "metadatas" in include:
+                results["metadatas"].append([self._metadata(i) for i in top])
+            if "distances" in include:
+                results["distances"].append(distances.tolist())
+            if "embeddings" in include:
+                results["embeddings"].append(self._dequantize(top))
+        return results
+
+    def get(
+        self,
+        where: Optional[Dict[str, object]] = None,
+        include: Sequence[str] = ("documents", "metadatas"),
+    ) -> Dict[str, list]:
+        rows = np.flatnonzero(self._filter_mask(where))
+        results: Dict[str, list] = {"ids": [self.ids[i] for i in rows]}
+        if "documents" in include:
+            results["documents"] = [self._document(i) for i in rows]
+        if "metadatas" in include:
+            results["metadatas"] = [self._metadata(i) for i in rows]
+        if "embeddings" in include:
+            results["embeddings"] = self._dequantize(rows)
+        return results
+
+    # -- Internals ----------------------------------------------------------
+
+    def _top_k(self, query: np.ndarray, candidates: np.ndarray, n_results: int):
+        if candidates.size == 0 or n_results <= 0:
+            return candidates[:0], np.zeros(0, dtype=np.float32)
+        block = np.asarray(self._embeddings[candidates], dtype=np.float32)
+        dots = block @ query
+        if self._scales is not None:
+            dots *= self._scales[candidates]
+        distances = self._sq_norms[candidates] + float(query @ query) - 2.0 * dots
+        np.maximum(distances, 0.0, out=distances)
+
+        k = min(n_results, candidates.size)
+        part = np.argpartition(distances, k - 1)[:k] if k < candidates.size else np.arange(candidates.size)
+        order = part[np.argsort(distances[part], kind="stable")]
+        return candidates[order], distances[order]
+
+    def _dequantize(self, rows: np.ndarray) -> np.ndarray:
+        block = np.asarray(self._embeddings[rows], dtype=np.float32)
+        if self._scales is not None:
+            block *= self._scales[rows][:, None]
+        return block
+
+    def _document(self, row: int) -> str:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return bytes(self._documents[start:end]).decode("utf-8")
+
+    def _metadata(self, row: int) -> Dict[str, object]:
+        meta: Dict[str, object] = {}
+        for key, spec in self._schema.items():
+            value = self._columns[key][row]
+            if spec["kind"] == "str":
+                if value >= 0:
+                    meta[key] = spec["vocab"][value]
+            elif not np.isnan(value):
+                if spec["kind"] == "int":
+                    meta[key] = int(value)
+                elif spec["kind"] == "bool":
+                    meta[key] = bool(value)
+                else:
+                    meta[key] = float(value)
+        return meta
+
+    def _filter_mask(self, where: Optional[Dict[str, object]]) -> np.ndarray:
+        """Evaluate a Chroma-style `where` filter into a boolean row mask."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if not where:
+            return mask
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(len(self.ids), dtype=bool)
+                for clause in condition:
+                    any_mask |= self._filter_mask(clause)
+                mask &= any_mask
+            elif isinstance(condition, dict):
+                for op, operand in condition.items():
+                    mask &= self._compare(key, op, operand)
+            else:
+                mask &= self._compare(key, "$eq", condition)
+        return mask
+
+    def _compare(self, key: str, op: str, operand) -> np.ndarray:
+        # Like Chroma, documents without the key match no condition on it,
+        # $ne and $nin included
+        if key not in self._columns:
+            return np.zeros(len(self.ids), dtype=bool)
+        column = self._columns[key]
+        spec = self._schema[key]
+
+        if spec["kind"] == "str":
+            vocab = spec["vocab"]
+            present = column >= 0
+
+            def encode(value):
+                return vocab.index(value) if value in vocab else -2
+
+            if op == "$eq":
+                return column == encode(operand)
+            if op == "$ne":
+                return (column != encode(operand)) & present
+            if op in ("$in", "$nin"):
+                hit = np.isin(column, [encode(v) for v in operand])
+                return hit if op == "$in" else ~hit & present
+            raise ValueError(f"Operator {op} is not supported for string field {key}")
+
+        present = ~np.isnan(column)
+        comparisons = {
+            "$eq": np.equal,
+            "$ne": np.not_equal,
+            "$gt": np.greater,
+            "$gte": np.greater_equal,
+            "$lt": np.less,
+            "$lte": np.less_equal,
+        }
+        if op not in comparisons and op not in ("$in", "$nin"):
+            raise ValueError(f"Unsupported operator: {op}")
+        try:
+            if op in ("$in", "$nin"):
+                hit = np.isin(column, [float(v) for v in operand])
+                return hit if op == "$in" else ~hit & present
+            return comparisons[op](column, float(operand)) & present
+        except (TypeError, ValueError):
+            # A non-numeric operand matches no document of a numeric field
+            return np.zeros(len(self.ids), dtype=bool)
@@ -0,0 +1,392 @@
+"""
+Shared retrieval over the Monday Brew Google Ads knowledge base.
+
+Used by the MCP server (mcp-servers/google-ads-rag/server.py) and by
+scripts/consult_rag.py so ranking, packing and index resolution live in one
+place:
+- opens ChromaDB or the memory-mapped local index (RAG_BACKEND=local)
+- metadata-aware reranking and token-budgeted MMR packing
+- an optional long-lived Unix-socket daemon that keeps the index and
+  embedding model warm for CLI consults
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import signal
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from backend.rag.local_index import DEFAULT_INDEX_PATH, LocalVectorIndex
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# Same location scripts/rag_pipeline.py builds into, falling back to the
+# database shipped in the repo until the pipeline has been run.
+PIPELINE_CHROMA_PATH = os.path.join(BASE_DIR, "backend", "knowledge_base", "chroma_db")
+SHIPPED_CHROMA_PATH = os.path.join(BASE_DIR, "knowledge_base", "chroma_db")
+CHROMA_PATH = os.getenv(
+    "RAG_CHROMA_PATH",
+    PIPELINE_CHROMA_PATH if os.path.exists(PIPELINE_CHROMA_PATH) else SHIPPED_CHROMA_PATH,
+)
+LOCAL_INDEX_PATH = os.getenv("RAG_LOCAL_INDEX", DEFAULT_INDEX_PATH)
+COLLECTION_NAME = "agency_knowledge"
+SOCKET_PATH = os.getenv(
+    "RAG_SOCKET", os.path.join(tempfile.gettempdir(), f"mb-keyword-rag-{os.getuid()}.sock")
+)
+
+TASK_QUERIES = {
+    "keyword_research": "keyword research methodology iterative approach match types seed keywords",
+    "ad_copy": "RSA responsive search ads headlines descriptions sentence case best practices",
+    "campaign_structure": "campaign naming convention ad group structure URL strategy",
+    "audit": "account audit optimization recommendations quality score",
+}
+
+
+# ---- Index access ---------------------------------------------------------
+
+_collection = None
+_collection_lock = threading.Lock()
+
+
+def open_collection(backend: Optional[str] = None):
+    """Open the configured backend: "local" for the mmap index, otherwise ChromaDB."""
+    backend = (backend or os.getenv("RAG_BACKEND", "chroma")).lower()
+    if backend == "local":
+        return LocalVectorIndex(LOCAL_INDEX_PATH)
+
+    import chromadb
+
+    # Ensure the path exists to avoid errors, though it should exist if DB is built
+    if not os.path.exists(CHROMA_PATH):
+        print(f"WARNING: ChromaDB path not found at {CHROMA_PATH}")
+    client = chromadb.PersistentClient(path=CHROMA_PATH)
+    # Use default embedding function (all-MiniLM-L6-v2)
+    return client.get_collection(name=COLLECTION_NAME)
+
+
+def get_collection():
+    """Process-wide collection, opened on first use."""
+    global _collection
+    if _collection is None:
+        with _collection_lock:
+            if _collection is None:
+                _collection = open_collection()
+    return _collection
+
+
+# ---- Ranking --------------------------------------------------------------
+
+def _rerank(results, boost_agency: bool = True):
+    """Apply lightweight reranking using relevance_score/priority from metadata."""
+    docs = results.get("documents", [[]])[0]
+    metas = results.get("metadatas", [[]])[0]
+    dists = results.get("distances", [[]])[0]
+    embeddings = results.get("embeddings")
+    embeddings = embeddings[0] if embeddings is not None else [None] * len(docs)
+    scored = []
+    for doc, meta, dist, emb in zip(docs, metas, dists, embeddings):
+        score = dist
+        priority = meta.get("priority", 1)
+        relevance = meta.get("relevance_score", 0)
+        if boost_agency and meta.get("source_kind") == "agency":
+            score -= 0.2
+        score -= 0.1 * (priority - 1)
+        score -= 0.05 * relevance
+        scored.append((score, doc, meta, emb))
+    scored.sort(key=lambda x: x[0])
+    return scored
+
+
+# ---- Token-budgeted packing ------------------------------------------------
+
+# Rough chars-per-token ratio for English/Danish prose with MiniLM-era tokenizers.
+CHARS_PER_TOKEN = 4
+# Candidates fetched per requested result when packing, so MMR has room to diversify.
+CANDIDATE_MULTIPLIER = 3
+# Relevance vs. novelty trade-off for MMR (1.0 = pure relevance).
+MMR_LAMBDA = 0.7
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def _split_chunk(doc: str):
+    """Split a chunk built by rag_pipeline.build_chunk_text into (section, highlights, body)."""
+    header, _, rest = doc.partition("\n")
+    section = None
+    if header.startswith("Source:"):
+        _, _, section = header.partition(" | Section: ")
+        section = section or None
+    else:
+        rest = doc
+    highlights = []
+    if rest.startswith("Highlights:\n"):
+        block, _, body = rest[len("Highlights:\n"):].partition("\nContext: ")
+        highlights = [line[2:].strip() for line in block.splitlines() if line.startswith("- ")]
+    else:
+        body = rest
+    return section, highlights, body.strip()
+
+
+def _word_set(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def _similarity_matrix(reranked) -> np.ndarray:
+    """Pairwise cosine similarity of candidate embeddings, or word-set Jaccard without them."""
+    embeddings = [item[3] for item in reranked]
+    if all(emb is not None for emb in embeddings):
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1.0, norms)
+        return matrix @ matrix.T
+    words = [_word_set(item[1]) for item in reranked]
+    sims = np.zeros((len(words), len(words)), dtype=np.float32)
+    for i, a in enumerate(words):
+        for j in range(i + 1, len(words)):
+            union = len(a | words[j])
+            sims[i, j] = sims[j, i] = len(a & words[j]) / union if union else 0.0
+    return sims
+
+
+def _mmr_order(reranked, lambda_mult: float = MMR_LAMBDA):
+    """Order reranked candidates by maximal marginal relevance."""
+    if not reranked:
+        return []
+    scores = np.array([item[0] for item in reranked], dtype=np.float32)
+    spread = float(scores.max() - scores.min()) or 1.0
+    relevance = (scores.max() - scores) / spread
+    sims = _similarity_matrix(reranked)
+
+    max_sim = np.zeros(len(reranked), dtype=np.float32)
+    available = np.ones(len(reranked), dtype=bool)
+    order = []
+    for _ in range(len(reranked)):
+        mmr = lambda_mult * relevance - (1 - lambda_mult) * max_sim
+        pick = int(np.argmax(np.where(available, mmr, -np.inf)))
+        available[pick] = False
+        order.append(reranked[pick])
+        max_sim = np.maximum(max_sim, sims[pick])
+    return order
+
+
+def _truncate_sentences(text: str, max_tokens: int) -> str:
+    """Keep whole leading sentences of text that fit within max_tokens."""
+    kept = []
+    used = 0
+    for sentence in re.split(r"(?<=[.!?])\s+", text):
+        cost = _estimate_tokens(sentence + " ")
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+    return " ".join(kept)
+
+
+def _format_result(score, doc, metadata, body=None, highlights=None, section=None) -> str:
+    source = metadata.get("source", "Unknown")
+    doc_type = metadata.get("content_type", metadata.get("type", "Unknown"))
+    topic_meta = metadata.get("topic", "")
+    title = f"**[{doc_type}] {source}** (topic: {topic_meta}, score: {score:.3f})"
+    if body is None:
+        return f"{title}\n{doc}\n"
+    lines = [title]
+    if section:
+        lines.append(f"Section: {section}")
+    if highlights:
+        lines.append("Highlights:\n" + "\n".join(f"- {h}" for h in highlights))
+    if body:
+        lines.append(body)
+    return "\n".join(lines) + "\n"
+
+
+def _pack_results(reranked, n_results: int, max_tokens: int) -> list:
+    """
+    Select and compact results to fit a token budget.
+
+    Candidates are diversified with MMR, highlights already shown in an earlier
+    result are dropped, the redundant "Source:" header is folded into the title,
+    and the last result that does not fit is cut at a sentence boundary.
+    """
+    separator_cost = _estimate_tokens("\n---\n")
+    budget = max_tokens
+    seen_highlights = set()
+    output = []
+    for score, doc, metadata, _ in _mmr_order(reranked):
+        if len(output) >= n_results or budget <= 0:
+            break
+        section, highlights, body = _split_chunk(doc)
+        fresh = [h for h in highlights if h not in seen_highlights]
+        if output:
+            budget -= separator_cost
+        entry = _format_result(score, doc, metadata, body, fresh, section)
+        cost = _estimate_tokens(entry)
+        if cost > budget:
+            frame = _estimate_tokens(_format_result(score, doc, metadata, "", fresh, section))
+            if frame >= budget:
+                break
+            body = _truncate_sentences(body, budget - frame)
+            if not body and not fresh:
+                break
+            entry = _format_result(score, doc, metadata, body, fresh, section)
+            cost = _estimate_tokens(entry)
+        seen_highlights.update(fresh)
+        output.append(entry)
+        budget -= cost
+    return output
+
+
+def query_knowledge(
+    query: str,
+    n_results: int = 10,
+    topic: Optional[str] = None,
+    content_type: Optional[str] = None,
+    boost_agency: bool = True,
+    max_tokens: Optional[int] = None,
+    collection=None,
+) -> str:
+    """Query the knowledge base and return formatted results (see server.query_knowledge)."""
+    where_filter = {}
+    if content_type:
+        where_filter["content_type"] = content_type
+    if topic:
+        where_filter["topic"] = topic
+    if not where_filter:
+        where_filter = None
+
+    include = ["documents", "metadatas", "distances"]
+    n_candidates = n_results
+    if max_tokens:
+        include.append("embeddings")
+        n_candidates = n_results * CANDIDATE_MULTIPLIER
+
+    try:
+        results = (collection or get_collection()).query(
+            query_texts=[query],
+            n_results=n_candidates,
+            where=where_filter,
+            include=include,
+        )
+
+        reranked = _rerank(results, boost_agency=boost_agency)
+        if max_tokens:
+            output = _pack_results(reranked, n_results, max_tokens)
+        else:
+            output = [
+                _format_result(score, doc, metadata)
+                for score, doc, metadata, _ in reranked[:n_results]
+            ]
+
+        if not output:
+            return "No relevant knowledge found."
+
+        return "\n---\n".join(output)
+    except Exception as e:
+        return f"Error querying knowledge base: {str(e)}"
+
+
+def get_methodology(task_type: str, n_results: int = 15, max_tokens: Optional[int] = 3000) -> str:
+    query = TASK_QUERIES.get(task_type, task_type)
+    return query_knowledge(
+        query, n_results=n_results, content_type="methodology", max_tokens=max_tokens
+    )
+
+
+def count() -> int:
+    return get_collection().count()
+
+
+# ---- Daemon ---------------------------------------------------------------
+
+# Calls the daemon will answer; arguments are passed through as keyword args.
+DAEMON_CALLS = {
+    "query_knowledge": query_knowledge,
+    "get_methodology": get_methodology,
+    "count": count,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON response line out."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                func = DAEMON_CALLS.get(request.get("call"))
+                if func is None:
+                    raise ValueError(f"Unknown call: {request.get('call')}")
+                with self.server.query_lock:
+                    response = {"ok": True, "result": func(**request.get("args", {}))}
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path, _RequestHandler)
+        self.query_lock = threading.Lock()
+
+
+def serve(socket_path: str = SOCKET_PATH) -> None:
+    """Run the query daemon in the foreground with the index (and embedder) kept warm."""
+    if os.path.exists(socket_path):
+        if daemon_available(socket_path):
+            raise RuntimeError(f"A RAG daemon is already listening on {socket_path}")
+        os.unlink(socket_path)
+
+    collection = get_collection()
+    # Warm the embedding model so the first consult is as fast as the rest.
+    collection.query(query_texts=["warmup"], n_results=1)
+
+    server = _DaemonServer(socket_path)
+    os.chmod(socket_path, 0o600)
+    # Treat SIGTERM like Ctrl-C so the socket file is removed on shutdown.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"RAG daemon listening on {socket_path} ({collection.count()} documents)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def call_daemon(
+    call: str,
+    args: Optional[Dict[str, object]] = None,
+    socket_path: str = SOCKET_PATH,
+    timeout: float = 30.0,
+):
+    """Send one call to the daemon. Raises OSError when no daemon is listening."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"call": call, "args": args or {}}).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "RAG daemon call failed"))
+    return response["result"]
+
+
+def daemon_available(socket_path: str = SOCKET_PATH) -> bool:
+    try:
+        call_daemon("count", socket_path=socket_path, timeout=2.0)
+        return True
+    except (OSError, ValueError, RuntimeError):
+        return False
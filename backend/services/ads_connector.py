@@ -12,20 +12,30 @@ if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
 import os
-from google.ads.googleads.client import GoogleAdsClient
-from google.ads.googleads.errors import GoogleAdsException
-from google.api_core import protobuf_helpers
-import pandas as pd
 from datetime import datetime, timedelta
 from backend.services.credentials import ensure_credentials
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[AdsConnector] Credentials loaded from: {_cred_source}")
+# google-ads is imported on first AdsConnector() (see _import_dependencies);
+# pandas only by the methods that return DataFrames
+GoogleAdsClient = None
+GoogleAdsException = None
+protobuf_helpers = None
+
+
+def _import_dependencies():
+    global GoogleAdsClient, GoogleAdsException, protobuf_helpers
+    if GoogleAdsClient is not None:
+        return
+    from google.ads.googleads.client import GoogleAdsClient
+    from google.ads.googleads.errors import GoogleAdsException
+    from google.api_core import protobuf_helpers
 
 
 class AdsConnector:
     def __init__(self):
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+        _import_dependencies()
         try:
             config = {
                 "developer_token": os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN"),
@@ -81,6 +91,8 @@ class AdsConnector:
         """
         Fetches auction insights for campaigns.
         """
+        import pandas as pd
+
         query = f"""
             SELECT
                 segments.date,
@@ -1726,6 +1738,8 @@ class AdsConnector:
         """
         Fetches audience performance (Campaign Audience View).
         """
+        import pandas as pd
+
         query = f"""
             SELECT
                 campaign.id,
@@ -12,18 +12,26 @@ if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
 import os
-from google.cloud import bigquery
-from google.oauth2 import service_account
-import pandas as pd
 from backend.services.credentials import ensure_credentials
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[BigQueryManager] Credentials loaded from: {_cred_source}")
+# google-cloud-bigquery is imported on first BigQueryManager()
+bigquery = None
+
+
+def _import_dependencies():
+    global bigquery
+    if bigquery is not None:
+        return
+    from google.cloud import bigquery
 
 
 class BigQueryManager:
     def __init__(self):
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+        _import_dependencies()
+        from google.oauth2 import service_account
+
         self.project_id = os.getenv("BIGQUERY_PROJECT_ID")
         key_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
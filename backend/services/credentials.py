@@ -1,6 +1,9 @@
 """
 Central credentials loader for mondaybrew services.
 Loads from ~/.mondaybrew/.env - works from any directory.
+
+Services call ensure_credentials() when a client is constructed, not at
+import time, so importing a service module stays cheap and side-effect free.
 """
 
 import os
@@ -24,11 +27,18 @@ def load_credentials():
     return None
 
 
+_source = None
+
+
 def ensure_credentials():
     """
     Ensure credentials are loaded. Raises error if not found.
     This should fail LOUDLY so Claude knows the API won't work.
+    The .env file is read once per process.
     """
+    global _source
+    if _source is not None:
+        return _source
     source = load_credentials()
     if source is None:
         raise EnvironmentError(
@@ -39,4 +49,5 @@ def ensure_credentials():
             "See .env.example for required variables.\n"
             "=" * 60
         )
+    _source = source
     return source
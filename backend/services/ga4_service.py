@@ -1,6 +1,15 @@
 """
 Google Analytics 4 Service.
 Access GA4 data via the Analytics Data API.
+
+run_report() pages through the whole report using the response's
+row_count, and can split long date ranges into shards fetched in parallel.
+Metric values are parsed column by column from the metric header types;
+run_report_frame() returns the same data as a pandas DataFrame.
+
+Accounts, properties and web streams are kept in a persisted
+PropertyCatalog, so listing properties and resolving a domain to its
+property do not walk the Admin API on every run.
 """
 
 import sys
@@ -11,31 +20,340 @@ _plugin_root = Path(__file__).parent.parent.parent
 if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import (
-    DateRange,
-    Dimension,
-    Metric,
-    RunReportRequest,
-    FilterExpression,
-    Filter,
-    OrderBy,
-    CheckCompatibilityRequest,
-    RunRealtimeReportRequest,
-)
-from google.analytics.admin import AnalyticsAdminServiceClient
-from google.oauth2.credentials import Credentials
+import hashlib
+import json
 import os
+import re
+import threading
+import time
+from datetime import date, timedelta
 from typing import List, Optional, Dict, Any
 from backend.services.credentials import ensure_credentials
+from backend.services.google_auth import get_credentials, shared_client
+from backend.services.search_console import normalize_site
+
+# The GA4 client libraries (gRPC + protobuf) are imported on first GA4Service()
+BetaAnalyticsDataClient = None
+AnalyticsAdminServiceClient = None
+DateRange = Dimension = Metric = RunReportRequest = None
+FilterExpression = Filter = OrderBy = None
+CheckCompatibilityRequest = RunRealtimeReportRequest = BatchRunReportsRequest = None
+
+# The Data API returns at most 250,000 rows per request; larger reports are paged with offset
+MAX_ROWS_PER_REQUEST = 250000
+
+# batchRunReports accepts at most 5 reports per request, all for one property
+MAX_BATCH_REPORTS = 5
+
+# Dimensions that put every row in a single day, so a date range can be split into shards
+DAY_DIMENSIONS = {"date", "dateHour", "dateHourMinute"}
+
+_DAYS_AGO = re.compile(r"(\d+)daysAgo")
+
+# Seconds before the catalog's property list is refreshed (in the background)
+CATALOG_TTL = 3600
+
+# Seconds before a property's data streams are re-read during a refresh
+STREAMS_TTL = 86400
+
+CATALOG_DIR = Path.home() / ".mondaybrew" / "cache" / "ga4"
+
+
+def _import_dependencies():
+    global BetaAnalyticsDataClient, AnalyticsAdminServiceClient
+    global DateRange, Dimension, Metric, RunReportRequest
+    global FilterExpression, Filter, OrderBy
+    global CheckCompatibilityRequest, RunRealtimeReportRequest, BatchRunReportsRequest
+    if BetaAnalyticsDataClient is not None:
+        return
+    from google.analytics.admin import AnalyticsAdminServiceClient
+    from google.analytics.data_v1beta import BetaAnalyticsDataClient
+    from google.analytics.data_v1beta.types import (
+        DateRange,
+        Dimension,
+        Metric,
+        RunReportRequest,
+        FilterExpression,
+        Filter,
+        OrderBy,
+        CheckCompatibilityRequest,
+        RunRealtimeReportRequest,
+        BatchRunReportsRequest,
+    )
+
+
+def _days_ago(value: str) -> Optional[int]:
+    """Days before today for "today", "yesterday" and "NdaysAgo"; None for YYYY-MM-DD."""
+    if value == "today":
+        return 0
+    if value == "yesterday":
+        return 1
+    match = _DAYS_AGO.fullmatch(value)
+    return int(match.group(1)) if match else None
+
+
+def shard_date_range(start_date: str, end_date: str, shard_days: int) -> List[tuple]:
+    """
+    Splits a GA4 date range into consecutive (start, end) ranges of at most
+    shard_days days. Relative ranges stay relative, so "today" is still
+    resolved in the property's time zone.
+    """
+    start_ago, end_ago = _days_ago(start_date), _days_ago(end_date)
+    if start_ago is not None and end_ago is not None:
+        label = lambda n: "today" if n == 0 else f"{n}daysAgo"
+        return [
+            (label(ago), label(max(ago - shard_days + 1, end_ago)))
+            for ago in range(start_ago, end_ago - 1, -shard_days)
+        ]
+    today = date.today()
+    start = today - timedelta(days=start_ago) if start_ago is not None else date.fromisoformat(start_date)
+    end = today - timedelta(days=end_ago) if end_ago is not None else date.fromisoformat(end_date)
+    shards = []
+    while start <= end:
+        shard_end = min(start + timedelta(days=shard_days - 1), end)
+        shards.append((start.isoformat(), shard_end.isoformat()))
+        start = shard_end + timedelta(days=1)
+    return shards
+
+
+def _parse_metric_column(values: List[str], metric_type: str) -> List[Any]:
+    """Converts one metric column by its header type: ints for TYPE_INTEGER, floats otherwise."""
+    convert = int if metric_type == "TYPE_INTEGER" else float
+    try:
+        return list(map(convert, values))
+    except ValueError:
+        parsed = []
+        for value in values:
+            try:
+                parsed.append(convert(value))
+            except ValueError:
+                parsed.append(value)
+        return parsed
+
+
+def _response_columns(pages) -> tuple:
+    """
+    (metric types, dimension columns, metric columns) from the pages of one
+    report; values are the raw strings, rows in page order.
+    """
+    if not pages:
+        return [], [], []
+    metric_types = [header.type_.name for header in pages[0].metric_headers]
+    # Read the raw protobuf rows; proto-plus wrappers are slow at this volume
+    rows = [row for page in pages for row in type(page).pb(page).rows]
+    dimension_columns = [
+        [row.dimension_values[i].value for row in rows] for i in range(len(pages[0].dimension_headers))
+    ]
+    metric_columns = [[row.metric_values[i].value for row in rows] for i in range(len(metric_types))]
+    return metric_types, dimension_columns, metric_columns
+
+
+def _rows_to_records(dimensions, metrics, columns) -> List[Dict[str, Any]]:
+    """
+    _response_columns() output as the [{"dimensions": {...}, "metrics": {...}}]
+    rows the callers use, metrics parsed by type.
+    """
+    metric_types, dimension_columns, metric_columns = columns
+    metric_columns = [
+        _parse_metric_column(column, metric_type) for column, metric_type in zip(metric_columns, metric_types)
+    ]
+    split = len(dimension_columns)
+    return [
+        {"dimensions": dict(zip(dimensions, row[:split])), "metrics": dict(zip(metrics, row[split:]))}
+        for row in zip(*dimension_columns, *metric_columns)
+    ]
+
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[GA4Service] Credentials loaded from: {_cred_source}")
+class PropertyCatalog:
+    """
+    Persisted catalog of GA4 accounts, properties and data streams, with
+    web streams indexed by normalized domain.
+
+    Stored on disk per refresh token and shared by every GA4Service in the
+    process. Once older than CATALOG_TTL it is still served while a
+    background thread refreshes it incrementally: one list_account_summaries
+    call, then data streams only for new properties and those whose streams
+    are older than STREAMS_TTL. Only an empty catalog, or a domain lookup
+    that misses, is refreshed in the foreground.
+    """
+
+    VERSION = 1
+
+    def __init__(self, ttl=CATALOG_TTL, streams_ttl=STREAMS_TTL, cache_dir=CATALOG_DIR, max_workers=8):
+        self.ttl = ttl
+        self.streams_ttl = streams_ttl
+        self.max_workers = max_workers
+        token = f"{os.getenv('GOOGLE_ADS_CLIENT_ID')}:{os.getenv('GOOGLE_ADS_REFRESH_TOKEN')}"
+        self.cache_file = Path(cache_dir) / f"properties-{hashlib.sha1(token.encode()).hexdigest()[:12]}.json"
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.refreshed_at = 0.0
+        self.properties: Dict[str, Dict[str, Any]] = {}
+        self.by_host: Dict[str, List[tuple]] = {}  # stream host -> [(property_id, stream)]
+        self._load()
+
+    def _load(self):
+        try:
+            cached = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if cached.get("version") == self.VERSION:
+                self._swap(cached["properties"], cached["refreshed_at"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(
+                    {"version": self.VERSION, "refreshed_at": self.refreshed_at, "properties": self.properties}
+                ),
+                encoding="utf-8",
+            )
+            # Atomic, so a refresh cut short at process exit never leaves a broken file
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass
+
+    def _swap(self, properties, refreshed_at):
+        by_host: Dict[str, List[tuple]] = {}
+        for property_id, prop in properties.items():
+            for stream in prop["streams"]:
+                if stream.get("default_uri"):
+                    host, _ = normalize_site(stream["default_uri"])
+                    by_host.setdefault(host, []).append((property_id, stream))
+        with self.lock:
+            self.properties, self.by_host, self.refreshed_at = properties, by_host, refreshed_at
+
+    @staticmethod
+    def _fetch_streams(admin_client, property_id):
+        streams = []
+        for stream in admin_client.list_data_streams(parent=f"properties/{property_id}"):
+            stream_data = {
+                "stream_id": stream.name.split("/")[-1],
+                "type": stream.type_.name,
+                "display_name": stream.display_name,
+            }
+            if stream.web_stream_data:
+                stream_data["default_uri"] = stream.web_stream_data.default_uri
+                stream_data["measurement_id"] = stream.web_stream_data.measurement_id
+            streams.append(stream_data)
+        return streams
+
+    def refresh(self, admin_client, streams_ttl: Optional[float] = None):
+        """
+        Brings the catalog up to date now (blocking). Streams are re-read for
+        properties whose streams are older than streams_ttl (default
+        self.streams_ttl); streams_ttl=0 re-reads them all.
+        """
+        if streams_ttl is None:
+            streams_ttl = self.streams_ttl
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self.refresh_lock:
+            try:
+                now = time.time()
+                properties = {}
+                for account in admin_client.list_account_summaries():
+                    for summary in account.property_summaries:
+                        property_id = summary.property.split("/")[-1]
+                        known = self.properties.get(property_id, {})
+                        properties[property_id] = {
+                            "property_id": property_id,
+                            "name": summary.property,
+                            "display_name": summary.display_name,
+                            "account_name": account.account,
+                            "account_display_name": account.display_name,
+                            "streams": known.get("streams", []),
+                            "streams_at": known.get("streams_at", 0),
+                        }
+                stale = [pid for pid, prop in properties.items() if now - prop["streams_at"] >= streams_ttl]
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    fetched = pool.map(lambda pid: self._fetch_streams(admin_client, pid), stale)
+                    for property_id, streams in zip(stale, fetched):
+                        properties[property_id]["streams"] = streams
+                        properties[property_id]["streams_at"] = now
+            except Exception as e:
+                print(f"Error refreshing GA4 property catalog: {e}")
+                return
+            self._swap(properties, now)
+            self._save()
+
+    def ensure_fresh(self, admin_client) -> bool:
+        """
+        Refreshes an empty catalog now, a stale one in a background thread.
+        True if it was refreshed now.
+        """
+        if not self.refreshed_at:
+            self.refresh(admin_client)
+            return True
+        if time.time() - self.refreshed_at >= self.ttl and not self.refresh_lock.locked():
+            threading.Thread(target=self.refresh, args=(admin_client,), daemon=True).start()
+        return False
+
+    def list_properties(self, account_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self.lock:
+            properties = list(self.properties.values())
+        return [
+            {
+                "property_id": prop["property_id"],
+                "name": prop["name"],
+                "display_name": prop["display_name"],
+                "account_name": prop["account_name"],
+            }
+            for prop in properties
+            if account_id is None or prop["account_name"] == f"accounts/{account_id}"
+        ]
+
+    def find_by_domain(self, domain: str) -> List[Dict[str, Any]]:
+        """
+        Properties with a web stream on domain: exact host first, then
+        subdomains of it, then parent domains (one entry per property).
+        """
+        host, _ = normalize_site(domain)
+        labels = host.split(".")
+        with self.lock:
+            candidates = list(self.by_host.get(host, []))
+            suffix = "." + host
+            for stream_host, streams in self.by_host.items():
+                if stream_host.endswith(suffix):
+                    candidates.extend(streams)
+            for start in range(1, len(labels) - 1):
+                candidates.extend(self.by_host.get(".".join(labels[start:]), []))
+            properties = self.properties
+        matches = {}
+        for property_id, stream in candidates:
+            if property_id not in matches:
+                prop = properties[property_id]
+                matches[property_id] = {
+                    "property_id": property_id,
+                    "display_name": prop["display_name"],
+                    "account_name": prop["account_name"],
+                    "domain": stream["default_uri"],
+                    "stream_id": stream["stream_id"],
+                }
+        return list(matches.values())
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_property_catalog() -> PropertyCatalog:
+    """The process-wide PropertyCatalog."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = PropertyCatalog()
+        return _catalog
 
 
 class GA4Service:
     def __init__(self):
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+        _import_dependencies()
+
         # OAuth 2.0 Authentication (User Context)
         # Uses the same "Master Token" pattern as Sheets and Search Console
 
@@ -53,20 +371,17 @@ class GA4Service:
             return
 
         try:
-            self.creds = Credentials(
-                token=None,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=client_id,
-                client_secret=client_secret,
-                scopes=[
-                    "https://www.googleapis.com/auth/analytics.readonly",
-                    "https://www.googleapis.com/auth/analytics.edit",
-                ],
-            )
+            # Shared credentials; needs the analytics.readonly and
+            # analytics.edit scopes on the refresh token. The gRPC clients are
+            # thread-safe, so one channel each serves the whole process.
+            self.creds = get_credentials()
 
-            self.client = BetaAnalyticsDataClient(credentials=self.creds)
-            self.admin_client = AnalyticsAdminServiceClient(credentials=self.creds)
+            self.client = shared_client(
+                "ga4-data", lambda creds: BetaAnalyticsDataClient(credentials=creds)
+            )
+            self.admin_client = shared_client(
+                "ga4-admin", lambda creds: AnalyticsAdminServiceClient(credentials=creds)
+            )
         except Exception as e:
             print(f"Failed to initialize GA4Service with OAuth: {e}")
             self.client = None
@@ -96,44 +411,20 @@ class GA4Service:
             print(f"Error listing accounts: {e}")
             return []
 
-    def list_properties(self, account_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_properties(
+        self, account_id: Optional[str] = None, refresh: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Lists properties. If account_id is provided, filters by that account.
-        Otherwise lists all accessible properties.
+        Otherwise lists all accessible properties. Served from the property
+        catalog; refresh=True re-reads it from the Admin API first.
         """
-        # print(f"--- Listing GA4 Properties (Account: {account_id if account_id else 'All'}) ---")
-        try:
-            properties = []
-            if account_id:
-                response = self.admin_client.list_properties(
-                    filter=f"parent:accounts/{account_id}", show_deleted=False
-                )
-                for prop in response:
-                    properties.append(
-                        {
-                            "property_id": prop.name.split("/")[-1],
-                            "name": prop.name,
-                            "display_name": prop.display_name,
-                            "account_name": prop.parent,
-                        }
-                    )
-            else:
-                # Use list_account_summaries for global view
-                response = self.admin_client.list_account_summaries()
-                for account in response:
-                    for prop in account.property_summaries:
-                        properties.append(
-                            {
-                                "property_id": prop.property.split("/")[-1],
-                                "name": prop.property,
-                                "display_name": prop.display_name,
-                                "account_name": account.account,
-                            }
-                        )
-            return properties
-        except Exception as e:
-            print(f"Error listing properties: {e}")
-            return []
+        catalog = get_property_catalog()
+        if refresh:
+            catalog.refresh(self.admin_client)
+        else:
+            catalog.ensure_fresh(self.admin_client)
+        return catalog.list_properties(account_id)
 
     def list_data_streams(self, property_id: str) -> List[Dict[str, Any]]:
         """Lists data streams for a given property."""
@@ -210,46 +501,112 @@ class GA4Service:
             return []
 
     def find_properties_by_domain(self, domain: str) -> List[Dict[str, Any]]:
-        """Finds properties that match a given domain via their data streams."""
+        """
+        Finds properties that match a given domain via their data streams.
+        Looked up in the property catalog's domain index (no Admin API calls
+        unless the catalog is empty or has no match: a property or stream
+        added since the last refresh is found by refreshing now, streams
+        included, as a short-lived script may exit before a background
+        refresh finishes).
+        """
         print(f"--- Finding Properties for Domain: {domain} ---")
-        matches = []
-        all_props = self.list_properties()
-
-        target_domain = (
-            domain.lower()
-            .replace("https://", "")
-            .replace("http://", "")
-            .replace("www.", "")
-            .strip("/")
-        )
-
-        for prop in all_props:
-            streams = self.list_data_streams(prop["property_id"])
-            for stream in streams:
-                if stream.get("default_uri"):
-                    stream_uri = (
-                        stream["default_uri"]
-                        .lower()
-                        .replace("https://", "")
-                        .replace("http://", "")
-                        .replace("www.", "")
-                        .strip("/")
-                    )
-                    if target_domain in stream_uri or stream_uri in target_domain:
-                        matches.append(
-                            {
-                                "property_id": prop["property_id"],
-                                "display_name": prop["display_name"],
-                                "account_name": prop["account_name"],
-                                "domain": stream["default_uri"],
-                                "stream_id": stream["stream_id"],
-                            }
-                        )
-                        break
+        catalog = get_property_catalog()
+        refreshed = catalog.ensure_fresh(self.admin_client)
+        matches = catalog.find_by_domain(domain)
+        if not matches and not refreshed:
+            catalog.refresh(self.admin_client, streams_ttl=0)
+            matches = catalog.find_by_domain(domain)
         return matches
 
     # --- 2. Generic Reporting Wrapper (Data API) ---
 
+    def _run_page(self, request: Dict[str, Any], offset: int, limit: int):
+        return self.client.run_report(RunReportRequest(**request, offset=offset, limit=limit))
+
+    def _fetch_report(
+        self,
+        requests: List[Dict[str, Any]],
+        offset: int = 0,
+        limit: Optional[int] = None,
+        max_workers: int = 4,
+    ):
+        """
+        Runs each request (RunReportRequest fields) to completion: the first
+        page of every request, then the remaining pages, whose offsets follow
+        from row_count, all in parallel.
+
+        Returns _response_columns() of all pages, rows in request then page order.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        first_limit = min(limit or MAX_ROWS_PER_REQUEST, MAX_ROWS_PER_REQUEST)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            firsts = list(
+                pool.map(lambda request: self._run_page(request, offset, first_limit), requests)
+            )
+            pages = [[first] for first in firsts]
+            rest = []
+            for i, (request, first) in enumerate(zip(requests, firsts)):
+                end = first.row_count if limit is None else min(first.row_count, offset + limit)
+                for page_offset in range(offset + len(first.rows), end, MAX_ROWS_PER_REQUEST):
+                    page_limit = min(MAX_ROWS_PER_REQUEST, end - page_offset)
+                    rest.append((i, pool.submit(self._run_page, request, page_offset, page_limit)))
+            for i, future in rest:
+                pages[i].append(future.result())
+        return _response_columns([page for shard in pages for page in shard])
+
+    @staticmethod
+    def _request_fields(
+        property_id: str,
+        dimensions: List[str],
+        metrics: List[str],
+        start_date: str = "30daysAgo",
+        end_date: str = "today",
+        dimension_filter: Optional[FilterExpression] = None,
+        metric_filter: Optional[FilterExpression] = None,
+        order_bys: Optional[List[Any]] = None,
+        metric_aggregations: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """RunReportRequest fields, without offset and limit."""
+        return dict(
+            property=f"properties/{property_id}",
+            dimensions=[Dimension(name=d) for d in dimensions],
+            metrics=[Metric(name=m) for m in metrics],
+            date_ranges=[DateRange(start_date=start_date, end_date=end_date)],
+            dimension_filter=dimension_filter,
+            metric_filter=metric_filter,
+            order_bys=order_bys,
+            metric_aggregations=metric_aggregations,
+        )
+
+    def _report_columns(
+        self,
+        property_id: str,
+        dimensions: List[str],
+        metrics: List[str],
+        start_date: str,
+        end_date: str,
+        dimension_filter: Optional[FilterExpression],
+        metric_filter: Optional[FilterExpression],
+        limit: Optional[int],
+        offset: int,
+        order_bys: Optional[List[Any]],
+        metric_aggregations: Optional[List[str]],
+        shard_days: Optional[int],
+        max_workers: int,
+    ):
+        # Sharding is only exact when every row belongs to one day and all rows are wanted
+        shard = shard_days and DAY_DIMENSIONS & set(dimensions) and limit is None and not offset
+        date_ranges = shard_date_range(start_date, end_date, shard_days) if shard else [(start_date, end_date)]
+        requests = [
+            self._request_fields(
+                property_id, dimensions, metrics, start, end, dimension_filter,
+                metric_filter, order_bys, metric_aggregations,
+            )
+            for start, end in date_ranges
+        ]
+        return self._fetch_report(requests, offset, limit, max_workers)
+
     def run_report(
         self,
         property_id: str,
@@ -259,52 +616,130 @@ class GA4Service:
         end_date: str = "today",
         dimension_filter: Optional[FilterExpression] = None,
         metric_filter: Optional[FilterExpression] = None,
-        limit: int = 10000,
+        limit: Optional[int] = None,
         offset: int = 0,
         order_bys: Optional[List[Any]] = None,
         metric_aggregations: Optional[List[str]] = None,
+        shard_days: Optional[int] = None,
+        max_workers: int = 4,
     ) -> List[Dict[str, Any]]:
         """
         Generic wrapper for GA4 Data API runReport.
+
+        Returns every row (or `limit` rows from `offset`), paging as needed.
+        With shard_days and a date/dateHour dimension, the date range is split
+        into shards of that many days fetched in parallel.
         """
         try:
-            request = RunReportRequest(
-                property=f"properties/{property_id}",
-                dimensions=[Dimension(name=d) for d in dimensions],
-                metrics=[Metric(name=m) for m in metrics],
-                date_ranges=[DateRange(start_date=start_date, end_date=end_date)],
-                dimension_filter=dimension_filter,
-                metric_filter=metric_filter,
-                limit=limit,
-                offset=offset,
-                order_bys=order_bys,
-                metric_aggregations=metric_aggregations,
+            columns = self._report_columns(
+                property_id, dimensions, metrics, start_date, end_date, dimension_filter,
+                metric_filter, limit, offset, order_bys, metric_aggregations, shard_days, max_workers,
             )
-
-            response = self.client.run_report(request)
-
-            results = []
-            for row in response.rows:
-                item = {"dimensions": {}, "metrics": {}}
-                for i, dim_val in enumerate(row.dimension_values):
-                    item["dimensions"][dimensions[i]] = dim_val.value
-                for i, met_val in enumerate(row.metric_values):
-                    val = met_val.value
-                    # Simple type conversion
-                    if val.isdigit():
-                        val = int(val)
-                    elif val.replace(".", "", 1).isdigit():
-                        try:
-                            val = float(val)
-                        except ValueError:
-                            pass
-                    item["metrics"][metrics[i]] = val
-                results.append(item)
-            return results
+            return _rows_to_records(dimensions, metrics, columns)
         except Exception as e:
             print(f"Error running report: {e}")
             return [{"error": str(e)}]
 
+    def run_report_frame(
+        self,
+        property_id: str,
+        dimensions: List[str],
+        metrics: List[str],
+        start_date: str = "30daysAgo",
+        end_date: str = "today",
+        dimension_filter: Optional[FilterExpression] = None,
+        metric_filter: Optional[FilterExpression] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_bys: Optional[List[Any]] = None,
+        metric_aggregations: Optional[List[str]] = None,
+        shard_days: Optional[int] = 7,
+        max_workers: int = 4,
+    ):
+        """
+        Like run_report, but returns a pandas DataFrame with one column per
+        dimension and metric (metrics parsed to int64/float64 a column at a
+        time). Shards by week by default, for large date-level extracts.
+        Returns an empty DataFrame on error.
+        """
+        import pandas as pd
+
+        try:
+            metric_types, dimension_columns, metric_columns = self._report_columns(
+                property_id, dimensions, metrics, start_date, end_date, dimension_filter,
+                metric_filter, limit, offset, order_bys, metric_aggregations, shard_days, max_workers,
+            )
+        except Exception as e:
+            print(f"Error running report: {e}")
+            return pd.DataFrame()
+        data = dict(zip(dimensions, dimension_columns))
+        for name, column, metric_type in zip(metrics, metric_columns, metric_types):
+            values = pd.to_numeric(pd.Series(column, dtype="string"), errors="coerce")
+            if metric_type == "TYPE_INTEGER" and not values.isna().any():
+                data[name] = values.astype("int64")
+            else:
+                data[name] = values.astype("float64")
+        return pd.DataFrame(data, columns=[*dimensions, *metrics])
+
+    def batch_run_reports(
+        self, property_id: str, reports: List[Dict[str, Any]], max_workers: int = 4
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Runs several reports for one property through batchRunReports, up to
+        five per request (batches run in parallel).
+
+        Each report is a dict of run_report arguments (dimensions, metrics,
+        start_date, end_date, dimension_filter, metric_filter, limit, offset,
+        order_bys, metric_aggregations). Returns one run_report-shaped result
+        per report, in order; a failed batch yields [{"error": ...}] for each
+        of its reports. Reports with more rows than one request returns are
+        paged to completion, like run_report.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def run_batch(batch):
+            requests = []
+            for report in batch:
+                fields = {k: v for k, v in report.items() if k not in ("limit", "offset")}
+                requests.append(
+                    (
+                        self._request_fields(property_id, **fields),
+                        report.get("offset", 0),
+                        report.get("limit"),
+                    )
+                )
+            try:
+                response = self.client.batch_run_reports(
+                    BatchRunReportsRequest(
+                        property=f"properties/{property_id}",
+                        requests=[
+                            RunReportRequest(
+                                **fields, offset=offset, limit=min(limit or MAX_ROWS_PER_REQUEST, MAX_ROWS_PER_REQUEST)
+                            )
+                            for fields, offset, limit in requests
+                        ],
+                    )
+                )
+                results = []
+                for report, (fields, offset, limit), first in zip(batch, requests, response.reports):
+                    pages = [first]
+                    end = first.row_count if limit is None else min(first.row_count, offset + limit)
+                    for page_offset in range(offset + len(first.rows), end, MAX_ROWS_PER_REQUEST):
+                        pages.append(
+                            self._run_page(fields, page_offset, min(MAX_ROWS_PER_REQUEST, end - page_offset))
+                        )
+                    results.append(
+                        _rows_to_records(report["dimensions"], report["metrics"], _response_columns(pages))
+                    )
+                return results
+            except Exception as e:
+                print(f"Error running batch report: {e}")
+                return [[{"error": str(e)}] for _ in batch]
+
+        batches = [reports[i : i + MAX_BATCH_REPORTS] for i in range(0, len(reports), MAX_BATCH_REPORTS)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return [result for results in pool.map(run_batch, batches) for result in results]
+
     def check_compatibility(
         self, property_id: str, dimensions: List[str], metrics: List[str]
     ) -> Dict[str, Any]:
@@ -356,47 +791,32 @@ class GA4Service:
             )
             response = self.client.run_realtime_report(request)
 
-            results = []
-            for row in response.rows:
-                item = {"dimensions": {}, "metrics": {}}
-                for i, dim_val in enumerate(row.dimension_values):
-                    item["dimensions"][dimensions[i]] = dim_val.value
-                for i, met_val in enumerate(row.metric_values):
-                    val = met_val.value
-                    if val.isdigit():
-                        val = int(val)
-                    elif val.replace(".", "", 1).isdigit():
-                        try:
-                            val = float(val)
-                        except ValueError:
-                            pass
-                    item["metrics"][metrics[i]] = val
-                results.append(item)
-            return results
+            return _rows_to_records(dimensions, metrics, _response_columns([response]))
         except Exception as e:
             print(f"Error running realtime report: {e}")
             return [{"error": str(e)}]
 
     # --- 3. Opinionated Convenience Methods ---
+    # Each report is defined once (run_report arguments) and shaped once, so
+    # it can run alone (get_*) or batched with the others (get_audit_reports).
 
-    def get_behavior_metrics(
-        self, property_id: str, days: int = 30
-    ) -> List[Dict[str, Any]]:
-        """Fetches core behavior metrics using run_report."""
-        # print(f"--- Fetching Behavior Metrics for {property_id} ---")
-        dims = ["sessionDefaultChannelGroup"]
-        mets = [
-            "sessions",
-            "engagementRate",
-            "averageSessionDuration",
-            "screenPageViewsPerSession",
-            "conversions",
-        ]
-
-        data = self.run_report(
-            property_id, dims, mets, start_date=f"{days}daysAgo", end_date="today"
-        )
+    @staticmethod
+    def _behavior_report(days: int = 30) -> Dict[str, Any]:
+        return {
+            "dimensions": ["sessionDefaultChannelGroup"],
+            "metrics": [
+                "sessions",
+                "engagementRate",
+                "averageSessionDuration",
+                "screenPageViewsPerSession",
+                "conversions",
+            ],
+            "start_date": f"{days}daysAgo",
+            "end_date": "today",
+        }
 
+    @staticmethod
+    def _behavior_rows(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if data and "error" in data[0]:
             return data
 
@@ -430,17 +850,23 @@ class GA4Service:
             )
         return results
 
-    def get_conversion_breakdown(
+    def get_behavior_metrics(
         self, property_id: str, days: int = 30
     ) -> List[Dict[str, Any]]:
-        """Fetches conversions broken down by event name."""
-        dims = ["eventName"]
-        mets = ["conversions"]
+        """Fetches core behavior metrics using run_report."""
+        return self._behavior_rows(self.run_report(property_id, **self._behavior_report(days)))
 
-        data = self.run_report(
-            property_id, dims, mets, start_date=f"{days}daysAgo", end_date="today"
-        )
+    @staticmethod
+    def _conversion_report(days: int = 30) -> Dict[str, Any]:
+        return {
+            "dimensions": ["eventName"],
+            "metrics": ["conversions"],
+            "start_date": f"{days}daysAgo",
+            "end_date": "today",
+        }
 
+    @staticmethod
+    def _conversion_rows(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if data and "error" in data[0]:
             return []
 
@@ -456,29 +882,29 @@ class GA4Service:
         results.sort(key=lambda x: x["conversions"], reverse=True)
         return results
 
-    def get_top_pages(
-        self, property_id: str, days: int = 30, limit: int = 100
+    def get_conversion_breakdown(
+        self, property_id: str, days: int = 30
     ) -> List[Dict[str, Any]]:
-        """Fetches top pages by views."""
-        dims = ["pagePath"]
-        mets = ["screenPageViews", "sessions", "conversions"]
-
-        order_bys = [
-            OrderBy(
-                metric=OrderBy.MetricOrderBy(metric_name="screenPageViews"), desc=True
-            )
-        ]
+        """Fetches conversions broken down by event name."""
+        return self._conversion_rows(self.run_report(property_id, **self._conversion_report(days)))
 
-        data = self.run_report(
-            property_id,
-            dims,
-            mets,
-            start_date=f"{days}daysAgo",
-            end_date="today",
-            limit=limit,
-            order_bys=order_bys,
-        )
+    @staticmethod
+    def _top_pages_report(days: int = 30, limit: int = 100) -> Dict[str, Any]:
+        return {
+            "dimensions": ["pagePath"],
+            "metrics": ["screenPageViews", "sessions", "conversions"],
+            "start_date": f"{days}daysAgo",
+            "end_date": "today",
+            "limit": limit,
+            "order_bys": [
+                OrderBy(
+                    metric=OrderBy.MetricOrderBy(metric_name="screenPageViews"), desc=True
+                )
+            ],
+        }
 
+    @staticmethod
+    def _top_pages_rows(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if data and "error" in data[0]:
             return []
 
@@ -494,27 +920,27 @@ class GA4Service:
             )
         return results
 
-    def get_traffic_sources(
+    def get_top_pages(
         self, property_id: str, days: int = 30, limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """Fetches traffic sources."""
-        dims = ["sessionSourceMedium"]
-        mets = ["sessions", "conversions"]
+        """Fetches top pages by views."""
+        return self._top_pages_rows(self.run_report(property_id, **self._top_pages_report(days, limit)))
 
-        order_bys = [
-            OrderBy(metric=OrderBy.MetricOrderBy(metric_name="sessions"), desc=True)
-        ]
-
-        data = self.run_report(
-            property_id,
-            dims,
-            mets,
-            start_date=f"{days}daysAgo",
-            end_date="today",
-            limit=limit,
-            order_bys=order_bys,
-        )
+    @staticmethod
+    def _traffic_sources_report(days: int = 30, limit: int = 100) -> Dict[str, Any]:
+        return {
+            "dimensions": ["sessionSourceMedium"],
+            "metrics": ["sessions", "conversions"],
+            "start_date": f"{days}daysAgo",
+            "end_date": "today",
+            "limit": limit,
+            "order_bys": [
+                OrderBy(metric=OrderBy.MetricOrderBy(metric_name="sessions"), desc=True)
+            ],
+        }
 
+    @staticmethod
+    def _traffic_sources_rows(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if data and "error" in data[0]:
             return []
 
@@ -529,6 +955,31 @@ class GA4Service:
             )
         return results
 
+    def get_traffic_sources(
+        self, property_id: str, days: int = 30, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Fetches traffic sources."""
+        return self._traffic_sources_rows(
+            self.run_report(property_id, **self._traffic_sources_report(days, limit))
+        )
+
+    def get_audit_reports(
+        self, property_id: str, days: int = 30, limit: int = 100
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Behavior, conversions, top pages and traffic sources in a single
+        batchRunReports request. Returns {"behavior", "conversions",
+        "top_pages", "traffic_sources"}, each shaped like its get_* method.
+        """
+        reports = {
+            "behavior": (self._behavior_report(days), self._behavior_rows),
+            "conversions": (self._conversion_report(days), self._conversion_rows),
+            "top_pages": (self._top_pages_report(days, limit), self._top_pages_rows),
+            "traffic_sources": (self._traffic_sources_report(days, limit), self._traffic_sources_rows),
+        }
+        data = self.batch_run_reports(property_id, [report for report, _ in reports.values()])
+        return {name: shape(rows) for (name, (_, shape)), rows in zip(reports.items(), data)}
+
     def create_google_ads_link(
         self,
         property_id: str,
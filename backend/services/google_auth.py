@@ -0,0 +1,134 @@
+"""
+Shared Google auth and HTTP transport for the discovery-based services.
+
+Sheets, Drive, Search Console, GTM and GA4 all authorize with the same
+refresh token (GOOGLE_ADS_REFRESH_TOKEN). Instead of each service building
+its own Credentials (and refreshing its own access token):
+- get_credentials() returns one process-wide Credentials whose refresh is
+  serialized, so concurrent threads trigger a single token refresh. No scopes
+  are requested on refresh, so the token carries every scope the refresh
+  token was granted.
+- authorized_http() returns one authorized httplib2 connection pool per
+  thread (httplib2 is not thread-safe), shared by all services in that thread.
+- build_service() builds each API client once per thread from the discovery
+  documents bundled with google-api-python-client (or, on older versions, a
+  disk cache), so no discovery document is fetched over the network.
+- shared_client() caches thread-safe clients (e.g. the GA4 gRPC clients).
+
+google-auth, httplib2 and googleapiclient are imported on first use.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Seconds before an idle socket or slow response is abandoned (retried by the executor)
+HTTP_TIMEOUT = 60
+
+DISCOVERY_CACHE_DIR = Path.home() / ".mondaybrew" / "cache" / "discovery"
+
+
+def _shared_credentials_class():
+    from google.oauth2.credentials import Credentials
+
+    class _SharedCredentials(Credentials):
+        """Credentials whose refresh runs once at a time; waiting threads reuse the new token."""
+
+        _refresh_lock = threading.Lock()
+
+        def refresh(self, request):
+            with self._refresh_lock:
+                if self.valid:
+                    return
+                super().refresh(request)
+
+    return _SharedCredentials
+
+
+_credentials = None
+_credentials_lock = threading.Lock()
+_local = threading.local()
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+
+def get_credentials() -> "Credentials":
+    """The process-wide OAuth credentials built from the GOOGLE_ADS_* variables."""
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None:
+            _credentials = _shared_credentials_class()(
+                token=None,
+                refresh_token=os.getenv("GOOGLE_ADS_REFRESH_TOKEN"),
+                token_uri=TOKEN_URI,
+                client_id=os.getenv("GOOGLE_ADS_CLIENT_ID"),
+                client_secret=os.getenv("GOOGLE_ADS_CLIENT_SECRET"),
+            )
+        return _credentials
+
+
+def authorized_http():
+    """This thread's authorized HTTP client; keeps connections open across services."""
+    http = getattr(_local, "http", None)
+    if http is None:
+        import google_auth_httplib2
+        import httplib2
+
+        http = google_auth_httplib2.AuthorizedHttp(
+            get_credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT)
+        )
+        _local.http = http
+    return http
+
+
+class _DiscoveryCache:
+    """Disk cache for discovery documents, for clients without bundled documents."""
+
+    def get(self, url):
+        try:
+            return (DISCOVERY_CACHE_DIR / _cache_name(url)).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def set(self, url, content):
+        try:
+            DISCOVERY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (DISCOVERY_CACHE_DIR / _cache_name(url)).write_text(content, encoding="utf-8")
+        except OSError:
+            pass
+
+
+def _cache_name(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json"
+
+
+def build_service(api: str, version: str):
+    """A discovery-based client for api/version, built once per thread on the shared transport."""
+    services = getattr(_local, "services", None)
+    if services is None:
+        services = _local.services = {}
+    key = (api, version)
+    if key not in services:
+        from googleapiclient.discovery import build
+
+        try:
+            services[key] = build(api, version, http=authorized_http(), static_discovery=True)
+        except TypeError:
+            # google-api-python-client < 2.0 has no bundled discovery documents
+            services[key] = build(api, version, http=authorized_http(), cache=_DiscoveryCache())
+    return services[key]
+
+
+def shared_client(name: str, factory: Callable[["Credentials"], object]):
+    """A process-wide client created once by factory(credentials); only for thread-safe clients."""
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = factory(get_credentials())
+        return _clients[name]
@@ -1,6 +1,9 @@
 """
 Google Sheets Service.
 Read/write access to Google Sheets via the Sheets API.
+
+Requests run through the shared request executor (rate limited, retried);
+methods return a falsy RequestFailure instead of None when a request fails.
 """
 
 import sys
@@ -11,119 +14,225 @@ _plugin_root = Path(__file__).parent.parent.parent
 if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
-import os
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+import json
 from backend.services.credentials import ensure_credentials
+from backend.services.google_auth import build_service, get_credentials
+from backend.services.request_executor import RequestFailure, get_executor
+
+# values.batchUpdate payloads are kept under this size (Google recommends 2 MB);
+# larger tabs are split into several row ranges and, if needed, several requests
+MAX_WRITE_BYTES = 2_000_000
+
+
+def sheet_range(title, start_row=1):
+    """A1 range for a tab, quoting the title (e.g. "'Ad Copy'!A1")."""
+    quoted = "'" + title.replace("'", "''") + "'"
+    return f"{quoted}!A{start_row}" if start_row else quoted
+
+
+def chunk_workbook(tabs, max_bytes=MAX_WRITE_BYTES):
+    """
+    Split {tab title: rows} into lists of ValueRange dicts, each list small
+    enough for one values.batchUpdate request.
+
+    Rows keep their order; a tab that does not fit is split into consecutive
+    ranges (A1, A<n>, ...). Sizes are estimated from the rows' JSON encoding.
+    """
+    batches = [[]]
+    batch_bytes = 0
+    for title, rows in tabs.items():
+        start = 0
+        chunk = []
+        chunk_bytes = 0
+        for i, row in enumerate(rows):
+            row_bytes = len(json.dumps(row, ensure_ascii=False, default=str)) + 1
+            if batch_bytes + chunk_bytes + row_bytes > max_bytes and (chunk or batches[-1]):
+                if chunk:
+                    batches[-1].append({"range": sheet_range(title, start + 1), "values": chunk})
+                batches.append([])
+                batch_bytes = 0
+                start, chunk, chunk_bytes = i, [], 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            batches[-1].append({"range": sheet_range(title, start + 1), "values": chunk})
+            batch_bytes += chunk_bytes
+    return [batch for batch in batches if batch]
+
+
+def records_to_rows(records):
+    """Header row plus one row per dict, columns in first-seen order (for JSON artifacts)."""
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    rows = [columns]
+    for record in records:
+        row = []
+        for column in columns:
+            value = record.get(column, "")
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, ensure_ascii=False)
+            row.append("" if value is None else value)
+        rows.append(row)
+    return rows
+
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[GoogleSheets] Credentials loaded from: {_cred_source}")
+def _gzip(request):
+    """Ask for a gzip-compressed response (Google requires "gzip" in the User-Agent too)."""
+    user_agent = request.headers.get("user-agent", "")
+    if "gzip" not in user_agent:
+        request.headers["user-agent"] = f"{user_agent} (gzip)".strip()
+    request.headers["accept-encoding"] = "gzip"
+    return request
 
 
 class GoogleSheetsService:
     def __init__(self):
-        # Re-use the OAuth credentials from Google Ads if possible,
-        # assuming the user granted Sheets scopes.
-        self.creds = Credentials(
-            token=None,
-            refresh_token=os.getenv("GOOGLE_ADS_REFRESH_TOKEN"),
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=os.getenv("GOOGLE_ADS_CLIENT_ID"),
-            client_secret=os.getenv("GOOGLE_ADS_CLIENT_SECRET"),
-            scopes=[
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive",
-            ],
-        )
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+
+        # Re-use the OAuth credentials from Google Ads (shared process-wide),
+        # assuming the user granted Sheets and Drive scopes.
+        self.creds = get_credentials()
+
+        self.service = build_service("sheets", "v4")
+        self.drive = build_service("drive", "v3")
 
-        self.service = build("sheets", "v4", credentials=self.creds)
-        self.drive = build("drive", "v3", credentials=self.creds)
+        # Shared by every client in the process, so concurrent exports share the quota
+        self.sheets_executor = get_executor("sheets")
+        self.drive_executor = get_executor("drive")
+
+    def _run(self, request, error_label, executor=None, idempotent=True):
+        """Execute via the shared executor; prints and returns a RequestFailure on error."""
+        result = (executor or self.sheets_executor).try_execute(request, idempotent)
+        if isinstance(result, RequestFailure):
+            print(f"{error_label}: {result}")
+        return result
 
     def read_sheet(self, spreadsheet_id, range_name):
-        """Reads values from a specific range."""
-        try:
-            sheet = self.service.spreadsheets()
-            result = (
-                sheet.values()
-                .get(spreadsheetId=spreadsheet_id, range=range_name)
-                .execute()
-            )
-            values = result.get("values", [])
-            return values
-        except Exception as e:
-            print(f"Error reading sheet: {e}")
-            return None
+        """Reads values from a specific range. Returns a RequestFailure on error."""
+        result = self._run(
+            self.service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=range_name),
+            "Error reading sheet",
+        )
+        if isinstance(result, RequestFailure):
+            return result
+        return result.get("values", [])
 
     def write_sheet(self, spreadsheet_id, range_name, values):
-        """Writes values to a specific range."""
+        """Writes values to a specific range. Returns a RequestFailure on error."""
         print(
             f"[Sheets] Writing {len(values)} rows to {spreadsheet_id} range {range_name}..."
         )
-        try:
-            body = {"values": values}
-            result = (
-                self.service.spreadsheets()
-                .values()
-                .update(
-                    spreadsheetId=spreadsheet_id,
-                    range=range_name,
-                    valueInputOption="USER_ENTERED",
-                    body=body,
-                )
-                .execute()
-            )
+        result = self._run(
+            self.service.spreadsheets()
+            .values()
+            .update(
+                spreadsheetId=spreadsheet_id,
+                range=range_name,
+                valueInputOption="USER_ENTERED",
+                body={"values": values},
+            ),
+            "[Sheets] Error writing to sheet",
+        )
+        if not isinstance(result, RequestFailure):
             print(f"[Sheets] Success! {result.get('updatedCells')} cells updated.")
-            return result
-        except Exception as e:
-            print(f"[Sheets] Error writing to sheet: {e}")
-            return None
+        return result
 
     def clear_range(self, spreadsheet_id, range_name):
-        """Clears values from a specific range."""
+        """Clears values from a specific range. Returns a RequestFailure on error."""
         print(f"[Sheets] Clearing range {range_name} in {spreadsheet_id}...")
-        try:
-            result = (
-                self.service.spreadsheets()
-                .values()
-                .clear(spreadsheetId=spreadsheet_id, range=range_name, body={})
-                .execute()
-            )
+        result = self._run(
+            self.service.spreadsheets()
+            .values()
+            .clear(spreadsheetId=spreadsheet_id, range=range_name, body={}),
+            "[Sheets] Error clearing range",
+        )
+        if not isinstance(result, RequestFailure):
             print(f"[Sheets] Cleared range. {result.get('clearedRange')}")
-            return result
-        except Exception as e:
-            print(f"[Sheets] Error clearing range: {e}")
-            return None
+        return result
 
-    def create_spreadsheet(self, title):
-        """Creates a new spreadsheet."""
-        try:
-            spreadsheet = {"properties": {"title": title}}
-            spreadsheet = (
-                self.service.spreadsheets()
-                .create(body=spreadsheet, fields="spreadsheetId")
-                .execute()
+    def write_workbook(self, spreadsheet_id, tabs, clear=True, value_input_option="USER_ENTERED"):
+        """
+        Clears and writes several tabs in as few requests as possible.
+
+        tabs maps tab title -> rows (lists of cell values), written from A1.
+        With clear=True every tab is first emptied by one values.batchClear;
+        all values then go out in one values.batchUpdate, or a few if the
+        data exceeds MAX_WRITE_BYTES. The tabs must already exist.
+
+        Returns {"requests": n, "updatedCells": n}, or the RequestFailure of
+        the first request that failed (earlier chunks stay written).
+        """
+        batches = chunk_workbook(tabs)
+        rows = sum(len(v) for v in tabs.values())
+        print(
+            f"[Sheets] Writing {len(tabs)} tabs ({rows} rows) to {spreadsheet_id} "
+            f"in {len(batches) + bool(clear and tabs)} requests..."
+        )
+        values = self.service.spreadsheets().values()
+        requests = 0
+        updated_cells = 0
+        if clear and tabs:
+            result = self._run(
+                _gzip(
+                    values.batchClear(
+                        spreadsheetId=spreadsheet_id,
+                        body={"ranges": [sheet_range(title, None) for title in tabs]},
+                        fields="clearedRanges",
+                    )
+                ),
+                "[Sheets] Error clearing workbook",
+            )
+            if isinstance(result, RequestFailure):
+                return result
+            requests += 1
+        for data in batches:
+            result = self._run(
+                _gzip(
+                    values.batchUpdate(
+                        spreadsheetId=spreadsheet_id,
+                        body={"valueInputOption": value_input_option, "data": data},
+                        fields="totalUpdatedCells",
+                    )
+                ),
+                f"[Sheets] Error writing workbook after {requests} requests",
             )
-            print(f"Created spreadsheet ID: {spreadsheet.get('spreadsheetId')}")
-            return spreadsheet.get("spreadsheetId")
-        except Exception as e:
-            print(f"Error creating spreadsheet: {e}")
-            return None
+            if isinstance(result, RequestFailure):
+                return result
+            requests += 1
+            updated_cells += result.get("totalUpdatedCells", 0)
+        print(f"[Sheets] Success! {updated_cells} cells updated in {requests} requests.")
+        return {"requests": requests, "updatedCells": updated_cells}
 
-    def copy_file(self, file_id, new_title, folder_id=None):
-        """Copies a file (template) to a new location."""
-        try:
-            body = {"name": new_title}
-            if folder_id:
-                body["parents"] = [folder_id]
+    def create_spreadsheet(self, title):
+        """Creates a new spreadsheet. Returns its ID, or a RequestFailure on error."""
+        spreadsheet = self._run(
+            self.service.spreadsheets().create(
+                body={"properties": {"title": title}}, fields="spreadsheetId"
+            ),
+            "Error creating spreadsheet",
+            idempotent=False,
+        )
+        if isinstance(spreadsheet, RequestFailure):
+            return spreadsheet
+        print(f"Created spreadsheet ID: {spreadsheet.get('spreadsheetId')}")
+        return spreadsheet.get("spreadsheetId")
 
-            new_file = self.drive.files().copy(fileId=file_id, body=body).execute()
+    def copy_file(self, file_id, new_title, folder_id=None):
+        """Copies a file (template) to a new location. Returns a RequestFailure on error."""
+        body = {"name": new_title}
+        if folder_id:
+            body["parents"] = [folder_id]
 
-            print(f"Copied file. New ID: {new_file.get('id')}")
-            return new_file.get("id")
-        except Exception as e:
-            print(f"Error copying file: {e}")
-            return None
+        new_file = self._run(
+            self.drive.files().copy(fileId=file_id, body=body),
+            "Error copying file",
+            self.drive_executor,
+            idempotent=False,
+        )
+        if isinstance(new_file, RequestFailure):
+            return new_file
+        print(f"Copied file. New ID: {new_file.get('id')}")
+        return new_file.get("id")
 
     def upload_file(
         self,
@@ -132,28 +241,25 @@ class GoogleSheetsService:
         folder_id=None,
         mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     ):
-        """Uploads a file to Google Drive."""
-        try:
-            file_metadata = {"name": file_name}
-            if folder_id:
-                file_metadata["parents"] = [folder_id]
+        """Uploads a file to Google Drive. Returns a RequestFailure on error."""
+        file_metadata = {"name": file_name}
+        if folder_id:
+            file_metadata["parents"] = [folder_id]
 
-            from googleapiclient.http import MediaFileUpload
+        from googleapiclient.http import MediaFileUpload
 
-            media = MediaFileUpload(file_path, mimetype=mime_type)
-
-            file = (
-                self.drive.files()
-                .create(body=file_metadata, media_body=media, fields="id")
-                .execute()
-            )
-
-            print(f"File ID: {file.get('id')}")
-            return file.get("id")
-        except Exception as e:
-            print(f"Error uploading file: {e}")
-            return None
+        media = MediaFileUpload(file_path, mimetype=mime_type)
 
+        file = self._run(
+            self.drive.files().create(body=file_metadata, media_body=media, fields="id"),
+            "Error uploading file",
+            self.drive_executor,
+            idempotent=False,
+        )
+        if isinstance(file, RequestFailure):
+            return file
+        print(f"File ID: {file.get('id')}")
+        return file.get("id")
 
 if __name__ == "__main__":
     # Test
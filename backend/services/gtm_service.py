@@ -11,19 +11,17 @@ _plugin_root = Path(__file__).parent.parent.parent
 if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
 import os
 from typing import List, Optional, Dict, Any
 from backend.services.credentials import ensure_credentials
-
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[GTMService] Credentials loaded from: {_cred_source}")
+from backend.services.google_auth import build_service, get_credentials
 
 
 class GTMService:
     def __init__(self):
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+
         # OAuth 2.0 Authentication (User Context)
         # Uses the same "Master Token" pattern as other services
 
@@ -40,19 +38,11 @@ class GTMService:
             return
 
         try:
-            self.creds = Credentials(
-                token=None,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=client_id,
-                client_secret=client_secret,
-                scopes=[
-                    "https://www.googleapis.com/auth/tagmanager.edit.containers",
-                    "https://www.googleapis.com/auth/tagmanager.publish",
-                ],
-            )
+            # Shared credentials; needs the tagmanager.edit.containers and
+            # tagmanager.publish scopes on the refresh token
+            self.creds = get_credentials()
 
-            self.service = build("tagmanager", "v2", credentials=self.creds)
+            self.service = build_service("tagmanager", "v2")
         except Exception as e:
             print(f"Failed to initialize GTMService with OAuth: {e}")
             self.service = None
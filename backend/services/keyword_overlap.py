@@ -0,0 +1,345 @@
+"""
+Paid/organic keyword overlap engine.
+
+Joins organic queries (SearchConsoleService.get_organic_queries), paid search
+terms (AdsConnector.get_search_terms) and Google Ads' paid/organic report
+(AdsConnector.get_paid_organic_performance) on normalized query text, and
+classifies every query:
+
+- cannibalization: paid and organic, with a strong organic position, so paid
+  clicks likely replace free ones
+- overlap: paid and organic (paid clicks in the paid/organic report count)
+- gap: organic impressions at a known, poor position and no paid coverage
+- organic_only / paid_only: everything else
+
+The join is a dictionary lookup per query. With fuzzy=True, paid terms that
+did not match exactly are matched to organic queries by a Danish inflection
+key (suffixes stripped, spaces removed: "flyttefirmaer" ~ "flyttefirma"),
+then by a single edit (typos, "flytte firma" ~ "flyttefirma") using a
+deletion index, so 100k x 100k query sets join in seconds.
+
+Standard library only.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Danish definite/plural/genitive endings, longest first
+DANISH_SUFFIXES = ("ernes", "enes", "erne", "ende", "ene", "ers", "ets", "ens", "er", "en", "et", "es", "e", "s")
+
+# Stems shorter than this are left alone (too many unrelated words collide)
+MIN_STEM_LENGTH = 4
+
+# Keys shorter than this are only matched exactly or by inflection, never by edit distance
+MIN_EDIT_LENGTH = 5
+
+CANNIBALIZATION_POSITION = 3.0
+GAP_POSITION = 10.0
+MIN_GAP_IMPRESSIONS = 10
+
+STATUS_ORDER = ("cannibalization", "overlap", "gap", "organic_only", "paid_only")
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Shortest stem of at least MIN_STEM_LENGTH characters = longest matching suffix
+_SUFFIX = re.compile(r"(\w{%d,}?)(?:%s)" % (MIN_STEM_LENGTH, "|".join(DANISH_SUFFIXES)))
+
+PAID_METRICS = ("clicks", "impressions", "cost", "conversions")
+ORGANIC_METRICS = ("clicks", "impressions")
+
+
+def normalize_query(text) -> str:
+    """Lowercase, NFKC-normalized words separated by single spaces."""
+    return _NON_WORD.sub(" ", unicodedata.normalize("NFKC", str(text)).casefold()).strip()
+
+
+@lru_cache(maxsize=1 << 16)
+def _stem(word: str) -> str:
+    match = _SUFFIX.fullmatch(word)
+    return match.group(1) if match else word
+
+
+def inflection_key(normalized: str) -> str:
+    """Each word stemmed, joined without spaces (so compounds and split forms meet)."""
+    return "".join(_stem(word) for word in normalized.split())
+
+
+def _deletes(key: str):
+    return {key[:i] + key[i + 1 :] for i in range(len(key))}
+
+
+def _one_edit_apart(a: str, b: str) -> bool:
+    """True if a and b differ by one insertion, deletion, substitution or adjacent transposition."""
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1 :]
+    return a[i + 1 :] == b[i + 1 :] or (
+        i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2 :] == b[i + 2 :]
+    )
+
+
+def _aggregate(rows: Iterable[dict], text_field: str, metrics: Dict[str, str]) -> Dict[str, dict]:
+    """
+    Sums metrics per normalized query. metrics maps output name -> row field.
+    Keeps the most-clicked original spelling as "text" and, when rows carry a
+    position, the impression-weighted average position.
+    """
+    totals: Dict[str, dict] = {}
+    for row in rows:
+        key = normalize_query(row.get(text_field, ""))
+        if not key:
+            continue
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = {name: 0 for name in metrics}
+            entry.update(text=row[text_field], best=-1, weighted_position=0.0, positioned=0)
+        for name, field in metrics.items():
+            entry[name] += row.get(field) or 0
+        clicks = row.get("clicks") or 0
+        if clicks > entry["best"]:
+            entry["text"], entry["best"] = row[text_field], clicks
+        if row.get("position") is not None:
+            impressions = row.get("impressions") or 0
+            entry["weighted_position"] += row["position"] * impressions
+            entry["positioned"] += impressions
+    for entry in totals.values():
+        positioned = entry.pop("positioned")
+        weighted = entry.pop("weighted_position")
+        entry["position"] = weighted / positioned if positioned else None
+        del entry["best"]
+    return totals
+
+
+class _FuzzyIndex:
+    """
+    Organic keys by inflection key, plus a deletion index for single-edit
+    lookups (every key with one character removed). Where keys share a
+    deletion, the one with the most impressions is kept.
+    """
+
+    def __init__(self, organic: Dict[str, dict]):
+        self.by_inflection: Dict[str, str] = {}
+        for key in sorted(organic, key=lambda k: -organic[k]["impressions"]):
+            self.by_inflection.setdefault(inflection_key(key), key)
+        # Built in reverse so the highest-impression key wins each slot
+        editable = [k for k in reversed(self.by_inflection) if len(k) >= MIN_EDIT_LENGTH]
+        self.by_delete: Dict[str, str] = {
+            key[:i] + key[i + 1 :]: key for key in editable for i in range(len(key))
+        }
+        self.by_delete.update((key, key) for key in editable)
+
+    def match(self, key: str):
+        """(organic key, "inflection" | "spelling") or (None, None)."""
+        inflected = inflection_key(key)
+        if inflected in self.by_inflection:
+            return self.by_inflection[inflected], "inflection"
+        if len(inflected) < MIN_EDIT_LENGTH:
+            return None, None
+        for probe in (inflected, *_deletes(inflected)):
+            candidate = self.by_delete.get(probe)
+            if candidate is not None and _one_edit_apart(inflected, candidate):
+                return self.by_inflection[candidate], "spelling"
+        return None, None
+
+
+def _status(organic, paid, combined, cannibalization_position, gap_position, min_gap_impressions):
+    # The paid/organic report shows paid clicks even for terms missing from the search terms report
+    paid_clicks = combined is not None and combined["combined_clicks"] > combined["clicks"]
+    if organic and (paid or paid_clicks):
+        strong = organic["position"] is not None and organic["position"] <= cannibalization_position
+        return "cannibalization" if strong and paid and paid["cost"] > 0 else "overlap"
+    if organic:
+        # Queries without a known position (paid/organic report only) are never gaps
+        weak = organic["position"] is not None and organic["position"] > gap_position
+        return "gap" if weak and organic["impressions"] >= min_gap_impressions else "organic_only"
+    return "paid_only"
+
+
+def compute_overlap(
+    organic: Iterable[dict],
+    paid: Iterable[dict],
+    paid_organic: Optional[Iterable[dict]] = None,
+    fuzzy: bool = False,
+    cannibalization_position: float = CANNIBALIZATION_POSITION,
+    gap_position: float = GAP_POSITION,
+    min_gap_impressions: int = MIN_GAP_IMPRESSIONS,
+) -> dict:
+    """
+    Joins organic queries, paid search terms and (optionally) paid/organic
+    report rows into one keyword table.
+
+    organic rows: {"keyword", "clicks", "impressions", "position"} (get_organic_queries)
+    paid rows: {"search_term", "clicks", "impressions", "cost", "conversions"} (get_search_terms)
+    paid_organic rows: {"search_term", "combined_clicks", "organic_clicks", "organic_impressions"}
+
+    Paid/organic rows fill in organic clicks and impressions (without a
+    position) for queries Search Console did not return.
+
+    Returns {"summary": {status: {"keywords", "organic_clicks", "paid_cost"}},
+    "keywords": [row, ...]} with rows keyed like keyword_analysis.json,
+    ordered by status then organic impressions.
+    """
+    organic_totals = _aggregate(organic, "keyword", {name: name for name in ORGANIC_METRICS})
+    paid_totals = _aggregate(paid, "search_term", {name: name for name in PAID_METRICS})
+    combined = {}
+    if paid_organic is not None:
+        combined = _aggregate(
+            paid_organic,
+            "search_term",
+            {
+                "combined_clicks": "combined_clicks",
+                "clicks": "organic_clicks",
+                "impressions": "organic_impressions",
+            },
+        )
+        for key, entry in combined.items():
+            if key not in organic_totals and entry["impressions"] > 0:
+                organic_totals[key] = {
+                    "text": entry["text"],
+                    "clicks": entry["clicks"],
+                    "impressions": entry["impressions"],
+                    "position": None,
+                }
+
+    # Each paid term joins one organic key: exact first, then fuzzy
+    joined: Dict[str, List[str]] = defaultdict(list)
+    match_types: Dict[str, str] = {}
+    unmatched_paid = []
+    for key in paid_totals:
+        if key in organic_totals:
+            joined[key].append(key)
+            match_types[key] = "exact"
+        else:
+            unmatched_paid.append(key)
+    if fuzzy and unmatched_paid:
+        index = _FuzzyIndex(organic_totals)
+        still_unmatched = []
+        for key in unmatched_paid:
+            organic_key, match = index.match(key)
+            if organic_key is None:
+                still_unmatched.append(key)
+            else:
+                joined[organic_key].append(key)
+                match_types[organic_key] = (
+                    match if match_types.get(organic_key, match) == match else "mixed"
+                )
+        unmatched_paid = still_unmatched
+
+    rows = []
+    for key, organic_entry in organic_totals.items():
+        paid_keys = joined.get(key, [])
+        paid_entry = None
+        if paid_keys:
+            paid_entry = {name: sum(paid_totals[k][name] for k in paid_keys) for name in PAID_METRICS}
+        rows.append(
+            _row(
+                organic_entry["text"],
+                key,
+                organic_entry,
+                paid_entry,
+                [paid_totals[k]["text"] for k in paid_keys if k != key],
+                match_types.get(key),
+                combined.get(key),
+                _status(
+                    organic_entry,
+                    paid_entry,
+                    combined.get(key),
+                    cannibalization_position,
+                    gap_position,
+                    min_gap_impressions,
+                ),
+            )
+        )
+    for key in unmatched_paid:
+        paid_entry = paid_totals[key]
+        rows.append(_row(paid_entry["text"], key, None, paid_entry, [], None, combined.get(key), "paid_only"))
+
+    rank = {status: i for i, status in enumerate(STATUS_ORDER)}
+    rows.sort(key=lambda row: (rank[row["Status"]], -row["Organic Impressions"], -row["Paid Cost"]))
+
+    summary = {
+        status: {"keywords": 0, "organic_clicks": 0, "paid_cost": 0.0} for status in STATUS_ORDER
+    }
+    for row in rows:
+        bucket = summary[row["Status"]]
+        bucket["keywords"] += 1
+        bucket["organic_clicks"] += row["Organic Clicks"]
+        bucket["paid_cost"] = round(bucket["paid_cost"] + row["Paid Cost"], 2)
+    return {"summary": summary, "keywords": rows}
+
+
+def _row(text, key, organic, paid, paid_variants, match, combined, status):
+    position = organic["position"] if organic else None
+    return {
+        "Keyword": text,
+        "Normalized": key,
+        "Status": status,
+        "Source": "both" if organic and paid else ("gsc" if organic else "ads"),
+        "Match": match,
+        "Paid Variants": paid_variants,
+        "Organic Clicks": organic["clicks"] if organic else 0,
+        "Organic Impressions": organic["impressions"] if organic else 0,
+        "Organic Position": round(position, 1) if position is not None else None,
+        "Paid Clicks": paid["clicks"] if paid else 0,
+        "Paid Impressions": paid["impressions"] if paid else 0,
+        "Paid Cost": round(paid["cost"], 2) if paid else 0.0,
+        "Paid Conversions": round(paid["conversions"], 2) if paid else 0.0,
+        "Combined Clicks": combined["combined_clicks"] if combined else None,
+    }
+
+
+def collect_overlap(customer_id, site_url, days=90, date_range="LAST_90_DAYS", fuzzy=True):
+    """Fetches the three sources for one client and computes their overlap."""
+    from backend.services.ads_connector import AdsConnector
+    from backend.services.search_console import SearchConsoleService
+
+    organic = SearchConsoleService().get_organic_queries(site_url, days=days)
+    if isinstance(organic, dict) and "error" in organic:
+        return organic
+    ads = AdsConnector()
+    return compute_overlap(
+        organic,
+        ads.get_search_terms(customer_id, date_range),
+        ads.get_paid_organic_performance(customer_id, date_range),
+        fuzzy=fuzzy,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+    from pathlib import Path
+
+    # Add plugin root to path for imports (works from any directory)
+    _plugin_root = Path(__file__).parent.parent.parent
+    if str(_plugin_root) not in sys.path:
+        sys.path.insert(0, str(_plugin_root))
+
+    parser = argparse.ArgumentParser(description="Paid/organic keyword overlap for one client")
+    parser.add_argument("customer_id", help="Google Ads customer ID")
+    parser.add_argument("site_url", help="Client website (resolved to its Search Console property)")
+    parser.add_argument("--days", type=int, default=90, help="Organic lookback in days")
+    parser.add_argument("--date-range", default="LAST_90_DAYS", help="Google Ads date range")
+    parser.add_argument("--exact", action="store_true", help="Disable fuzzy matching")
+    parser.add_argument("-o", "--output", default="keyword_overlap.json", help="Output JSON file")
+    args = parser.parse_args()
+
+    result = collect_overlap(
+        args.customer_id, args.site_url, args.days, args.date_range, fuzzy=not args.exact
+    )
+    if "error" in result:
+        sys.exit(f"Error: {result['error']}")
+    Path(args.output).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    for status, bucket in result["summary"].items():
+        print(f"{status:16} {bucket['keywords']:7} keywords  {bucket['paid_cost']:12.2f} paid cost")
+    print(f"Saved to {args.output}")
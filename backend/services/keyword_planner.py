@@ -15,18 +15,18 @@ _plugin_root = Path(__file__).parent.parent.parent
 if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
-from google.ads.googleads.client import GoogleAdsClient
 import os
 from backend.services.credentials import ensure_credentials
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[KeywordPlanner] Credentials loaded from: {_cred_source}")
-
 
 class KeywordPlannerService:
     def __init__(self):
-        # Initialize Google Ads Client
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+
+        # Initialize Google Ads Client (imported here: google-ads is slow to import)
+        from google.ads.googleads.client import GoogleAdsClient
+
         self.client = GoogleAdsClient.load_from_dict(
             {
                 "developer_token": os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN"),
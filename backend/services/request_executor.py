@@ -0,0 +1,191 @@
+"""
+Shared request executor for the Sheets, Drive and Search Console clients.
+
+Every googleapiclient request goes through one process-wide executor per API:
+- A token bucket per quota (e.g. Sheets reads and writes per user per minute)
+  delays requests instead of letting them fail with 429.
+- 429, 5xx, rate-limit 403s and transport errors are retried with
+  exponential backoff and full jitter (honouring Retry-After). Requests
+  marked idempotent=False are only retried on 429 and rate-limit 403s.
+- Final failures come back as a RequestFailure (falsy, so `if not result`
+  checks keep working) or are raised as RequestError.
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from googleapiclient.errors import HttpError
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# 403 reasons Google uses for quota and rate limits (Drive reports these instead of 429)
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+RETRYABLE_REASONS = RATE_LIMIT_REASONS | {"backendError"}
+
+# Requests per minute per user; reads are GET requests, everything else is a write
+QUOTAS = {
+    "sheets": {"read": 60, "write": 60},
+    "drive": {"read": 12000, "write": 12000},
+    # Search Analytics queries are POST requests, so they count against "write"
+    "searchconsole": {"read": 1200, "write": 1200},
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until tokens are available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass(frozen=True)
+class RequestFailure:
+    """Why a request failed after all attempts."""
+
+    api: str
+    method: str
+    status: Optional[int]  # None for transport errors
+    reason: str
+    message: str
+    attempts: int
+    retryable: bool
+
+    def __bool__(self):
+        return False
+
+    def __str__(self):
+        status = self.status if self.status is not None else "network"
+        return f"{self.api} {self.method} failed ({status} {self.reason}) after {self.attempts} attempts: {self.message}"
+
+
+class RequestError(Exception):
+    """Raised by RequestExecutor.execute; carries the RequestFailure."""
+
+    def __init__(self, failure: RequestFailure):
+        super().__init__(str(failure))
+        self.failure = failure
+
+
+def _http_error_reason(error: "HttpError") -> tuple:
+    """(reason, message) from a Google API error body."""
+    try:
+        body = json.loads(error.content.decode("utf-8"))["error"]
+        details = body.get("errors") or [{}]
+        return details[0].get("reason") or body.get("status", ""), body.get("message", str(error))
+    except (ValueError, KeyError, TypeError, AttributeError, UnicodeDecodeError):
+        return "", str(error)
+
+
+class RequestExecutor:
+    """
+    Executes googleapiclient requests for one API under its rate limits.
+
+    Use get_executor(api) rather than constructing one, so that every client
+    in the process shares the same buckets.
+    """
+
+    def __init__(
+        self,
+        api: str,
+        quotas: Optional[Dict[str, float]] = None,
+        max_attempts: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 64.0,
+    ):
+        self.api = api
+        self.buckets = {kind: TokenBucket(rate) for kind, rate in (quotas or QUOTAS[api]).items()}
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        # Full jitter: uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+    def try_execute(self, request, idempotent: bool = True):
+        """
+        Run request with rate limiting and retries; returns the response or a RequestFailure.
+
+        Pass idempotent=False for requests that must not be applied twice
+        (creates, copies, uploads, addSheet/deleteSheet batchUpdates). A 5xx
+        or transport error can arrive after the server applied them, so only
+        429 and rate-limit 403s, which reject the request outright, are retried.
+        """
+        from googleapiclient.errors import HttpError
+        from httplib2 import HttpLib2Error
+
+        method = getattr(request, "method", "POST")
+        bucket = self.buckets.get("read" if method == "GET" else "write")
+        failure = None
+        for attempt in range(self.max_attempts):
+            if bucket:
+                bucket.acquire()
+            retry_after = None
+            try:
+                return request.execute(num_retries=0)
+            except HttpError as e:
+                status = e.resp.status
+                reason, message = _http_error_reason(e)
+                if status == 429 or (status == 403 and reason in RATE_LIMIT_REASONS):
+                    retryable = True
+                else:
+                    retryable = idempotent and (
+                        status in RETRYABLE_STATUSES or (status == 403 and reason in RETRYABLE_REASONS)
+                    )
+                retry_after = e.resp.get("retry-after")
+            except (OSError, HttpLib2Error) as e:
+                # Timeouts, resets, DNS (ServerNotFoundError) and TLS (ssl.SSLError) failures
+                status, reason, message, retryable = None, type(e).__name__, str(e), idempotent
+            failure = RequestFailure(self.api, method, status, reason, message, attempt + 1, retryable)
+            if not retryable or attempt + 1 == self.max_attempts:
+                break
+            time.sleep(self._backoff(attempt, retry_after))
+        return failure
+
+    def execute(self, request, idempotent: bool = True):
+        """Like try_execute, but raises RequestError on failure."""
+        result = self.try_execute(request, idempotent)
+        if isinstance(result, RequestFailure):
+            raise RequestError(result)
+        return result
+
+
+_executors: Dict[str, RequestExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(api: str) -> RequestExecutor:
+    """The process-wide executor for api ("sheets", "drive" or "searchconsole")."""
+    with _executors_lock:
+        if api not in _executors:
+            _executors[api] = RequestExecutor(api)
+        return _executors[api]
@@ -1,6 +1,14 @@
 """
 Google Search Console Service.
 Access organic search data via the Search Console API.
+
+export_search_analytics() pulls every row for a date range into a local
+SQLite store (SearchAnalyticsStore): one request stream per day, paged by
+startRow, with days fetched concurrently through the shared executor.
+
+Properties are resolved through a SiteRegistry that caches the account's
+site list (in memory and on disk, with a TTL), so resolving a URL does not
+cost a sites.list request.
 """
 
 import sys
@@ -11,78 +19,355 @@ _plugin_root = Path(__file__).parent.parent.parent
 if str(_plugin_root) not in sys.path:
     sys.path.insert(0, str(_plugin_root))
 
+import hashlib
+import json
 import os
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 from backend.services.credentials import ensure_credentials
+from backend.services.google_auth import build_service, get_credentials
+from backend.services.request_executor import RequestFailure, get_executor
 
-# Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
-_cred_source = ensure_credentials()
-print(f"[SearchConsole] Credentials loaded from: {_cred_source}")
+# Search Analytics returns at most 25,000 rows per request; larger results are paged with startRow
+MAX_ROWS_PER_REQUEST = 25000
 
+EXPORT_DIMENSIONS = ("query", "page", "country", "device")
 
-class SearchConsoleService:
-    def __init__(self):
-        # Re-use the OAuth credentials from Google Ads if possible,
-        # assuming the user granted GSC scopes.
-        # If not, we might need a separate auth flow, but for now we try to unify.
+# The most recent days are still being finalized by Google; they are refetched on every export
+FRESH_DAYS = 3
 
-        # We construct credentials from the environment variables
-        self.creds = Credentials(
-            token=None,  # Access token (will be refreshed)
-            refresh_token=os.getenv("GOOGLE_ADS_REFRESH_TOKEN"),
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=os.getenv("GOOGLE_ADS_CLIENT_ID"),
-            client_secret=os.getenv("GOOGLE_ADS_CLIENT_SECRET"),
-        )
+EXPORT_DB = Path.home() / ".mondaybrew" / "cache" / "gsc" / "search_analytics.sqlite"
 
-        self.service = build("searchconsole", "v1", credentials=self.creds)
+# Seconds a fetched site list is used before sites.list is called again
+SITE_CACHE_TTL = 3600
 
-    def _find_matching_site(self, url):
+SITE_CACHE_DIR = Path.home() / ".mondaybrew" / "cache" / "gsc"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    search_type TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    UNIQUE (site, search_type, dimensions)
+);
+CREATE TABLE IF NOT EXISTS days (
+    export_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    final INTEGER NOT NULL,
+    PRIMARY KEY (export_id, date)
+);
+CREATE TABLE IF NOT EXISTS rows (
+    export_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    query INTEGER,
+    page INTEGER,
+    country INTEGER,
+    device INTEGER,
+    clicks INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_by_day ON rows (export_id, date);
+"""
+
+
+def date_range(start_date, end_date):
+    """Every date from start_date to end_date inclusive, as "YYYY-MM-DD" strings."""
+    start = date.fromisoformat(start_date)
+    days = (date.fromisoformat(end_date) - start).days
+    return [(start + timedelta(days=i)).isoformat() for i in range(days + 1)]
+
+
+class SearchAnalyticsStore:
+    """
+    Local SQLite store for exported Search Analytics rows.
+
+    Queries, pages, countries and devices are stored once in a string table
+    and referenced by id, so rows stay small. Each (site, search type,
+    dimensions) combination is one export; a day is recorded once all its
+    rows are stored, and final days are not fetched again.
+
+    Not thread-safe: use it from the thread that created it.
+    """
+
+    def __init__(self, path=EXPORT_DB):
+        import sqlite3
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.executescript(_SCHEMA)
+        self._ids = {}
+
+    def close(self):
+        self.db.close()
+
+    def export_id(self, site, search_type, dimensions):
+        key = (site, search_type, ",".join(dimensions))
+        with self.db:
+            self.db.execute(
+                "INSERT OR IGNORE INTO exports (site, search_type, dimensions) VALUES (?, ?, ?)", key
+            )
+        return self.db.execute(
+            "SELECT id FROM exports WHERE site = ? AND search_type = ? AND dimensions = ?", key
+        ).fetchone()[0]
+
+    def final_days(self, export_id):
+        """Dates whose rows are stored and no longer change."""
+        return {
+            row[0]
+            for row in self.db.execute("SELECT date FROM days WHERE export_id = ? AND final", (export_id,))
+        }
+
+    def _string_ids(self, values):
+        """Ids for values, adding new ones to the string table."""
+        new = [v for v in set(values) if v not in self._ids]
+        if new:
+            self.db.executemany("INSERT OR IGNORE INTO strings (value) VALUES (?)", ((v,) for v in new))
+            for i in range(0, len(new), 500):
+                batch = new[i : i + 500]
+                self._ids.update(
+                    (value, id_)
+                    for id_, value in self.db.execute(
+                        f"SELECT id, value FROM strings WHERE value IN ({','.join('?' * len(batch))})", batch
+                    )
+                )
+        return self._ids
+
+    def replace_day(self, export_id, day, dimensions, rows, final):
+        """Stores the API rows for one day, replacing any rows stored for it before."""
+        columns = [dimensions.index(c) if c in dimensions else None for c in EXPORT_DIMENSIONS]
+        with self.db:
+            ids = self._string_ids(key for row in rows for key in row["keys"])
+            self.db.execute("DELETE FROM rows WHERE export_id = ? AND date = ?", (export_id, day))
+            self.db.executemany(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        export_id,
+                        day,
+                        *(ids[row["keys"][i]] if i is not None else None for i in columns),
+                        int(row["clicks"]),
+                        int(row["impressions"]),
+                        row["position"],
+                    )
+                    for row in rows
+                ),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)", (export_id, day, len(rows), int(final))
+            )
+
+    def rows(self, export_id, start_date, end_date):
+        """Yields stored rows as dicts (date, dimensions, clicks, impressions, position)."""
+        dims = ", ".join(f"{c}.value AS {c}" for c in EXPORT_DIMENSIONS)
+        joins = " ".join(f"LEFT JOIN strings {c} ON {c}.id = r.{c}" for c in EXPORT_DIMENSIONS)
+        cursor = self.db.execute(
+            f"SELECT r.date, {dims}, r.clicks, r.impressions, r.position FROM rows r {joins} "
+            "WHERE r.export_id = ? AND r.date BETWEEN ? AND ? ORDER BY r.date",
+            (export_id, start_date, end_date),
+        )
+        names = [d[0] for d in cursor.description]
+        for row in cursor:
+            yield dict(zip(names, row))
+
+    def query_totals(self, export_id, start_date, end_date):
         """
-        Finds the correct GSC property for a given URL.
-        Handles 'sc-domain:' prefixes and protocol differences.
+        Clicks, impressions, CTR and impression-weighted position per query,
+        most impressions first (same shape as get_organic_performance).
         """
+        cursor = self.db.execute(
+            "SELECT q.value, SUM(r.clicks), SUM(r.impressions), "
+            "SUM(r.position * r.impressions) / SUM(r.impressions) "
+            "FROM rows r JOIN strings q ON q.id = r.query "
+            "WHERE r.export_id = ? AND r.date BETWEEN ? AND ? "
+            "GROUP BY r.query HAVING SUM(r.impressions) > 0 ORDER BY SUM(r.impressions) DESC",
+            (export_id, start_date, end_date),
+        )
+        return [
+            {
+                "keyword": keyword,
+                "clicks": clicks,
+                "impressions": impressions,
+                "ctr": round(clicks / impressions * 100, 2),
+                "position": round(position, 1),
+            }
+            for keyword, clicks, impressions, position in cursor
+        ]
+
+
+def normalize_site(url):
+    """
+    (host, path) for a URL or property: lowercase host without scheme, "www."
+    or "sc-domain:", and path without trailing slash ("" for the root).
+    """
+    url = url.strip()
+    if url.startswith("sc-domain:"):
+        url = url[len("sc-domain:") :]
+    parts = urlsplit(url if "://" in url else "//" + url)
+    host = (parts.hostname or "").removeprefix("www.")
+    return host, parts.path.rstrip("/")
+
+
+class SiteRegistry:
+    """
+    The account's Search Console properties, indexed by normalized host.
+
+    The site list is fetched once per SITE_CACHE_TTL and shared by every
+    SearchConsoleService in the process; it is also kept on disk (per refresh
+    token), so short-lived scripts reuse it. resolve() is a dictionary lookup.
+    """
+
+    def __init__(self, ttl=SITE_CACHE_TTL, cache_dir=SITE_CACHE_DIR):
+        self.ttl = ttl
+        token = f"{os.getenv('GOOGLE_ADS_CLIENT_ID')}:{os.getenv('GOOGLE_ADS_REFRESH_TOKEN')}"
+        self.cache_file = Path(cache_dir) / f"sites-{hashlib.sha1(token.encode()).hexdigest()[:12]}.json"
+        self.lock = threading.Lock()
+        self.entries: List[dict] = []
+        self.fetched_at = 0.0
+        self.domains: Dict[str, str] = {}  # host -> sc-domain property
+        self.prefixes: Dict[str, List[str]] = {}  # host + path -> URL-prefix properties, https first
+
+    def _index(self, entries, fetched_at):
+        self.entries, self.fetched_at = entries, fetched_at
+        self.domains, self.prefixes = {}, {}
+        for entry in entries:
+            site = entry["siteUrl"]
+            # Unverified users can see a property but not query it
+            if entry.get("permissionLevel") == "siteUnverifiedUser":
+                continue
+            host, path = normalize_site(site)
+            if site.startswith("sc-domain:"):
+                self.domains[host] = site
+            else:
+                self.prefixes.setdefault(host + path, []).append(site)
+        for sites in self.prefixes.values():
+            sites.sort(key=lambda site: not site.startswith("https://"))
+
+    def _load_cache(self):
         try:
-            # 1. Get all accessible sites
-            site_list = self.service.sites().list().execute()
-            sites = [s["siteUrl"] for s in site_list.get("siteEntry", [])]
-
-            # 2. Normalize Input
-            # Remove http://, https://, www., and trailing slashes
-            clean_input = (
-                url.replace("https://", "")
-                .replace("http://", "")
-                .replace("www.", "")
-                .strip("/")
-            )
+            cached = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            return cached["entries"], cached["fetched_at"]
+        except (OSError, ValueError, KeyError):
+            return None
 
-            print(
-                f"--- GSC Lookup: Searching for '{clean_input}' in {len(sites)} sites ---"
+    def _save_cache(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(
+                json.dumps({"fetched_at": self.fetched_at, "entries": self.entries}), encoding="utf-8"
             )
+        except OSError:
+            pass
 
-            # 3. Search for Match
-            for site in sites:
-                # Normalize Site ID
-                clean_site = (
-                    site.replace("sc-domain:", "")
-                    .replace("https://", "")
-                    .replace("http://", "")
-                    .replace("www.", "")
-                    .strip("/")
-                )
+    def _refresh(self, service, force=False) -> bool:
+        """
+        Makes sure the index is fresh; falls back to a stale list if sites.list
+        fails. True if the list was just fetched.
+        """
+        if not force and time.time() - self.fetched_at < self.ttl:
+            return False
+        if not force and not self.fetched_at:
+            cached = self._load_cache()
+            if cached:
+                self._index(*cached)
+                if time.time() - self.fetched_at < self.ttl:
+                    return False
+        response = get_executor("searchconsole").try_execute(
+            service.sites().list(fields="siteEntry(siteUrl,permissionLevel)")
+        )
+        if isinstance(response, RequestFailure):
+            print(f"Error listing GSC sites: {response}")
+            return False
+        self._index(response.get("siteEntry", []), time.time())
+        self._save_cache()
+        return True
 
-                if clean_site == clean_input:
-                    print(f" -> Found Match: {site}")
-                    return site
+    def sites(self, service, refresh=False):
+        """All property URLs the account can see."""
+        with self.lock:
+            self._refresh(service, refresh)
+            return [entry["siteUrl"] for entry in self.entries]
 
-            print(f" -> No exact match found for {url}")
-            return None
+    def resolve(self, service, url) -> Optional[str]:
+        """
+        The property for url: the longest matching URL-prefix property when
+        url has a path, else the domain property for its host or a parent
+        domain (domain properties cover subdomains), else a URL-prefix
+        property for the host itself. None if there is no match.
 
-        except Exception as e:
-            print(f"Error finding matching site: {e}")
-            return None
+        A miss on a cached list refetches it once, so properties added since
+        the last fetch are found.
+        """
+        host, path = normalize_site(url)
+        with self.lock:
+            fetched = self._refresh(service)
+            site = self._lookup(host, path)
+            if site is None and not fetched:
+                self._refresh(service, force=True)
+                site = self._lookup(host, path)
+            return site
+
+    def _lookup(self, host, path) -> Optional[str]:
+        segments = path.split("/")
+        for end in range(len(segments), 1, -1):
+            sites = self.prefixes.get(host + "/".join(segments[:end]))
+            if sites:
+                return sites[0]
+        labels = host.split(".")
+        for start in range(len(labels) - 1):
+            site = self.domains.get(".".join(labels[start:]))
+            if site:
+                return site
+        sites = self.prefixes.get(host)
+        return sites[0] if sites else None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_site_registry() -> SiteRegistry:
+    """The process-wide SiteRegistry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SiteRegistry()
+        return _registry
+
+
+class SearchConsoleService:
+    def __init__(self):
+        # Load credentials from ~/.mondaybrew/.env - MUST succeed or raise error
+        ensure_credentials()
+
+        # Re-use the OAuth credentials from Google Ads if possible,
+        # assuming the user granted GSC scopes.
+        # If not, we might need a separate auth flow, but for now we try to unify.
+
+        # Credentials and transport are shared with the other services
+        self.creds = get_credentials()
+
+        self.service = build_service("searchconsole", "v1")
+        self.sites = get_site_registry()
+
+    def _find_matching_site(self, url):
+        """
+        Finds the correct GSC property for a given URL.
+        Handles 'sc-domain:' prefixes, protocol and www. differences and subdomains.
+        """
+        site = self.sites.resolve(self.service, url)
+        if site:
+            print(f"--- GSC Lookup: {url} -> {site} ---")
+        else:
+            print(f"--- GSC Lookup: No property found for {url} ---")
+        return site
 
     def get_organic_performance(self, site_url, days=30):
         """
@@ -139,13 +424,135 @@ class SearchConsoleService:
             print(f"Error fetching GSC data: {e}")
             return {"error": str(e)}
 
-    def list_sites(self):
-        """Lists all sites accessible by the user."""
+    def _fetch_day(self, site, day, dimensions, search_type):
+        """All rows for one day, paged by startRow. Returns a RequestFailure on error."""
+        # Runs in a worker thread: use that thread's client and transport
+        service = build_service("searchconsole", "v1")
+        executor = get_executor("searchconsole")
+        rows = []
+        while True:
+            response = executor.try_execute(
+                service.searchanalytics().query(
+                    siteUrl=site,
+                    body={
+                        "startDate": day,
+                        "endDate": day,
+                        "dimensions": list(dimensions),
+                        "type": search_type,
+                        "dataState": "all",
+                        "rowLimit": MAX_ROWS_PER_REQUEST,
+                        "startRow": len(rows),
+                    },
+                    fields="rows(keys,clicks,impressions,position)",
+                )
+            )
+            if isinstance(response, RequestFailure):
+                return response
+            page = response.get("rows", [])
+            rows.extend(page)
+            if len(page) < MAX_ROWS_PER_REQUEST:
+                return rows
+
+    def export_search_analytics(
+        self,
+        site_url,
+        start_date,
+        end_date,
+        dimensions=EXPORT_DIMENSIONS,
+        search_type="web",
+        max_workers=8,
+        store=None,
+    ):
+        """
+        Exports every Search Analytics row for site_url between start_date
+        and end_date ("YYYY-MM-DD", inclusive) into the local store.
+
+        dimensions is any subset of query, page, country and device. Each day
+        is requested separately (paged in 25,000-row requests) and days run
+        concurrently; days already stored as final are skipped.
+
+        Returns {"site", "export_id", "days", "fetched_days", "rows", "failed_days"}
+        or {"error": ...}. Read the data back with store.rows() or
+        store.query_totals().
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        unknown = set(dimensions) - set(EXPORT_DIMENSIONS)
+        if unknown:
+            return {"error": f"Unsupported dimensions: {', '.join(sorted(unknown))}"}
+
+        actual_site_url = self._find_matching_site(site_url)
+        if not actual_site_url:
+            return {
+                "error": f"Could not find GSC property for {site_url}. Ensure you have access and the URL is correct."
+            }
+
+        owns_store = store is None
+        store = store or SearchAnalyticsStore()
         try:
-            site_list = self.service.sites().list().execute()
-            return [s["siteUrl"] for s in site_list.get("siteEntry", [])]
-        except Exception as e:
-            return []
+            export_id = store.export_id(actual_site_url, search_type, dimensions)
+            days = date_range(start_date, end_date)
+            pending = sorted(set(days) - store.final_days(export_id))
+            final_before = (date.today() - timedelta(days=FRESH_DAYS)).isoformat()
+
+            print(
+                f"--- Exporting GSC {'x'.join(dimensions)} for {actual_site_url} "
+                f"({start_date} to {end_date}): {len(pending)} of {len(days)} days to fetch ---"
+            )
+
+            stored_rows = 0
+            failed_days = {}
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    pool.submit(self._fetch_day, actual_site_url, day, dimensions, search_type): day
+                    for day in pending
+                }
+                # Rows are written from this thread as days complete
+                for future in as_completed(futures):
+                    day = futures[future]
+                    rows = future.result()
+                    if isinstance(rows, RequestFailure):
+                        print(f" -> {day}: {rows}")
+                        failed_days[day] = str(rows)
+                        continue
+                    store.replace_day(export_id, day, dimensions, rows, final=day < final_before)
+                    stored_rows += len(rows)
+
+            print(f" -> Stored {stored_rows} rows from {len(pending) - len(failed_days)} days in {store.path}")
+            return {
+                "site": actual_site_url,
+                "export_id": export_id,
+                "days": len(days),
+                "fetched_days": len(pending) - len(failed_days),
+                "rows": stored_rows,
+                "failed_days": failed_days,
+            }
+        finally:
+            if owns_store:
+                store.close()
+
+    def get_organic_queries(self, site_url, days=90, dimensions=("query",)):
+        """
+        Every organic query for a site over the last N days (not just the top
+        20), in the same format as get_organic_performance.
+
+        Exports with only the query dimension by default: adding page splits a
+        query's impressions across pages and inflates its totals.
+        """
+        end_date = date.today().isoformat()
+        start_date = (date.today() - timedelta(days=days)).isoformat()
+        store = SearchAnalyticsStore()
+        try:
+            export = self.export_search_analytics(site_url, start_date, end_date, dimensions, store=store)
+            if "error" in export:
+                return export
+            return store.query_totals(export["export_id"], start_date, end_date)
+        finally:
+            store.close()
+
+    def list_sites(self, refresh=False):
+        """Lists all sites accessible by the user (cached; refresh=True refetches)."""
+        return self.sites.sites(self.service, refresh)
 
 
 if __name__ == "__main__":
@@ -8,6 +8,11 @@ This hook BLOCKS completion unless:
 3. Presentation was generated (Phase 7)
 4. Validation script was run
 
+Each artifact is stat'ed, read and parsed once, and all of its checks run
+against that parsed value (one combined regex per markdown file). Results are
+cached per artifact in .completion-cache.json, keyed by mtime and size, so
+unchanged artifacts are not re-read on the next Stop.
+
 Exit codes:
 - 0: Approve (all phases complete)
 - 2: Block (missing phases) - outputs JSON to stderr
@@ -17,8 +22,36 @@ import json
 import os
 import sys
 import re
+from collections import Counter
 from pathlib import Path
 
+# Shared business-rule engine (stdlib only) lives next to the validator script.
+# Imported on first use: cached Stops never need it.
+RULES_PATH = Path(__file__).resolve().parent.parent / "scripts" / "deliverable_rules.py"
+
+CACHE_FILE = ".completion-cache.json"
+
+# Maintained by validate-phase-gate.py on every approved artifact write
+INDEX_FILE = ".mb-index.json"
+
+
+def cache_version() -> str:
+    """Bump the leading number when a check changes; rule edits are caught by mtime."""
+    try:
+        return f"1-{RULES_PATH.stat().st_mtime_ns}"
+    except OSError:
+        return "1-none"
+
+
+def load_rules():
+    if str(RULES_PATH.parent) not in sys.path:
+        sys.path.insert(0, str(RULES_PATH.parent))
+    try:
+        import deliverable_rules
+    except ImportError:
+        return None
+    return deliverable_rules
+
 
 def is_keyword_analysis_directory(path: Path) -> bool:
     """Check if directory contains keyword analysis artifacts (not just any random directory)."""
@@ -37,8 +70,23 @@ def is_keyword_analysis_directory(path: Path) -> bool:
     return any((path / marker).exists() for marker in analysis_markers)
 
 
+def indexed_client_dir(clients_dir: Path) -> Path | None:
+    """Active client from the phase gate's index, unless clients/ changed after it was written."""
+    index_path = clients_dir / INDEX_FILE
+    try:
+        if index_path.stat().st_mtime_ns < clients_dir.stat().st_mtime_ns:
+            return None  # A client dir was added or removed since
+        with open(index_path) as f:
+            active = clients_dir / json.load(f)["active"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if active.is_dir() and is_keyword_analysis_directory(active):
+        return active
+    return None
+
+
 def find_client_dir():
-    """Find the active client directory from environment or recent files.
+    """Find the active client directory from environment, the client index or recent files.
 
     IMPORTANT: Only returns a directory if it contains actual keyword analysis artifacts.
     This prevents the hook from triggering in unrelated projects that happen
@@ -53,80 +101,73 @@ def find_client_dir():
     cwd = Path.cwd()
     clients_dir = cwd / "clients"
     if clients_dir.exists():
-        # Find most recently modified client WITH actual analysis artifacts
-        client_dirs = [
-            d
-            for d in clients_dir.iterdir()
-            if d.is_dir() and is_keyword_analysis_directory(d)
-        ]
-        if client_dirs:
-            return max(client_dirs, key=lambda d: d.stat().st_mtime)
+        client_dir = indexed_client_dir(clients_dir)
+        if client_dir:
+            return client_dir
+
+        # No usable index: find the most recently modified client WITH actual
+        # analysis artifacts, walking newest first and probing markers only
+        # until one qualifies
+        with os.scandir(clients_dir) as it:
+            entries = [e for e in it if e.is_dir()]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries:
+            if is_keyword_analysis_directory(Path(entry.path)):
+                return Path(entry.path)
 
     return None
 
 
-def check_file_exists(path: Path) -> bool:
-    """Check if file exists and is not empty."""
-    return path.exists() and path.stat().st_size > 0
+# ---- Checks on loaded artifacts -------------------------------------------
 
 
-def check_file_contains(path: Path, patterns: list[str]) -> tuple[bool, list[str]]:
-    """Check if file contains all required patterns."""
-    if not path.exists():
-        return False, patterns
+def issue(phase: int, severity: str, message: str) -> dict:
+    return {"phase": phase, "severity": severity, "message": message}
 
-    content = path.read_text()
-    missing = []
-    for pattern in patterns:
-        if not re.search(pattern, content, re.IGNORECASE):
-            missing.append(pattern)
 
-    return len(missing) == 0, missing
+def section_matcher(patterns: list[str]):
+    """One case-insensitive regex for all patterns; returns a missing-patterns function."""
+    combined = re.compile(
+        "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)), re.IGNORECASE
+    )
 
+    def missing_sections(content: str) -> list[str]:
+        found = set()
+        for match in combined.finditer(content):
+            found.add(match.lastgroup)
+            if len(found) == len(patterns):
+                return []
+        # A match can hide an overlapping one; confirm misses individually
+        return [
+            p
+            for i, p in enumerate(patterns)
+            if f"p{i}" not in found and not re.search(p, content, re.IGNORECASE)
+        ]
 
-def check_json_valid(path: Path) -> tuple[bool, str]:
-    """Check if JSON file is valid."""
-    if not path.exists():
-        return False, "File does not exist"
-
-    try:
-        with open(path) as f:
-            json.load(f)
-        return True, ""
-    except json.JSONDecodeError as e:
-        return False, str(e)
+    return missing_sections
 
 
-def check_json_has_keys(path: Path, keys: list[str]) -> tuple[bool, list[str]]:
-    """Check if JSON file has required top-level keys."""
-    if not path.exists():
-        return False, keys
+WEBSITE_SECTIONS = section_matcher(["Core Services", "Business Type|Target Customers"])
+POTENTIAL_SECTIONS = section_matcher(["Budget", "Campaign Structure|Proposed"])
 
-    try:
-        with open(path) as f:
-            data = json.load(f)
 
-        if isinstance(data, list):
-            # For array JSON, check first item
-            if len(data) == 0:
-                return False, ["empty array"]
-            data = data[0] if isinstance(data[0], dict) else {}
+def missing_keys(data, keys: list[str]) -> list[str]:
+    """Required top-level keys missing from data (first item for arrays)."""
+    if isinstance(data, list):
+        # For array JSON, check first item
+        if len(data) == 0:
+            return ["empty array"]
+        data = data[0] if isinstance(data[0], dict) else {}
 
-        missing = [k for k in keys if k not in data]
-        return len(missing) == 0, missing
-    except:
-        return False, keys
+    try:
+        return [k for k in keys if k not in data]
+    except TypeError:
+        return keys
 
 
-def check_roi_scenarios(path: Path) -> tuple[bool, str]:
+def check_roi_scenarios(data) -> tuple[bool, str]:
     """Check if ROI calculator has three scenarios."""
-    if not path.exists():
-        return False, "File does not exist"
-
     try:
-        with open(path) as f:
-            data = json.load(f)
-
         # Check for scenarios in notes or at top level
         scenarios_found = []
 
@@ -159,230 +200,177 @@ def check_roi_scenarios(path: Path) -> tuple[bool, str]:
         return False, str(e)
 
 
-def validate_phases(client_dir: Path) -> tuple[bool, list[dict]]:
-    """Validate all phases are complete."""
-    issues = []
+def check_business_rules(data, filename: str, schema_type: str, phase: int) -> list[dict]:
+    """Summarize deliverable_rules violations for a tab as warn-level issues."""
+    deliverable_rules = load_rules()
+    if deliverable_rules is None:
+        return []
 
-    # Phase 1: website_content.md
-    phase1_file = client_dir / "website_content.md"
-    if not check_file_exists(phase1_file):
-        issues.append(
-            {
-                "phase": 1,
-                "severity": "block",
-                "message": "Phase 1 incomplete: website_content.md missing",
-            }
-        )
-    else:
-        ok, missing = check_file_contains(
-            phase1_file, ["Core Services", "Business Type|Target Customers"]
+    rows = data.get("keywords", data) if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        return []
+    try:
+        violations = deliverable_rules.evaluate(rows, schema_type)
+    except Exception:
+        return []
+
+    if not violations:
+        return []
+    by_rule = Counter(v.rule for v in violations)
+    summary = ", ".join(f"{rule}: {count}" for rule, count in by_rule.most_common())
+    return [
+        issue(
+            phase,
+            "warn",
+            f"Phase {phase} quality: {len(violations)} rule violation(s) in {filename} ({summary})",
         )
-        if not ok:
-            issues.append(
-                {
-                    "phase": 1,
-                    "severity": "warn",
-                    "message": f"Phase 1 quality: Missing sections in website_content.md: {missing}",
-                }
-            )
+    ]
 
-    # Phase 2: potential_analysis.md
-    phase2_file = client_dir / "potential_analysis.md"
-    if not check_file_exists(phase2_file):
-        issues.append(
-            {
-                "phase": 2,
-                "severity": "block",
-                "message": "Phase 2 incomplete: potential_analysis.md missing",
-            }
-        )
-    else:
-        ok, missing = check_file_contains(
-            phase2_file, ["Budget", "Campaign Structure|Proposed"]
-        )
-        if not ok:
-            issues.append(
-                {
-                    "phase": 2,
-                    "severity": "warn",
-                    "message": f"Phase 2 quality: Missing sections: {missing}",
-                }
-            )
 
-    # Phase 3: keyword_analysis.json
-    phase3_file = client_dir / "keyword_analysis.json"
-    if not check_file_exists(phase3_file):
-        issues.append(
-            {
-                "phase": 3,
-                "severity": "block",
-                "message": "Phase 3 incomplete: keyword_analysis.json missing",
-            }
-        )
-    else:
-        ok, err = check_json_valid(phase3_file)
-        if not ok:
-            issues.append(
-                {
-                    "phase": 3,
-                    "severity": "block",
-                    "message": f"Phase 3 error: Invalid JSON - {err}",
-                }
-            )
-        else:
-            # Check keyword count
-            try:
-                with open(phase3_file) as f:
-                    data = json.load(f)
-                keywords = (
-                    data.get("keywords", data) if isinstance(data, dict) else data
-                )
-                if isinstance(keywords, list) and len(keywords) < 10:
-                    issues.append(
-                        {
-                            "phase": 3,
-                            "severity": "warn",
-                            "message": f"Phase 3 quality: Only {len(keywords)} keywords (expected 10+)",
-                        }
-                    )
-            except:
-                pass
-
-    # Phase 3: negative_keywords.json (also Phase 3 output)
-    phase3_negatives = client_dir / "negative_keywords.json"
-    if not check_file_exists(phase3_negatives):
-        issues.append(
-            {
-                "phase": 3,
-                "severity": "block",
-                "message": "Phase 3 incomplete: negative_keywords.json missing. Must include global, vertical, client_specific, and campaign_negative_lists.",
-            }
-        )
-    else:
-        ok, err = check_json_valid(phase3_negatives)
-        if not ok:
-            issues.append(
-                {
-                    "phase": 3,
-                    "severity": "block",
-                    "message": f"Phase 3 error: Invalid negative_keywords.json - {err}",
-                }
-            )
-        else:
-            # Check required keys exist
-            try:
-                with open(phase3_negatives) as f:
-                    neg_data = json.load(f)
-                required_keys = ["global", "client_specific"]
-                missing_keys = [k for k in required_keys if k not in neg_data]
-                if missing_keys:
-                    issues.append(
-                        {
-                            "phase": 3,
-                            "severity": "warn",
-                            "message": f"Phase 3 quality: negative_keywords.json missing keys: {missing_keys}",
-                        }
-                    )
-            except:
-                pass
-
-    # Phase 4: campaign_structure.json
-    phase4_file = client_dir / "campaign_structure.json"
-    if not check_file_exists(phase4_file):
-        issues.append(
-            {
-                "phase": 4,
-                "severity": "block",
-                "message": "Phase 4 incomplete: campaign_structure.json missing",
-            }
-        )
-    else:
-        ok, err = check_json_valid(phase4_file)
-        if not ok:
-            issues.append(
-                {
-                    "phase": 4,
-                    "severity": "block",
-                    "message": f"Phase 4 error: Invalid JSON - {err}",
-                }
-            )
+def check_website_content(content: str) -> list[dict]:
+    missing = WEBSITE_SECTIONS(content)
+    if missing:
+        return [issue(1, "warn", f"Phase 1 quality: Missing sections in website_content.md: {missing}")]
+    return []
 
-    # Phase 5: ad_copy.json
-    phase5_file = client_dir / "ad_copy.json"
-    if not check_file_exists(phase5_file):
-        issues.append(
-            {
-                "phase": 5,
-                "severity": "block",
-                "message": "Phase 5 incomplete: ad_copy.json missing",
-            }
-        )
-    else:
-        ok, err = check_json_valid(phase5_file)
-        if not ok:
-            issues.append(
-                {
-                    "phase": 5,
-                    "severity": "block",
-                    "message": f"Phase 5 error: Invalid JSON - {err}",
-                }
-            )
-        else:
-            ok, missing = check_json_has_keys(
-                phase5_file, ["Headline 1", "Description 1"]
-            )
-            if not ok:
-                issues.append(
-                    {
-                        "phase": 5,
-                        "severity": "warn",
-                        "message": f"Phase 5 quality: Missing ad copy fields: {missing}",
-                    }
-                )
 
-    # Phase 6: roi_calculator.json
-    phase6_file = client_dir / "roi_calculator.json"
-    if not check_file_exists(phase6_file):
-        issues.append(
-            {
-                "phase": 6,
-                "severity": "block",
-                "message": "Phase 6 incomplete: roi_calculator.json missing",
-            }
-        )
-    else:
-        # Validate JSON is valid
-        ok, err = check_json_valid(phase6_file)
-        if not ok:
-            issues.append(
-                {
-                    "phase": 6,
-                    "severity": "block",
-                    "message": f"Phase 6 error: Invalid JSON - {err}",
-                }
-            )
+def check_potential_analysis(content: str) -> list[dict]:
+    missing = POTENTIAL_SECTIONS(content)
+    if missing:
+        return [issue(2, "warn", f"Phase 2 quality: Missing sections: {missing}")]
+    return []
+
+
+def check_keyword_analysis(data) -> list[dict]:
+    issues = []
+    # Check keyword count
+    keywords = data.get("keywords", data) if isinstance(data, dict) else data
+    if isinstance(keywords, list) and len(keywords) < 10:
+        issues.append(issue(3, "warn", f"Phase 3 quality: Only {len(keywords)} keywords (expected 10+)"))
+    issues.extend(check_business_rules(data, "keyword_analysis.json", "keyword_analysis", 3))
+    return issues
+
+
+def check_negative_keywords(data) -> list[dict]:
+    # Check required keys exist
+    try:
+        missing = [k for k in ["global", "client_specific"] if k not in data]
+    except TypeError:
+        return []
+    if missing:
+        return [issue(3, "warn", f"Phase 3 quality: negative_keywords.json missing keys: {missing}")]
+    return []
+
+
+def check_campaign_structure(data) -> list[dict]:
+    return check_business_rules(data, "campaign_structure.json", "campaign_structure", 4)
+
+
+def check_ad_copy(data) -> list[dict]:
+    issues = []
+    missing = missing_keys(data, ["Headline 1", "Description 1"])
+    if missing:
+        issues.append(issue(5, "warn", f"Phase 5 quality: Missing ad copy fields: {missing}"))
+    issues.extend(check_business_rules(data, "ad_copy.json", "ad_copy", 5))
+    return issues
+
+
+def check_roi_calculator(data) -> list[dict]:
+    # Scenarios are optional - presentation has interactive calculator
+    ok, err = check_roi_scenarios(data)
+    if not ok:
+        return [issue(6, "warn", f"Phase 6 quality: ROI scenarios are optional - {err}")]
+    return []
+
+
+# (phase, filename, message when missing, invalid-JSON prefix or None for text, check)
+PHASE_ARTIFACTS = [
+    (1, "website_content.md", "Phase 1 incomplete: website_content.md missing", None, check_website_content),
+    (2, "potential_analysis.md", "Phase 2 incomplete: potential_analysis.md missing", None, check_potential_analysis),
+    (3, "keyword_analysis.json", "Phase 3 incomplete: keyword_analysis.json missing", "Phase 3 error: Invalid JSON", check_keyword_analysis),
+    (
+        3,
+        "negative_keywords.json",
+        "Phase 3 incomplete: negative_keywords.json missing. Must include global, vertical, client_specific, and campaign_negative_lists.",
+        "Phase 3 error: Invalid negative_keywords.json",
+        check_negative_keywords,
+    ),
+    (4, "campaign_structure.json", "Phase 4 incomplete: campaign_structure.json missing", "Phase 4 error: Invalid JSON", check_campaign_structure),
+    (5, "ad_copy.json", "Phase 5 incomplete: ad_copy.json missing", "Phase 5 error: Invalid JSON", check_ad_copy),
+    (6, "roi_calculator.json", "Phase 6 incomplete: roi_calculator.json missing", "Phase 6 error: Invalid JSON", check_roi_calculator),
+    (
+        7,
+        "presentation.html",
+        "Phase 7 incomplete: presentation.html missing. Run: python scripts/generate_presentation.py",
+        None,
+        None,
+    ),
+]
+
+
+def check_artifact(path: Path, phase: int, invalid_prefix, check) -> list[dict]:
+    """Read and parse an existing artifact once, then run all of its checks."""
+    if check is None:
+        return []
+    if invalid_prefix is None:
+        return check(path.read_text(errors="replace"))
+    try:
+        data = json.loads(path.read_text())
+    except ValueError as e:
+        return [issue(phase, "block", f"{invalid_prefix} - {e}")]
+    return check(data)
+
+
+# ---- Result cache ----------------------------------------------------------
+
+
+def load_cache(client_dir: Path) -> dict:
+    try:
+        with open(client_dir / CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != cache_version():
+        return {}
+    return cache.get("artifacts", {})
+
+
+def save_cache(client_dir: Path, artifacts: dict):
+    # Written in place, like the phase gate state, to keep the dir mtime stable
+    try:
+        with open(client_dir / CACHE_FILE, "w") as f:
+            json.dump({"version": cache_version(), "artifacts": artifacts}, f)
+    except OSError:
+        pass
+
+
+def validate_phases(client_dir: Path) -> tuple[bool, list[dict]]:
+    """Validate all phases are complete."""
+    issues = []
+    cached = load_cache(client_dir)
+    results = {}
+
+    for phase, filename, missing_message, invalid_prefix, check in PHASE_ARTIFACTS:
+        path = client_dir / filename
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is None or st.st_size == 0:
+            issues.append(issue(phase, "block", missing_message))
+            continue
+
+        key = [st.st_mtime_ns, st.st_size]
+        entry = cached.get(filename)
+        if entry and entry.get("key") == key:
+            artifact_issues = entry["issues"]
         else:
-            # Scenarios are optional - presentation has interactive calculator
-            ok, err = check_roi_scenarios(phase6_file)
-            if not ok:
-                issues.append(
-                    {
-                        "phase": 6,
-                        "severity": "warn",
-                        "message": f"Phase 6 quality: ROI scenarios are optional - {err}",
-                    }
-                )
+            artifact_issues = check_artifact(path, phase, invalid_prefix, check)
+        results[filename] = {"key": key, "issues": artifact_issues}
+        issues.extend(artifact_issues)
 
-    # Phase 7: presentation.html
-    phase7_file = client_dir / "presentation.html"
-    if not check_file_exists(phase7_file):
-        issues.append(
-            {
-                "phase": 7,
-                "severity": "block",
-                "message": "Phase 7 incomplete: presentation.html missing. Run: python scripts/generate_presentation.py",
-            }
-        )
+    if results != cached:
+        save_cache(client_dir, results)
 
     # Check for blocking issues
     blocking_issues = [i for i in issues if i["severity"] == "block"]
@@ -6,15 +6,23 @@ This hook BLOCKS writes to later phase files if earlier phases are incomplete.
 For example, you cannot write campaign_structure.json (Phase 4) if
 keyword_analysis.json (Phase 3) doesn't exist.
 
+It runs before every Write/Edit, so it is kept cheap:
+- Writes that are not phase artifacts exit before the hook input is parsed
+  (and before json is imported).
+- The gate itself is one stat per earlier phase artifact.
+
+Approved artifact writes also record the active client in
+clients/.mb-index.json, which the Stop hook reads instead of scanning
+clients/. The index is only rewritten when the active client changes or
+clients/ changed since it was written.
+
 Exit codes:
 - 0: Approve (phase gate passed or not a phase artifact)
 - 2: Block (phase gate failed) - outputs JSON to stderr
 """
 
-import json
 import os
 import sys
-from pathlib import Path
 
 
 # Phase artifact files in order
@@ -34,52 +42,100 @@ for phase, files in PHASE_ARTIFACTS.items():
     for f in files:
         FILE_TO_PHASE[f] = phase
 
+# Active client index, kept in the clients/ dir itself
+INDEX_FILE = ".mb-index.json"
+INDEX_VERSION = 1
+
 
-def find_client_dir_from_path(file_path: str) -> Path | None:
+def find_client_dir_from_path(file_path: str) -> str | None:
     """Extract client directory from file path."""
-    path = Path(file_path)
+    parts = os.path.normpath(file_path).split(os.sep)
 
     # Check if path contains 'clients' directory
-    parts = path.parts
     if "clients" in parts:
         clients_idx = parts.index("clients")
         if clients_idx + 1 < len(parts):
-            return Path(*parts[: clients_idx + 2])
+            return os.sep.join(parts[: clients_idx + 2]) or os.sep
 
     return None
 
 
 def get_phase_for_file(file_path: str) -> int | None:
     """Get the phase number for a given file path."""
-    filename = Path(file_path).name
+    filename = os.path.basename(file_path)
     return FILE_TO_PHASE.get(filename)
 
 
 def check_earlier_phases_complete(
-    client_dir: Path, target_phase: int
+    client_dir: str, target_phase: int
 ) -> tuple[bool, list[str]]:
     """Check if all phases before target_phase are complete."""
     missing = []
 
     for phase in range(1, target_phase):
-        phase_files = PHASE_ARTIFACTS.get(phase, [])
-        for filename in phase_files:
-            file_path = client_dir / filename
-            if not file_path.exists() or file_path.stat().st_size == 0:
+        for filename in PHASE_ARTIFACTS.get(phase, []):
+            try:
+                size = os.stat(os.path.join(client_dir, filename)).st_size
+            except OSError:
+                size = 0
+            if size == 0:
                 missing.append(f"Phase {phase}: {filename}")
 
     return len(missing) == 0, missing
 
 
+def update_index(client_dir: str):
+    """Record client_dir as the active client in clients/.mb-index.json."""
+    import json
+
+    clients_dir, name = os.path.split(client_dir)
+    path = os.path.join(clients_dir, INDEX_FILE)
+    try:
+        index_mtime = os.stat(path).st_mtime_ns
+        if index_mtime >= os.stat(clients_dir).st_mtime_ns:
+            with open(path) as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("active") == name:
+                return  # Already current
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    # Written to a temp file and renamed over, so a concurrent hook never sees
+    # a torn index. The rename bumps the clients/ dir mtime, so the index mtime
+    # is touched afterwards to stay at least as new as the dir.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"version": INDEX_VERSION, "active": name}))
+        os.replace(tmp_path, path)
+        os.utime(path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def main():
     """Main entry point for PreToolUse hook."""
     # Read stdin (hook input)
     try:
-        input_data = json.load(sys.stdin)
+        raw = sys.stdin.read()
     except:
         # Can't read input, approve by default
         sys.exit(0)
 
+    # Fast path: no artifact name anywhere in the input, so nothing to gate
+    if not any(name in raw for name in FILE_TO_PHASE):
+        sys.exit(0)
+
+    import json
+
+    try:
+        input_data = json.loads(raw)
+    except:
+        sys.exit(0)
+
     tool_name = input_data.get("tool_name", "")
     tool_input = input_data.get("tool_input", {})
 
@@ -97,21 +153,23 @@ def main():
         # Not a phase artifact, allow
         sys.exit(0)
 
-    # Phase 1 always allowed
-    if target_phase == 1:
-        sys.exit(0)
-
     # Find client directory
     client_dir = find_client_dir_from_path(file_path)
     if not client_dir:
         # Can't determine client dir, allow
         sys.exit(0)
 
+    # Phase 1 always allowed
+    if target_phase == 1:
+        update_index(client_dir)
+        sys.exit(0)
+
     # Check if earlier phases are complete
     ok, missing = check_earlier_phases_complete(client_dir, target_phase)
 
     if ok:
         # All earlier phases complete, allow
+        update_index(client_dir)
         sys.exit(0)
     else:
         # Earlier phases missing, block
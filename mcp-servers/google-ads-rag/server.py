@@ -1,5 +1,5 @@
 import os
-import chromadb
+import sys
 from typing import Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -17,38 +17,15 @@ mcp = FastMCP(
     """,
 )
 
-# Initialize ChromaDB
-# Path relative to this file: ../../backend/knowledge_base/chroma_db
-CHROMA_PATH = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../knowledge_base/chroma_db")
-)
+# Retrieval (backend selection, reranking, packing) is shared with
+# scripts/consult_rag.py via backend/rag/retrieval.py.
+# RAG_BACKEND=local serves from the memory-mapped index exported by
+# `python scripts/rag_pipeline.py --export-local`; anything else uses ChromaDB.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.rag import retrieval
 
-# Ensure the path exists to avoid errors, though it should exist if DB is built
-if not os.path.exists(CHROMA_PATH):
-    print(f"WARNING: ChromaDB path not found at {CHROMA_PATH}")
-
-client = chromadb.PersistentClient(path=CHROMA_PATH)
-# Use default embedding function (all-MiniLM-L6-v2)
-collection = client.get_collection(name="agency_knowledge")
-
-
-def _rerank(results, boost_agency: bool = True):
-    """Apply lightweight reranking using relevance_score/priority from metadata."""
-    docs = results.get("documents", [[]])[0]
-    metas = results.get("metadatas", [[]])[0]
-    dists = results.get("distances", [[]])[0]
-    scored = []
-    for doc, meta, dist in zip(docs, metas, dists):
-        score = dist
-        priority = meta.get("priority", 1)
-        relevance = meta.get("relevance_score", 0)
-        if boost_agency and meta.get("source_kind") == "agency":
-            score -= 0.2
-        score -= 0.1 * (priority - 1)
-        score -= 0.05 * relevance
-        scored.append((score, doc, meta))
-    scored.sort(key=lambda x: x[0])
-    return scored
+collection = retrieval.get_collection()
 
 
 @mcp.tool()
@@ -59,6 +36,7 @@ def query_knowledge(
     topic: Optional[str] = None,
     content_type: Optional[str] = None,
     boost_agency: bool = True,
+    max_tokens: Optional[int] = None,
 ) -> str:
     """
     Semantic search over the Google Ads knowledge base with metadata-aware ranking.
@@ -70,63 +48,32 @@ def query_knowledge(
         topic: Optional topic filter (e.g., "keyword_match_types")
         content_type: Optional filter - "case_study", "methodology", "example", "warning", "best_practice"
         boost_agency: Prioritize agency-authored content when True.
+        max_tokens: Optional output budget. When set, results are diversified (MMR),
+            de-duplicated and trimmed so the response stays within roughly this many tokens.
     """
-    where_filter = {}
-    if filter_type:
-        where_filter["content_type"] = filter_type
-    if content_type:
-        where_filter["content_type"] = content_type
-    if topic:
-        where_filter["topic"] = topic
-    if not where_filter:
-        where_filter = None
-
-    try:
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=where_filter,
-            include=["documents", "metadatas", "distances"],
-        )
-
-        reranked = _rerank(results, boost_agency=boost_agency)
-        output = []
-        for score, doc, metadata in reranked[:n_results]:
-            source = metadata.get("source", "Unknown")
-            doc_type = metadata.get("content_type", metadata.get("type", "Unknown"))
-            topic_meta = metadata.get("topic", "")
-            output.append(
-                f"**[{doc_type}] {source}** (topic: {topic_meta}, score: {score:.3f})\n{doc}\n"
-            )
-
-        if not output:
-            return "No relevant knowledge found."
-
-        return "\n---\n".join(output)
-    except Exception as e:
-        return f"Error querying knowledge base: {str(e)}"
+    return retrieval.query_knowledge(
+        query,
+        n_results=n_results,
+        topic=topic,
+        content_type=content_type or filter_type,
+        boost_agency=boost_agency,
+        max_tokens=max_tokens,
+    )
 
 
 @mcp.tool()
-def get_methodology(task_type: str) -> str:
+def get_methodology(task_type: str, max_tokens: int = 3000) -> str:
     """
     Get methodology for a specific task type.
 
     Args:
         task_type: One of "keyword_research", "ad_copy", "campaign_structure", "audit"
+        max_tokens: Output token budget (default 3000)
 
     Returns:
         Relevant methodology and best practices
     """
-    task_queries = {
-        "keyword_research": "keyword research methodology iterative approach match types seed keywords",
-        "ad_copy": "RSA responsive search ads headlines descriptions sentence case best practices",
-        "campaign_structure": "campaign naming convention ad group structure URL strategy",
-        "audit": "account audit optimization recommendations quality score",
-    }
-
-    query = task_queries.get(task_type, task_type)
-    return query_knowledge(query, n_results=15, content_type="methodology")
+    return retrieval.get_methodology(task_type, n_results=15, max_tokens=max_tokens)
 
 
 @mcp.tool()
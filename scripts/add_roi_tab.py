@@ -13,9 +13,18 @@ v3 improvements:
 - Clear funnel distinction: conv rate (visitors→leads) vs close rate (leads→customers)
 - Calculation explanations in notes column
 - Removed hardcoded client-specific notes
+
+The whole tab (replacing an existing one, values, formulas, formats and
+conditional rules) is written in a single spreadsheets.batchUpdate, after one
+metadata read to find an existing tab. Several spreadsheets can be updated
+concurrently with add_roi_tabs() or --batch.
 """
 
+import argparse
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 
@@ -26,67 +35,20 @@ from dotenv import load_dotenv
 load_dotenv(Path.home() / ".mondaybrew" / ".env")
 
 from backend.services.google_sheets import GoogleSheetsService
+from backend.services.request_executor import get_executor
 
+ROI_SHEET_TITLE = "ROI Beregner"
 
-def delete_sheet_if_exists(sheets_service, spreadsheet_id: str, sheet_name: str):
-    """Delete a sheet by name if it exists."""
-    try:
-        sheet_metadata = sheets_service.get(spreadsheetId=spreadsheet_id).execute()
-        for sheet in sheet_metadata.get("sheets", []):
-            if sheet["properties"]["title"] == sheet_name:
-                sheet_id = sheet["properties"]["sheetId"]
-                sheets_service.batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body={"requests": [{"deleteSheet": {"sheetId": sheet_id}}]},
-                ).execute()
-                print(f"    Deleted existing '{sheet_name}' tab")
-                return True
-    except Exception:
-        pass
-    return False
-
-
-def add_roi_tab_v2(
-    spreadsheet_id: str,
-    client_name: str = "Client",
-    budget: int = 3000,
-    profit_per_customer: int = 800,
-    cpc: int = 8,
-):
-    """
-    Add ROI Beregner v2 tab to an existing spreadsheet.
-
-    Args:
-        spreadsheet_id: The Google Sheet ID
-        client_name: Client name for the title
-        budget: Monthly ad budget in DKK (pre-filled)
-        profit_per_customer: What they earn per customer in DKK
-        cpc: Estimated CPC from keyword analysis
-    """
-    gs = GoogleSheetsService()
-    sheets_service = gs.service.spreadsheets()
+# sheetId for a newly created tab; an existing ROI tab keeps its own id (and gid links)
+ROI_SHEET_ID = 7001
 
-    print(f"[1/4] Setting up 'ROI Beregner' tab...")
-
-    # Delete existing tab if it has errors
-    delete_sheet_if_exists(sheets_service, spreadsheet_id, "ROI Beregner")
-
-    # Create new sheet
-    add_sheet_request = {
-        "requests": [{"addSheet": {"properties": {"title": "ROI Beregner"}}}]
-    }
-    response = sheets_service.batchUpdate(
-        spreadsheetId=spreadsheet_id, body=add_sheet_request
-    ).execute()
-    new_sheet_id = response["replies"][0]["addSheet"]["properties"]["sheetId"]
-    print(f"    Created new sheet with ID: {new_sheet_id}")
-
-    print("[2/4] Writing ROI calculator structure...")
 
+def roi_rows(client_name: str, budget: int, profit_per_customer: int, cpc: int) -> list:
+    """Cell values for the tab, A1-anchored, as they would be typed (USER_ENTERED)."""
     # Build the data with FIXED formulas (no circular references!)
     # Layout matches plan: B5=budget, B6=profit, B7=close_rate, B10=cpc, B11=conv_rate
     # Results: B14=clicks, B15=leads, B16=customers, B17=revenue, B18=profit, B19=ROAS
-    roi_data = [
+    return [
         # Row 1-2: Title
         [f"ROI Beregner - {client_name}", "", "", ""],
         ["Beregn forventet afkast af dine Google Ads", "", "", ""],
@@ -189,17 +151,15 @@ def add_roi_tab_v2(
         ],
     ]
 
-    gs.write_sheet(spreadsheet_id, "ROI Beregner!A1", roi_data)
-    print(f"    Wrote {len(roi_data)} rows with fixed formulas")
 
-    print("[3/4] Applying formatting...")
-
-    format_requests = [
+def roi_format_requests(sheet_id: int) -> list:
+    """Formatting, column width and conditional format requests for the tab."""
+    requests = [
         # Title formatting (Row 1) - Bold, larger font
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 0,
                     "endRowIndex": 1,
                     "startColumnIndex": 0,
@@ -217,7 +177,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 1,
                     "endRowIndex": 2,
                     "startColumnIndex": 0,
@@ -238,7 +198,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 3,
                     "endRowIndex": 4,
                     "startColumnIndex": 0,
@@ -260,7 +220,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 8,
                     "endRowIndex": 9,
                     "startColumnIndex": 0,
@@ -282,7 +242,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 12,
                     "endRowIndex": 13,
                     "startColumnIndex": 0,
@@ -304,7 +264,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 4,
                     "endRowIndex": 7,
                     "startColumnIndex": 1,
@@ -323,7 +283,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 9,
                     "endRowIndex": 11,
                     "startColumnIndex": 1,
@@ -342,7 +302,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 13,
                     "endRowIndex": 19,
                     "startColumnIndex": 1,
@@ -361,7 +321,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 4,
                     "endRowIndex": 7,
                     "startColumnIndex": 2,
@@ -381,7 +341,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 9,
                     "endRowIndex": 11,
                     "startColumnIndex": 2,
@@ -402,7 +362,7 @@ def add_roi_tab_v2(
         {
             "repeatCell": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "startRowIndex": 13,
                     "endRowIndex": 19,
                     "startColumnIndex": 3,
@@ -421,7 +381,7 @@ def add_roi_tab_v2(
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 0,
                     "endIndex": 1,
@@ -433,7 +393,7 @@ def add_roi_tab_v2(
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 1,
                     "endIndex": 2,
@@ -445,7 +405,7 @@ def add_roi_tab_v2(
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 2,
                     "endIndex": 3,
@@ -457,7 +417,7 @@ def add_roi_tab_v2(
         {
             "updateDimensionProperties": {
                 "range": {
-                    "sheetId": new_sheet_id,
+                    "sheetId": sheet_id,
                     "dimension": "COLUMNS",
                     "startIndex": 3,
                     "endIndex": 4,
@@ -469,13 +429,13 @@ def add_roi_tab_v2(
     ]
 
     # Conditional formatting for profit cell (B18) - Green if positive, Red if negative
-    format_requests.append(
+    requests.append(
         {
             "addConditionalFormatRule": {
                 "rule": {
                     "ranges": [
                         {
-                            "sheetId": new_sheet_id,
+                            "sheetId": sheet_id,
                             "startRowIndex": 17,
                             "endRowIndex": 18,
                             "startColumnIndex": 1,
@@ -497,13 +457,13 @@ def add_roi_tab_v2(
         }
     )
 
-    format_requests.append(
+    requests.append(
         {
             "addConditionalFormatRule": {
                 "rule": {
                     "ranges": [
                         {
-                            "sheetId": new_sheet_id,
+                            "sheetId": sheet_id,
                             "startRowIndex": 17,
                             "endRowIndex": 18,
                             "startColumnIndex": 1,
@@ -525,11 +485,115 @@ def add_roi_tab_v2(
         }
     )
 
-    sheets_service.batchUpdate(
-        spreadsheetId=spreadsheet_id, body={"requests": format_requests}
-    ).execute()
+    return requests
+
+
+def cell_data(value) -> dict:
+    """CellData for a value, typed the way USER_ENTERED input would be."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    if isinstance(value, str) and value.startswith("="):
+        return {"userEnteredValue": {"formulaValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def build_roi_tab_requests(
+    sheet_id: int,
+    rows: list,
+    replace_sheet_id: int | None = None,
+    title: str = ROI_SHEET_TITLE,
+) -> list:
+    """
+    Every request needed to (re)create the ROI tab, for one batchUpdate.
+
+    Requests apply in order, so the tab is deleted (if replace_sheet_id is
+    given), added with a known sheetId that the later requests reference,
+    filled and formatted. The batch is atomic: on failure nothing changes.
+    """
+    requests = []
+    if replace_sheet_id is not None:
+        requests.append({"deleteSheet": {"sheetId": replace_sheet_id}})
+    requests.append({"addSheet": {"properties": {"sheetId": sheet_id, "title": title}}})
+    requests.append(
+        {
+            "updateCells": {
+                "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                "rows": [{"values": [cell_data(v) for v in row]} for row in rows],
+                "fields": "userEnteredValue",
+            }
+        }
+    )
+    requests.extend(roi_format_requests(sheet_id))
+    return requests
+
+
+def find_roi_sheet(sheets_service, spreadsheet_id: str, title: str = ROI_SHEET_TITLE) -> tuple:
+    """Return (sheetId of an existing tab named title or None, sheetId to create the tab with)."""
+    metadata = get_executor("sheets").execute(
+        sheets_service.get(spreadsheetId=spreadsheet_id, fields="sheets.properties(sheetId,title)")
+    )
+    existing = None
+    used = set()
+    for sheet in metadata.get("sheets", []):
+        properties = sheet["properties"]
+        used.add(properties["sheetId"])
+        if properties["title"] == title:
+            existing = properties["sheetId"]
+    if existing is not None:
+        return existing, existing
+    new_id = ROI_SHEET_ID
+    while new_id in used:
+        new_id += 1
+    return None, new_id
+
+
+def add_roi_tab_v2(
+    spreadsheet_id: str,
+    client_name: str = "Client",
+    budget: int = 3000,
+    profit_per_customer: int = 800,
+    cpc: int = 8,
+    sheets_service=None,
+    verbose: bool = True,
+):
+    """
+    Add ROI Beregner v2 tab to an existing spreadsheet.
+
+    Args:
+        spreadsheet_id: The Google Sheet ID
+        client_name: Client name for the title
+        budget: Monthly ad budget in DKK (pre-filled)
+        profit_per_customer: What they earn per customer in DKK
+        cpc: Estimated CPC from keyword analysis
+        sheets_service: spreadsheets() resource to reuse (default: a new GoogleSheetsService)
+        verbose: Print progress and the expected calculations
+    """
+    if sheets_service is None:
+        sheets_service = GoogleSheetsService().service.spreadsheets()
+
+    if verbose:
+        print(f"[1/2] Looking up '{ROI_SHEET_TITLE}' tab...")
+    existing_id, sheet_id = find_roi_sheet(sheets_service, spreadsheet_id)
+
+    rows = roi_rows(client_name, budget, profit_per_customer, cpc)
+    requests = build_roi_tab_requests(sheet_id, rows, replace_sheet_id=existing_id)
+
+    if verbose:
+        action = "Replacing existing" if existing_id is not None else "Creating"
+        print(f"[2/2] {action} tab ({len(rows)} rows, {len(requests)} requests in one batchUpdate)...")
+    # addSheet/deleteSheet must not be re-sent after a 5xx that may have applied them
+    get_executor("sheets").execute(
+        sheets_service.batchUpdate(spreadsheetId=spreadsheet_id, body={"requests": requests}),
+        idempotent=False,
+    )
+
+    if not verbose:
+        return spreadsheet_id
 
-    print("[4/4] Done!")
     print(f"\n{'='*60}")
     print("ROI Beregner v3 added successfully!")
     print(f"URL: https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
@@ -558,22 +622,71 @@ def add_roi_tab_v2(
     return spreadsheet_id
 
 
-if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/add_roi_tab.py <SPREADSHEET_ID> [CLIENT_NAME]")
-        sys.exit(1)
-        
-    SPREADSHEET_ID = sys.argv[1]
-    CLIENT_NAME = sys.argv[2] if len(sys.argv) > 2 else "Client"
-    
-    print(f"Adding ROI tab to Spreadsheet: {SPREADSHEET_ID} for Client: {CLIENT_NAME}")
+def add_roi_tabs(clients: list, max_workers: int = 4) -> dict:
+    """
+    Add the ROI tab to several spreadsheets concurrently.
+
+    clients is a list of add_roi_tab_v2 keyword arguments (spreadsheet_id is
+    required). Each worker thread builds its own Sheets client, since the
+    underlying HTTP connection is not thread-safe; all threads share the
+    Sheets rate limit, so more workers never exceed the quota. Returns
+    {spreadsheet_id: None on success, or the exception (RequestError for API failures)}.
+    """
+    local = threading.local()
+
+    def run(kwargs: dict):
+        if not hasattr(local, "sheets"):
+            local.sheets = GoogleSheetsService().service.spreadsheets()
+        try:
+            add_roi_tab_v2(**kwargs, sheets_service=local.sheets, verbose=False)
+            return kwargs["spreadsheet_id"], None
+        except Exception as e:
+            return kwargs["spreadsheet_id"], e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(clients)))) as pool:
+        return dict(pool.map(run, clients))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add the ROI Beregner tab to Google Sheets deliverables.")
+    parser.add_argument("spreadsheet_id", nargs="?", help="The Google Sheet ID")
+    parser.add_argument("client_name_arg", nargs="?", metavar="CLIENT_NAME", help="Client name for the title")
+    parser.add_argument("--client-name", default=None, help="Client name for the title")
+    parser.add_argument("--budget", type=int, default=3000, help="Monthly ad budget in DKK")
+    parser.add_argument("--profit-per-customer", type=int, default=5000, help="What they earn per customer in DKK")
+    parser.add_argument("--cpc", type=int, default=15, help="Estimated CPC from keyword analysis")
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        default=None,
+        help="JSON file with a list of {spreadsheet_id, client_name, budget, profit_per_customer, cpc}",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent spreadsheets with --batch")
+    args = parser.parse_args()
+
+    if args.batch:
+        with open(args.batch, "r", encoding="utf-8") as f:
+            clients = json.load(f)
+        print(f"Adding ROI tab to {len(clients)} spreadsheets ({args.workers} at a time)...")
+        results = add_roi_tabs(clients, max_workers=args.workers)
+        for spreadsheet_id, error in results.items():
+            print(f"  {'✗' if error else '✓'} {spreadsheet_id}" + (f": {error}" if error else ""))
+        sys.exit(1 if any(results.values()) else 0)
+
+    if not args.spreadsheet_id:
+        parser.error("SPREADSHEET_ID is required unless --batch is given")
+    client_name = args.client_name or args.client_name_arg or "Client"
+
+    print(f"Adding ROI tab to Spreadsheet: {args.spreadsheet_id} for Client: {client_name}")
 
     add_roi_tab_v2(
-        spreadsheet_id=SPREADSHEET_ID,
-        client_name=CLIENT_NAME,
-        budget=3000,
-        profit_per_customer=5000,  # Estimated for law services
-        cpc=15,  # Estimated for law keywords
+        spreadsheet_id=args.spreadsheet_id,
+        client_name=client_name,
+        budget=args.budget,
+        profit_per_customer=args.profit_per_customer,  # Default estimated for law services
+        cpc=args.cpc,  # Default estimated for law keywords
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -98,10 +98,8 @@ def run_audit(customer_id, ga4_property_id=None, ga4_domain=None):
     if resolved_ga4_property_id:
         print(f"Fetching GA4 Data for Property: {resolved_ga4_property_id}...")
         try:
-            audit_data["ga4"]["behavior"] = ga4_service.get_behavior_metrics(resolved_ga4_property_id)
-            audit_data["ga4"]["conversions"] = ga4_service.get_conversion_breakdown(resolved_ga4_property_id)
-            audit_data["ga4"]["top_pages"] = ga4_service.get_top_pages(resolved_ga4_property_id)
-            audit_data["ga4"]["traffic_sources"] = ga4_service.get_traffic_sources(resolved_ga4_property_id)
+            # behavior, conversions, top_pages and traffic_sources in one batched request
+            audit_data["ga4"].update(ga4_service.get_audit_reports(resolved_ga4_property_id))
         except Exception as e:
             print(f"Error fetching GA4 data: {e}")
 
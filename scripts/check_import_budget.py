@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check that importing each backend service module stays within its time budget.
+
+Service modules must not load credentials, print, or import heavy client
+libraries (google-ads, googleapiclient, pandas, ...) at import time; those
+happen when a client is constructed. Each module is imported in a fresh
+interpreter with -X importtime and its cumulative import time compared to
+its budget.
+
+Usage:
+    python scripts/check_import_budget.py [--runs N]
+
+Exit code 1 if any module is over budget (or fails to import).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budget per module, in milliseconds (roughly twice the
+# stdlib-only baseline; importing google-ads, googleapiclient or pandas blows it)
+IMPORT_BUDGETS_MS = {
+    "backend.services.credentials": 30,
+    "backend.services.request_executor": 60,
+    "backend.services.google_auth": 45,
+    "backend.services.google_sheets": 80,
+    "backend.services.search_console": 60,
+    "backend.services.gtm_service": 60,
+    "backend.services.ga4_service": 60,
+    "backend.services.keyword_planner": 30,
+    "backend.services.ads_connector": 30,
+    "backend.services.bigquery_manager": 30,
+}
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PLUGIN_ROOT,
+        env={**os.environ, "PYTHONPATH": str(PLUGIN_ROOT)},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise ImportError(f"{module} not in -X importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module; the fastest counts")
+    args = parser.parse_args()
+
+    over = 0
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        try:
+            elapsed = min(import_time_ms(module) for _ in range(args.runs))
+        except ImportError as e:
+            print(f"✗ {module}: import failed: {e}")
+            over += 1
+            continue
+        ok = elapsed <= budget
+        over += not ok
+        print(f"{'✓' if ok else '✗'} {module}: {elapsed:.1f} ms (budget {budget} ms)")
+
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
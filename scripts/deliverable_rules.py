@@ -0,0 +1,299 @@
+"""
+Columnar business-rule engine for Monday Brew deliverables.
+
+Rows are loaded once into a column-oriented Frame and every rule is evaluated
+as a whole-column expression, producing one violation table with
+(row, column, rule, severity, message) records. Both
+scripts/validate_deliverable.py and the hooks consume this table.
+
+Standard library only, so the hooks can import it under a bare python3.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Bump whenever a rule's logic or message changes, so cached results are dropped.
+RULES_VERSION = 1
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass(frozen=True)
+class Violation:
+    row: Optional[int]  # None for aggregate rules
+    column: Optional[str]
+    rule: str
+    severity: str
+    message: str
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class Frame:
+    """Column-oriented view of a list of row dicts."""
+
+    MISSING = object()
+
+    def __init__(self, rows: Sequence[object], columns: Optional[Sequence[str]] = None):
+        self.length = len(rows)
+        dict_rows = [row if isinstance(row, dict) else {} for row in rows]
+        self.is_row = [isinstance(row, dict) for row in rows]
+        if columns is None:
+            names: Dict[str, None] = {}
+            for row in dict_rows:
+                names.update(dict.fromkeys(row))
+        else:
+            names = dict.fromkeys(columns)
+        self.columns: Dict[str, List[object]] = {
+            name: [row.get(name, Frame.MISSING) for row in dict_rows] for name in names
+        }
+
+    def col(self, name: str) -> List[object]:
+        return self.columns.get(name) or [Frame.MISSING] * self.length
+
+    def present(self, name: str) -> List[bool]:
+        return [v is not Frame.MISSING for v in self.col(name)]
+
+    def blank(self, name: str) -> List[bool]:
+        return [v is Frame.MISSING or v is None or str(v).strip() == "" for v in self.col(name)]
+
+    def equals(self, name: str, value: object) -> List[bool]:
+        return [v is value if isinstance(value, bool) else v == value for v in self.col(name)]
+
+    def text(self, name: str, row: int, default: str = "unknown") -> str:
+        value = self.col(name)[row]
+        return default if value is Frame.MISSING else value
+
+
+def _and(*masks: List[bool]) -> List[bool]:
+    return [all(values) for values in zip(*masks)]
+
+
+# ---- Row rules --------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RowRule:
+    """
+    A rule evaluated column-wise: mask(frame, column) flags the violating rows.
+
+    message(frame, row, column) returns the detail without the "Row N:"
+    prefix, so a result depends only on the row's own values.
+    """
+
+    name: str
+    schema_types: Tuple[str, ...]  # empty = every tab
+    columns: Tuple[str, ...]
+    severity: str
+    mask: Callable[[Frame, str], List[bool]]
+    message: Callable[[Frame, int, str], str]
+
+
+def _campaign_prefix(frame: Frame, column: str) -> List[bool]:
+    return [
+        v is not Frame.MISSING and bool(v) and not str(v).startswith("mb |")
+        for v in frame.col(column)
+    ]
+
+
+def _is_title_case(value: object) -> bool:
+    # Simple heuristic: more than half the words capitalized (and not all caps)
+    if not isinstance(value, str):
+        return False
+    words = value.split()
+    if len(words) <= 1:
+        return False
+    capitalized = sum(1 for w in words if w[0].isupper())
+    return capitalized > len(words) / 2 and not value.isupper()
+
+
+HEADLINE_COLUMNS = tuple(f"Headline {i}" for i in range(1, 16))
+
+ROW_RULES: List[RowRule] = [
+    RowRule(
+        name="campaign_prefix",
+        schema_types=(),
+        columns=("Campaign",),
+        severity=ERROR,
+        mask=_campaign_prefix,
+        message=lambda f, i, c: f"Campaign '{f.text(c, i)}' must start with 'mb |'",
+    ),
+    RowRule(
+        name="headline_sentence_case",
+        schema_types=("ad_copy",),
+        columns=HEADLINE_COLUMNS,
+        severity=ERROR,
+        mask=lambda f, c: [_is_title_case(v) for v in f.col(c)],
+        message=lambda f, i, c: (
+            f"{c} '{f.text(c, i)}' appears to be Title Case. Use sentence case."
+        ),
+    ),
+    RowRule(
+        name="match_type_rationale",
+        schema_types=("keyword_analysis",),
+        columns=("Match Type Rationale",),
+        severity=ERROR,
+        mask=lambda f, c: _and(f.present("Match Type"), f.blank(c)),
+        message=lambda f, i, c: (
+            f"Keyword '{f.text('Keyword', i)}' has Match Type but no Match Type Rationale"
+        ),
+    ),
+    RowRule(
+        name="service_id",
+        schema_types=("keyword_analysis",),
+        columns=("Service_ID",),
+        severity=ERROR,
+        mask=lambda f, c: _and(
+            f.equals("Include", True), [v is Frame.MISSING or v is None for v in f.col(c)]
+        ),
+        message=lambda f, i, c: (
+            f"Included keyword '{f.text('Keyword', i)}' has no Service_ID - validate against $CANONICAL_SERVICES"
+        ),
+    ),
+    RowRule(
+        name="exclusion_reason",
+        schema_types=("keyword_analysis",),
+        columns=("Exclusion_Reason",),
+        severity=ERROR,
+        mask=lambda f, c: _and(f.equals("Include", False), f.blank(c)),
+        message=lambda f, i, c: (
+            f"Excluded keyword '{f.text('Keyword', i)}' has no Exclusion_Reason"
+        ),
+    ),
+]
+
+
+# ---- Aggregate rules --------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class AggregateRule:
+    """A rule over whole columns that yields at most one violation."""
+
+    name: str
+    schema_types: Tuple[str, ...]
+    inputs: Tuple[str, ...]  # columns the rule reads
+    severity: str
+    check: Callable[[Frame], Optional[str]]
+
+
+def _positioning_share(frame: Frame) -> Optional[str]:
+    included = frame.equals("Include", True)
+    total_included = sum(included)
+    positioning_count = sum(_and(included, frame.equals("Positioning", True)))
+    if total_included > 0 and positioning_count > 0:
+        positioning_pct = (positioning_count / total_included) * 100
+        if positioning_pct < 10:
+            return (
+                f"⚠️  Warning: Only {positioning_pct:.1f}% of keywords are positioning keywords. "
+                "Consider if $POSITIONING_MODE requires 10-20%."
+            )
+    return None
+
+
+def _pending_review(frame: Frame) -> Optional[str]:
+    unvalidated = sum(frame.equals("Service_Validation", "PENDING_REVIEW"))
+    if unvalidated:
+        return (
+            f"⚠️  Warning: {unvalidated} keywords still marked PENDING_REVIEW - "
+            "complete Phase 3.5 validation"
+        )
+    return None
+
+
+AGGREGATE_RULES: List[AggregateRule] = [
+    AggregateRule(
+        name="positioning_share",
+        schema_types=("keyword_analysis",),
+        inputs=("Include", "Positioning"),
+        severity=WARNING,
+        check=_positioning_share,
+    ),
+    AggregateRule(
+        name="pending_review",
+        schema_types=("keyword_analysis",),
+        inputs=("Service_Validation",),
+        severity=WARNING,
+        check=_pending_review,
+    ),
+]
+
+
+# ---- Evaluation -------------------------------------------------------------
+
+
+def _applies(rule_types: Tuple[str, ...], schema_type: str) -> bool:
+    return not rule_types or schema_type in rule_types
+
+
+def row_rules_for(schema_type: str) -> List[RowRule]:
+    return [r for r in ROW_RULES if _applies(r.schema_types, schema_type)]
+
+
+def aggregate_rules_for(schema_type: str) -> List[AggregateRule]:
+    return [r for r in AGGREGATE_RULES if _applies(r.schema_types, schema_type)]
+
+
+RuleHit = Tuple[int, str, str, str, str]  # (frame row, column, rule, severity, detail)
+
+
+def row_message(row: int, detail: str) -> str:
+    return f"Row {row}: {detail}"
+
+
+def row_rule_hits(frame: Frame, schema_type: str) -> List[RuleHit]:
+    """Row-rule violations with index-free details, grouped by rule then column."""
+    hits = []
+    for rule in row_rules_for(schema_type):
+        for column in rule.columns:
+            for i, (hit, is_row) in enumerate(zip(rule.mask(frame, column), frame.is_row)):
+                if hit and is_row:
+                    hits.append((i, column, rule.name, rule.severity, rule.message(frame, i, column)))
+    return hits
+
+
+def evaluate_row_rules(frame: Frame, schema_type: str) -> List[Violation]:
+    return [
+        Violation(i, column, rule, severity, row_message(i, detail))
+        for i, column, rule, severity, detail in row_rule_hits(frame, schema_type)
+    ]
+
+
+def evaluate_aggregate_rule(rule: AggregateRule, frame: Frame) -> List[Violation]:
+    message = rule.check(frame)
+    return [Violation(None, None, rule.name, rule.severity, message)] if message else []
+
+
+def evaluate_aggregate_rules(frame: Frame, schema_type: str) -> List[Violation]:
+    violations = []
+    for rule in aggregate_rules_for(schema_type):
+        violations.extend(evaluate_aggregate_rule(rule, frame))
+    return violations
+
+
+RULE_ORDER = {name: i for i, name in enumerate(["schema"] + [r.name for r in ROW_RULES])}
+
+
+def _sort_key(v: Violation) -> Tuple[int, int, int]:
+    if v.row is None:
+        group = 0 if v.rule == "schema" else 2
+    else:
+        group = 1
+    return group, v.row or 0, RULE_ORDER.get(v.rule, len(RULE_ORDER))
+
+
+def sort_violations(violations: List[Violation]) -> List[Violation]:
+    """Top-level schema errors, then rows in order (schema errors first), then aggregates."""
+    return sorted(violations, key=_sort_key)
+
+
+def evaluate(rows: Sequence[object], schema_type: str) -> List[Violation]:
+    """Evaluate every business rule for a deliverable tab."""
+    frame = Frame(rows)
+    violations = evaluate_row_rules(frame, schema_type)
+    violations.extend(evaluate_aggregate_rules(frame, schema_type))
+    return sort_violations(violations)
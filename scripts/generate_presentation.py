@@ -4,10 +4,12 @@ Generate an interactive HTML presentation from keyword analysis artifacts.
 
 Usage:
     python generate_presentation.py <client_directory> [--output <output_path>]
+    python generate_presentation.py --batch <clients_directory> [--jobs N] [--force]
 
 Example:
     python generate_presentation.py clients/mondaybrew
     python generate_presentation.py clients/aeflyt --output deliverables/aeflyt_presentation.html
+    python generate_presentation.py --batch clients
 
 Required files in client_directory:
     - keyword_analysis.json
@@ -19,12 +21,44 @@ Required files in client_directory:
 """
 
 import argparse
+import base64
+import gzip
+import hashlib
 import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Union, List, Dict
+from typing import Callable, Iterator, Optional, Union, List, Dict
+
+# Template placeholders are {{UPPER_SNAKE}}; Vue's {{ expression }} is left alone.
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+DATA_ENCODINGS = ("json", "gzip+base64")
+
+# Keyword rows per embedded chunk; the keyword table hydrates pages as they scroll into view
+KEYWORD_PAGE_SIZE = 250
+
+# Keywords shown per ad group in the campaign structure tab
+AD_GROUP_SAMPLE_SIZE = 8
+
+# Client files that feed the presentation; the first three are required
+PRESENTATION_INPUTS = (
+    "keyword_analysis.json",
+    "campaign_structure.json",
+    "ad_copy.json",
+    "roi_calculator.json",
+    "website_content.md",
+    "potential_analysis.md",
+    "brand.json",
+    "negative_keywords.json",
+)
+REQUIRED_INPUTS = PRESENTATION_INPUTS[:3]
+
+# Written next to presentation.html by --batch, so unchanged clients are skipped
+BUILD_MANIFEST_FILE = ".presentation-build.json"
+BUILD_MANIFEST_VERSION = 1
 
 
 def find_template() -> Path:
@@ -49,6 +83,73 @@ def find_template() -> Path:
     raise FileNotFoundError("Could not find presentation_template.html")
 
 
+class PresentationTemplate:
+    """
+    Template parsed once into literal text and placeholder names.
+
+    Rendering is a single pass: each placeholder is looked up in a map of
+    values (callables are evaluated once, and only if the template uses that
+    placeholder). Unknown placeholders are left in place, and substituted
+    values are never re-scanned for placeholders.
+    """
+
+    def __init__(self, text: str):
+        # Even indexes are literal text, odd indexes placeholder names
+        self.parts = PLACEHOLDER_PATTERN.split(text)
+        # Template plus generator source: a change to either changes the output
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16)
+        digest.update(Path(__file__).read_bytes())
+        self.digest = digest.hexdigest()
+
+    @classmethod
+    def load(cls, path: Path) -> "PresentationTemplate":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def iter_render(self, values: Dict[str, Union[object, Callable[[], object]]]) -> Iterator[str]:
+        resolved = {}
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                yield part
+            elif part not in values:
+                yield "{{" + part + "}}"
+            else:
+                if part not in resolved:
+                    value = values[part]
+                    resolved[part] = str(value() if callable(value) else value)
+                yield resolved[part]
+
+    def render(self, values: Dict[str, Union[object, Callable[[], object]]]) -> str:
+        return "".join(self.iter_render(values))
+
+
+def embed_json(value) -> str:
+    """Compact JSON that is safe to inline in a <script> block."""
+    # "<" only occurs inside strings, where \u003c is equivalent in both JSON and JS
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def compress_json(value) -> str:
+    """gzip+base64 JSON text, decoded in the template by decodeChunk (via loadChunk)."""
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0 keeps the output byte-identical for identical inputs
+    return base64.b64encode(gzip.compress(raw, mtime=0)).decode("ascii")
+
+
+def embed_chunks(chunks: Dict[str, object], compress: bool = False) -> str:
+    """
+    One <script type="application/json" data-chunk="..."> block per chunk.
+
+    The browser does not parse these until the template asks for a chunk, so
+    tabs that are never opened cost nothing beyond the download.
+    """
+    blocks = []
+    for name, value in chunks.items():
+        body = compress_json(value) if compress else embed_json(value)
+        blocks.append(f'<script type="application/json" data-chunk="{name}">{body}</script>')
+    return "\n    ".join(blocks)
+
+
 def load_json_file(filepath: Path) -> Union[Dict, List]:
     """Load a JSON file."""
     with open(filepath, "r", encoding="utf-8") as f:
@@ -193,6 +294,77 @@ def calculate_match_type_distribution(keywords: list) -> dict:
     return {"counts": distribution, "percentages": percentages, "total": total}
 
 
+def summarize_keywords(keywords: list) -> dict:
+    """Aggregates the keyword tab header and filters need before any page is loaded."""
+    max_volume = 1
+    categories = set()
+    for kw in keywords:
+        volume = kw.get("Avg. Monthly Searches") or kw.get("avg_monthly_searches") or 0
+        if isinstance(volume, (int, float)) and volume > max_volume:
+            max_volume = volume
+        category = kw.get("Category") or kw.get("category")
+        if category:
+            categories.add(category)
+    return {"count": len(keywords), "maxVolume": max_volume, "categories": sorted(categories)}
+
+
+def rollup_ad_groups(campaign_structure: list, sample_size: int = AD_GROUP_SAMPLE_SIZE) -> dict:
+    """
+    Per-campaign, per-ad-group keyword rollup: {campaign: {ad_group: {count, sample}}}.
+
+    count is the number of distinct keywords in the ad group, sample the first
+    sample_size of them in file order.
+    """
+    groups: Dict[str, Dict[str, dict]] = {}
+    seen: Dict[tuple, set] = {}
+    for item in campaign_structure:
+        campaign = item.get("Campaign") or item.get("campaign")
+        ad_group = item.get("Ad Group") or item.get("ad_group")
+        keyword = item.get("Keyword") or item.get("keyword")
+        group = groups.setdefault(campaign, {}).setdefault(ad_group, {"count": 0, "sample": []})
+        keywords = seen.setdefault((campaign, ad_group), set())
+        if keyword in keywords:
+            continue
+        keywords.add(keyword)
+        group["count"] += 1
+        if len(group["sample"]) < sample_size:
+            group["sample"].append(keyword)
+    return groups
+
+
+def build_presentation_chunks(
+    keywords: list,
+    keyword_stats: dict,
+    match_type_dist: dict,
+    campaign_structure: list,
+    ads: list,
+    negative_keywords: dict,
+    page_size: int = KEYWORD_PAGE_SIZE,
+) -> tuple:
+    """
+    Split the presentation data into an index and per-tab chunks.
+
+    The index is small and inlined so the first paint needs nothing else; it
+    holds the precomputed aggregates and how many keyword pages there are.
+    Chunks are named "<tab>" or "keywords/<page>".
+    """
+    pages = [keywords[i : i + page_size] for i in range(0, len(keywords), page_size)]
+    chunks = {f"keywords/{i}": page for i, page in enumerate(pages)}
+    chunks["negatives"] = negative_keywords
+    chunks["campaigns"] = rollup_ad_groups(campaign_structure)
+    chunks["ads"] = ads
+
+    index = {
+        "keywords": summarize_keywords(keywords),
+        "keywordPages": len(pages),
+        "keywordPageSize": page_size,
+        "keywordStats": keyword_stats,
+        "matchTypeDist": match_type_dist,
+        "adCount": len(ads),
+    }
+    return index, chunks
+
+
 def load_negative_keywords(client_dir: Path) -> dict:
     """Load negative keywords from negative_keywords.json if it exists."""
     negative_path = client_dir / "negative_keywords.json"
@@ -244,8 +416,17 @@ def generate_presentation(
     output_path: Optional[Path] = None,
     client_name: Optional[str] = None,
     brand_color: Optional[str] = None,
+    compress: bool = False,
+    template: Optional[PresentationTemplate] = None,
+    verbose: bool = True,
 ) -> Path:
-    """Generate the HTML presentation from artifacts."""
+    """
+    Generate the HTML presentation from artifacts.
+
+    With compress=True the embedded data is gzip+base64 and decoded in the
+    browser, which makes large-client presentations a fraction of the size.
+    Pass an already parsed template to skip finding and reading it.
+    """
 
     # Load required files
     keyword_analysis_path = client_dir / "keyword_analysis.json"
@@ -260,7 +441,8 @@ def generate_presentation(
     brand_data = {}
     if brand_path.exists():
         brand_data = load_json_file(brand_path)
-        print(f"Using brand assets from: {brand_path}")
+        if verbose:
+            print(f"Using brand assets from: {brand_path}")
 
     # Validate required files
     for path in [keyword_analysis_path, campaign_structure_path, ad_copy_path]:
@@ -340,9 +522,8 @@ def generate_presentation(
     executive_summary = extract_executive_summary(potential_analysis_path)
 
     # Load template
-    template_path = find_template()
-    with open(template_path, "r", encoding="utf-8") as f:
-        template = f.read()
+    if template is None:
+        template = PresentationTemplate.load(find_template())
 
     # Determine CTA URL (email takes precedence)
     if cta_email:
@@ -352,49 +533,34 @@ def generate_presentation(
     else:
         cta_url = "#"
 
-    # Prepare replacements
-    replacements = {
-        "{{CLIENT_NAME}}": client_name,
-        "{{CLIENT_LOGO}}": logo_url,
-        "{{AGENCY_LOGO}}": agency_logo,
-        "{{CLIENT_TAGLINE}}": tagline,
-        "{{CLIENT_WEBSITE}}": website,
-        "{{CLIENT_CTA}}": cta_url,
-        "{{SUMMARY_SUBTITLE}}": "Datadrevet plan for at nå flere kunder via Google Ads.",
-        "{{EXECUTIVE_SUMMARY}}": executive_summary,
-        "{{BRAND_COLOR}}": brand_color,
-        "{{BRAND_LIGHT}}": brand_color,
-        "{{BRAND_DARK}}": "#0f2f4a",
-        "{{ACCENT_COLOR}}": accent_color,
-        "{{KEYWORDS_JSON}}": json.dumps(keywords, ensure_ascii=False, indent=4),
-        "{{EXCLUDED_KEYWORDS_JSON}}": json.dumps(
-            excluded_keywords, ensure_ascii=False, indent=4
-        ),
-        "{{KEYWORD_STATS_JSON}}": json.dumps(
-            keyword_stats, ensure_ascii=False, indent=4
-        ),
-        "{{MATCH_TYPE_DIST_JSON}}": json.dumps(
-            match_type_dist, ensure_ascii=False, indent=4
-        ),
-        "{{NEGATIVE_KEYWORDS_JSON}}": json.dumps(
-            negative_keywords, ensure_ascii=False, indent=4
-        ),
-        "{{CAMPAIGN_STRUCTURE_JSON}}": json.dumps(
-            campaign_structure, ensure_ascii=False, indent=4
-        ),
-        "{{ADS_JSON}}": json.dumps(ads, ensure_ascii=False, indent=4),
-        "{{BUDGET}}": str(budget),
-        "{{PROFIT_PER_CUSTOMER}}": str(profit_per_customer),
-        "{{CLOSE_RATE}}": str(close_rate),
-        "{{CPC}}": str(cpc),
-        "{{CONVERSION_RATE}}": str(conversion_rate),
-        "{{CURRENCY}}": currency,
-    }
+    presentation_index, presentation_chunks = build_presentation_chunks(
+        keywords, keyword_stats, match_type_dist, campaign_structure, ads, negative_keywords
+    )
 
-    # Apply replacements
-    html = template
-    for placeholder, value in replacements.items():
-        html = html.replace(placeholder, str(value))
+    # Placeholder values; data payloads are serialized only if the template uses them
+    values = {
+        "CLIENT_NAME": client_name,
+        "CLIENT_LOGO": logo_url,
+        "AGENCY_LOGO": agency_logo,
+        "CLIENT_TAGLINE": tagline,
+        "CLIENT_WEBSITE": website,
+        "CLIENT_CTA": cta_url,
+        "SUMMARY_SUBTITLE": "Datadrevet plan for at nå flere kunder via Google Ads.",
+        "EXECUTIVE_SUMMARY": executive_summary,
+        "BRAND_COLOR": brand_color,
+        "BRAND_LIGHT": brand_color,
+        "BRAND_DARK": "#0f2f4a",
+        "ACCENT_COLOR": accent_color,
+        "PRESENTATION_INDEX": lambda: embed_json(presentation_index),
+        "PRESENTATION_CHUNKS": lambda: embed_chunks(presentation_chunks, compress),
+        "DATA_ENCODING": DATA_ENCODINGS[1] if compress else DATA_ENCODINGS[0],
+        "BUDGET": budget,
+        "PROFIT_PER_CUSTOMER": profit_per_customer,
+        "CLOSE_RATE": close_rate,
+        "CPC": cpc,
+        "CONVERSION_RATE": conversion_rate,
+        "CURRENCY": currency,
+    }
 
     # Determine output path
     if output_path is None:
@@ -402,9 +568,16 @@ def generate_presentation(
 
     # Write output
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+        f.writelines(template.iter_render(values))
+
+    if not verbose:
+        return output_path
 
     print(f"Presentation generated: {output_path}")
+    print(
+        f"  - Size: {output_path.stat().st_size / 1024:,.0f} KB "
+        f"({len(presentation_chunks)} {values['DATA_ENCODING']} chunks)"
+    )
     print(f"  - Client: {client_name}")
     print(f"  - Keywords (included): {len(keywords)}")
     if keyword_stats["excluded"] > 0:
@@ -428,6 +601,127 @@ def generate_presentation(
     return output_path
 
 
+def hash_inputs(client_dir: Path) -> str:
+    """Content hash of every presentation input in client_dir (missing files included)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in PRESENTATION_INPUTS:
+        digest.update(name.encode("utf-8") + b"\0")
+        try:
+            digest.update((client_dir / name).read_bytes())
+        except FileNotFoundError:
+            digest.update(b"\0missing")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_build_manifest(client_dir: Path) -> dict:
+    try:
+        with open(client_dir / BUILD_MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_manifest(client_dir: Path, manifest: dict):
+    path = client_dir / BUILD_MANIFEST_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(manifest, separators=(",", ":")))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Rebuilt next time
+
+
+# Parsed once per batch and handed to each worker process by the pool initializer
+_batch_template: Optional[PresentationTemplate] = None
+
+
+def _init_batch_worker(template: PresentationTemplate):
+    global _batch_template
+    _batch_template = template
+
+
+def _build_client(client_dir: Path, manifest: dict, brand_color: Optional[str], compress: bool) -> Path:
+    output_path = generate_presentation(
+        client_dir,
+        brand_color=brand_color,
+        compress=compress,
+        template=_batch_template,
+        verbose=False,
+    )
+    save_build_manifest(client_dir, manifest)
+    return output_path
+
+
+def generate_batch(
+    clients_dir: Path,
+    jobs: Optional[int] = None,
+    force: bool = False,
+    brand_color: Optional[str] = None,
+    compress: bool = False,
+) -> Dict[str, List]:
+    """
+    Generate presentation.html for every client directory under clients_dir.
+
+    The template is parsed once and shared with a pool of jobs worker
+    processes. A client is skipped when its inputs, the template, the
+    generator and the options all hash the same as at its last batch build
+    (recorded in BUILD_MANIFEST_FILE) and its presentation.html still exists.
+
+    Returns {"built": [...], "skipped": [...], "incomplete": [...], "failed": [(dir, error)]}.
+    """
+    template = PresentationTemplate.load(find_template())
+    options = {"color": brand_color, "compress": compress}
+    result: Dict[str, List] = {"built": [], "skipped": [], "incomplete": [], "failed": []}
+
+    pending = []
+    for client_dir in sorted(p for p in clients_dir.iterdir() if p.is_dir() and not p.name.startswith(".")):
+        if not all((client_dir / name).exists() for name in REQUIRED_INPUTS):
+            result["incomplete"].append(client_dir)
+            continue
+        manifest = {
+            "version": BUILD_MANIFEST_VERSION,
+            "template": template.digest,
+            "inputs": hash_inputs(client_dir),
+            "options": options,
+        }
+        if not force and (client_dir / "presentation.html").exists() and load_build_manifest(client_dir) == manifest:
+            result["skipped"].append(client_dir)
+            continue
+        pending.append((client_dir, manifest))
+
+    if not pending:
+        return result
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    if jobs == 1:
+        _init_batch_worker(template)
+        for client_dir, manifest in pending:
+            try:
+                _build_client(client_dir, manifest, brand_color, compress)
+                result["built"].append(client_dir)
+            except Exception as e:
+                result["failed"].append((client_dir, e))
+        return result
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(template,)) as pool:
+        futures = {
+            pool.submit(_build_client, client_dir, manifest, brand_color, compress): client_dir
+            for client_dir, manifest in pending
+        }
+        for future in as_completed(futures):
+            client_dir = futures[future]
+            try:
+                future.result()
+                result["built"].append(client_dir)
+            except Exception as e:
+                result["failed"].append((client_dir, e))
+    result["built"].sort()
+    result["failed"].sort(key=lambda item: item[0])
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate an interactive HTML presentation from keyword analysis artifacts."
@@ -435,8 +729,28 @@ def main():
     parser.add_argument(
         "client_dir",
         type=Path,
+        nargs="?",
         help="Path to client directory containing JSON artifacts",
     )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        metavar="CLIENTS_DIR",
+        default=None,
+        help="Generate presentations for every client directory in CLIENTS_DIR",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --batch, rebuild clients whose inputs and template are unchanged",
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -458,9 +772,38 @@ def main():
         default="#2b74b8",
         help="Brand color in hex format (default: #2b74b8)",
     )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Embed the data gzip+base64 and decode it in the browser (smaller output)",
+    )
 
     args = parser.parse_args()
 
+    if args.batch is not None:
+        if not args.batch.is_dir():
+            print(f"Error: Directory not found: {args.batch}", file=sys.stderr)
+            sys.exit(1)
+        result = generate_batch(
+            args.batch,
+            jobs=args.jobs,
+            force=args.force,
+            brand_color=args.color,
+            compress=args.compress,
+        )
+        for client_dir in result["built"]:
+            print(f"✓ {client_dir.name}: {client_dir / 'presentation.html'}")
+        for client_dir, error in result["failed"]:
+            print(f"✗ {client_dir.name}: {error}", file=sys.stderr)
+        print(
+            f"\nBuilt {len(result['built'])}, unchanged {len(result['skipped'])}, "
+            f"incomplete {len(result['incomplete'])}, failed {len(result['failed'])}"
+        )
+        sys.exit(1 if result["failed"] else 0)
+
+    if args.client_dir is None:
+        parser.error("client_dir is required unless --batch is given")
+
     if not args.client_dir.exists():
         print(f"Error: Directory not found: {args.client_dir}", file=sys.stderr)
         sys.exit(1)
@@ -471,6 +814,7 @@ def main():
             output_path=args.output,
             client_name=args.name,
             brand_color=args.color,
+            compress=args.compress,
         )
         print(f"\nOpen in browser: file://{output_path.absolute()}")
     except FileNotFoundError as e:
@@ -15,16 +15,25 @@ default MiniLM embeddings.
 from __future__ import annotations
 
 import argparse
+import bisect
+import csv
+import io
 import json
 import math
 import os
 import re
+import sys
 import uuid
 from dataclasses import dataclass, asdict
-from typing import Iterable, List, Dict, Tuple
+from itertools import groupby
+from typing import Iterable, Iterator, List, Dict, Tuple
 
 import chromadb
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.rag.local_index import DEFAULT_INDEX_PATH, write_local_index
+
 
 # ---- Paths & constants ----------------------------------------------------
 
@@ -36,12 +45,17 @@ BACKEND_KB_DIR = os.path.join(BASE_DIR, "backend", "knowledge_base")
 EXTRACTED_JSON = os.path.join(BACKEND_KB_DIR, "extracted_raw.json")
 CHROMA_PATH = os.path.join(BACKEND_KB_DIR, "chroma_db")
 COLLECTION_NAME = "agency_knowledge"
+LOCAL_INDEX_PATH = DEFAULT_INDEX_PATH
 
 # target ~200-500 tokens => roughly 150-380 words
 MIN_WORDS = 120
 TARGET_WORDS = 260
 MAX_WORDS = 380
 
+# Streaming ingestion bounds
+MAX_PENDING_CHARS = 1_000_000  # force a break in text with no sentence boundaries
+MAX_TABLE_ROWS = 40  # data rows kept per Excel sheet
+
 
 # ---- Data containers ------------------------------------------------------
 
@@ -60,16 +74,19 @@ def slugify(name: str) -> str:
     return base or "chunk"
 
 
+SECTION_HEADING = re.compile(r"^(#|\d+\.\d+|Section\s+\d+)")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
+
+
 def split_sections(text: str) -> List[Tuple[str | None, str]]:
     """Split by headings (numbers, hashes) while keeping section title."""
     lines = text.splitlines()
     sections: List[Tuple[str | None, List[str]]] = []
     current_title = None
     current_lines: List[str] = []
-    heading_pattern = re.compile(r"^(#|\d+\.\d+|Section\s+\d+)")
 
     for line in lines:
-        if heading_pattern.match(line.strip()):
+        if SECTION_HEADING.match(line.strip()):
             if current_lines:
                 sections.append((current_title, "\n".join(current_lines).strip()))
             current_title = line.strip()
@@ -87,7 +104,7 @@ def split_sections(text: str) -> List[Tuple[str | None, str]]:
 
 def sentence_split(text: str) -> List[str]:
     # Light-weight sentence splitter that avoids splitting on decimals/URLs.
-    parts = re.split(r"(?<=[.!?])\s+(?=[A-Z0-9])", text)
+    parts = SENTENCE_BOUNDARY.split(text)
     sentences = []
     for p in parts:
         p = p.strip()
@@ -101,25 +118,138 @@ def sentence_split(text: str) -> List[str]:
     return sentences
 
 
+class SentenceStream:
+    """
+    Incremental counterpart of sentence_split: feed lines, get complete sentences.
+
+    Only the trailing, possibly unfinished sentence is buffered. A blank line is
+    a paragraph break and flushes the buffer, like the paragraph split above.
+    Text without sentence boundaries is cut (at a space) every
+    MAX_PENDING_CHARS characters.
+
+    The buffer is kept as pieces: the tail from its last non-space character
+    on, and everything before it. Boundaries before the tail were split off by
+    earlier calls, so each line is searched (and copied) together with the
+    tail only, which keeps feeding linear.
+    """
+
+    def __init__(self):
+        self.head: List[str] = []
+        self.tail: List[str] = []
+        self.size = 0
+
+    @property
+    def buffer(self) -> str:
+        return "".join(self.head) + "".join(self.tail)
+
+    def _reset(self, text: str = ""):
+        self.head, self.tail, self.size = [], [], 0
+        self._append(text)
+
+    def _append(self, text: str):
+        kept = len(text.rstrip())
+        if kept:
+            self.head.extend(self.tail)
+            self.head.append(text[: kept - 1])
+            self.tail = [text[kept - 1 :]]
+        elif self.tail:
+            self.tail.append(text)
+        else:
+            self.head.append(text)
+        self.size += len(text)
+
+    def feed(self, line: str) -> List[str]:
+        if not line:
+            return self.flush()
+        parts = []
+        if self.size and line.isspace():
+            # A boundary needs a non-space character after it
+            self._append(f"\n{line}")
+        else:
+            if self.size:
+                tail = "".join(self.tail)
+                text, start = f"{tail}\n{line}", len(tail.rstrip())
+                self.tail, self.size = [], self.size - len(tail)
+            else:
+                text, start = line, 0
+            end = 0
+            for match in SENTENCE_BOUNDARY.finditer(text, start):
+                parts.append(text[end : match.start()])
+                end = match.end()
+            if parts:
+                parts[0] = "".join(self.head) + parts[0]
+                self._reset(text[end:])
+            else:
+                self._append(text)
+        if self.size > MAX_PENDING_CHARS:
+            buffer, pos = self.buffer, 0
+            while len(buffer) - pos > MAX_PENDING_CHARS:
+                cut = buffer.rfind(" ", pos, pos + MAX_PENDING_CHARS)
+                cut = cut if cut > pos else pos + MAX_PENDING_CHARS
+                parts.append(buffer[pos:cut])
+                pos = cut
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+            self._reset(buffer[pos:])
+        return [p.strip() for p in parts if p.strip()]
+
+    def flush(self) -> List[str]:
+        buffer = self.buffer
+        parts = SENTENCE_BOUNDARY.split(buffer) if buffer else []
+        self._reset()
+        return [p.strip() for p in parts if p.strip()]
+
+
+def iter_sentences(lines: Iterable[str]) -> Iterator[str]:
+    """Stream sentences from lines (e.g. an open file) without reading it whole."""
+    stream = SentenceStream()
+    for line in lines:
+        yield from stream.feed(line.rstrip("\r\n"))
+    yield from stream.flush()
+
+
+def iter_section_sentences(lines: Iterable[str]) -> Iterator[Tuple[int, str | None, str]]:
+    """Stream (section_index, section_title, sentence) with split_sections' heading rules."""
+    stream = SentenceStream()
+    index, title = 0, None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if SECTION_HEADING.match(line.strip()):
+            for sentence in stream.flush():
+                yield index, title, sentence
+            index, title = index + 1, line.strip()
+            continue
+        for sentence in stream.feed(line):
+            yield index, title, sentence
+    for sentence in stream.flush():
+        yield index, title, sentence
+
+
+def iter_section_blocks(lines: Iterable[str]) -> Iterator[Tuple[str | None, List[str]]]:
+    """Stream (section_title, sentence_block) chunks; memory is bounded by one chunk."""
+    sections = groupby(iter_section_sentences(lines), key=lambda event: (event[0], event[1]))
+    for (_, title), events in sections:
+        for block in iter_chunks(sentence for _, _, sentence in events):
+            yield title, block
+
+
+HIGHLIGHT_CUES = ("always", "never", "avoid", "must", "should", "rule", "best practice", "warning")
+MAX_HIGHLIGHTS = 6
+
+
 def extract_highlights(sentences: List[str]) -> List[str]:
-    keywords = ("always", "never", "avoid", "must", "should", "rule", "best practice", "warning")
-    highlights = []
-    for s in sentences:
-        lower = s.lower()
-        if any(k in lower for k in keywords):
-            highlights.append(s.strip())
-    return highlights[:6]  # keep concise
+    return classify_sentences(sentences).highlights
 
 
-def chunk_sentences(sentences: List[str]) -> List[List[str]]:
-    chunks: List[List[str]] = []
+def iter_chunks(sentences: Iterable[str]) -> Iterator[List[str]]:
     buffer: List[str] = []
     word_count = 0
 
     for sent in sentences:
         words = len(sent.split())
         if word_count + words > MAX_WORDS and buffer:
-            chunks.append(buffer)
+            if word_count >= MIN_WORDS:
+                yield buffer
             buffer = []
             word_count = 0
 
@@ -127,17 +257,26 @@ def chunk_sentences(sentences: List[str]) -> List[List[str]]:
         word_count += words
 
         if word_count >= TARGET_WORDS:
-            chunks.append(buffer)
+            yield buffer
             buffer = []
             word_count = 0
 
-    if buffer and len(buffer) > 0:
-        chunks.append(buffer)
-    return [c for c in chunks if sum(len(s.split()) for s in c) >= MIN_WORDS]
+    if buffer and word_count >= MIN_WORDS:
+        yield buffer
 
 
-def build_chunk_text(section_title: str | None, sentences: List[str], source: str) -> str:
-    highlights = extract_highlights(sentences)
+def chunk_sentences(sentences: Iterable[str]) -> List[List[str]]:
+    return list(iter_chunks(sentences))
+
+
+def build_chunk_text(
+    section_title: str | None,
+    sentences: List[str],
+    source: str,
+    highlights: List[str] | None = None,
+) -> str:
+    if highlights is None:
+        highlights = extract_highlights(sentences)
     body = " ".join(sentences)
     header = f"Source: {source}"
     if section_title:
@@ -177,37 +316,102 @@ TOPIC_KEYWORDS = {
 }
 
 
+MATCH_SUBTOPICS = ("broad", "phrase", "exact")
+CONTENT_TYPE_CUES = {
+    "warning": ("never", "avoid", "warning"),
+    "example": ("example",),
+    "best_practice": ("best practice", "should", "rule"),
+}
+CASE_STUDY_MARKERS = ("spacefinder",)
+
+
+def _build_signal_pattern() -> re.Pattern:
+    cues = set(TOPIC_KEYWORDS) | set(HIGHLIGHT_CUES) | set(CASE_STUDY_MARKERS)
+    for words in CONTENT_TYPE_CUES.values():
+        cues.update(words)
+    # Longest first so multi-word cues ("best practice", "search term") win the alternation.
+    alternation = "|".join(re.escape(c) for c in sorted(cues, key=lambda c: (-len(c), c)))
+    # Anchor at a word start so "rsa" no longer fires inside "conversation"
+    # (a lookbehind is measurably faster than \b in CPython's re).
+    return re.compile(rf"(?<![a-z0-9_])(?:{alternation})")
+
+
+SIGNAL_PATTERN = _build_signal_pattern()
+TOPIC_ORDER = {topic: i for i, topic in enumerate(dict.fromkeys(TOPIC_KEYWORDS.values()))}
+
+
+@dataclass
+class TextSignals:
+    """Everything metadata inference needs, gathered in one scan of the text."""
+
+    topic_scores: Dict[str, int]
+    cue_counts: Dict[str, int]
+    highlights: List[str]
+
+    @property
+    def topic(self) -> str:
+        if not self.topic_scores:
+            return "general_google_ads"
+        # Highest score wins; ties fall back to TOPIC_KEYWORDS order so results are stable.
+        return min(self.topic_scores, key=lambda t: (-self.topic_scores[t], TOPIC_ORDER[t]))
+
+    @property
+    def subtopic(self) -> str | None:
+        hits = [(self.cue_counts.get(m, 0), -i, m) for i, m in enumerate(MATCH_SUBTOPICS)]
+        count, _, best = max(hits)
+        return f"{best}_match" if count else None
+
+    def tags(self, filename: str = "") -> List[str]:
+        tags = set(self.topic_scores)
+        lower_name = filename.lower()
+        tags.update(m for m in CASE_STUDY_MARKERS if m in self.cue_counts or m in lower_name)
+        return sorted(tags)
+
+    def content_type(self, source_kind: str) -> str:
+        if source_kind == "case_study":
+            return "case_study"
+        if source_kind == "agency":
+            return "methodology"
+        for content_type, cues in CONTENT_TYPE_CUES.items():
+            if any(c in self.cue_counts for c in cues):
+                return content_type
+        return "methodology"
+
+
+def classify_sentences(sentences: Iterable[str]) -> TextSignals:
+    """Score topics, collect cues and pick highlight sentences in a single scan."""
+    sentences = list(sentences)
+    lowered = [sentence.lower() for sentence in sentences]
+    starts = []
+    offset = 0
+    for sentence in lowered:
+        starts.append(offset)
+        offset += len(sentence) + 1
+
+    topic_scores: Dict[str, int] = {}
+    cue_counts: Dict[str, int] = {}
+    highlight_rows: List[int] = []
+    for match in SIGNAL_PATTERN.finditer(" ".join(lowered)):
+        cue = match.group(0)
+        cue_counts[cue] = cue_counts.get(cue, 0) + 1
+        topic = TOPIC_KEYWORDS.get(cue)
+        if topic:
+            topic_scores[topic] = topic_scores.get(topic, 0) + 1
+        if cue in HIGHLIGHT_CUES and len(highlight_rows) < MAX_HIGHLIGHTS:
+            row = bisect.bisect_right(starts, match.start()) - 1
+            if not highlight_rows or highlight_rows[-1] != row:
+                highlight_rows.append(row)
+    highlights = [sentences[row].strip() for row in highlight_rows]
+    return TextSignals(topic_scores=topic_scores, cue_counts=cue_counts, highlights=highlights)
+
+
 def infer_topic(text: str, filename: str) -> Tuple[str, str | None, List[str]]:
-    lower = text.lower()
-    topic = "general_google_ads"
-    subtopic = None
-    tags = []
-
-    for key, value in TOPIC_KEYWORDS.items():
-        if key in lower:
-            topic = value
-            tags.append(value)
-            if key in ("broad", "phrase", "exact"):
-                subtopic = key + "_match"
-    if "spacefinder" in lower or "spacefinder" in filename.lower():
-        tags.append("spacefinder")
-        topic = topic or "case_study"
-    return topic, subtopic, sorted(set(tags))
+    signals = classify_sentences([text])
+    return signals.topic, signals.subtopic, signals.tags(filename)
 
 
 def infer_content_type(text: str, source_kind: str) -> str:
-    lower = text.lower()
-    if source_kind == "case_study":
-        return "case_study"
-    if source_kind == "agency":
-        return "methodology"
-    if any(w in lower for w in ("never", "avoid", "warning")):
-        return "warning"
-    if "example" in lower or "for example" in lower:
-        return "example"
-    if "best practice" in lower or "should" in lower or "rule" in lower:
-        return "best_practice"
-    return "methodology"
+    return classify_sentences([text]).content_type(source_kind)
 
 
 def infer_difficulty(filename: str, source_kind: str) -> str:
@@ -269,25 +473,24 @@ def load_transcript_chunks() -> List[Chunk]:
 
     for path in sorted(files):
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            raw = f.read()
-        sections = split_sections(raw)
-        for section_title, section_text in sections:
-            sentences = sentence_split(section_text)
-            for sent_block in chunk_sentences(sentences):
-                topic, subtopic, tags = infer_topic(" ".join(sent_block), os.path.basename(path))
+            for section_title, sent_block in iter_section_blocks(f):
+                signals = classify_sentences(sent_block)
+                topic, tags = signals.topic, signals.tags(os.path.basename(path))
                 source_kind = "course"
                 metadata = {
                     "source": os.path.basename(path),
                     "section": section_title,
                     "topic": topic,
-                    "subtopic": subtopic,
-                    "content_type": infer_content_type(" ".join(sent_block), source_kind),
+                    "subtopic": signals.subtopic,
+                    "content_type": signals.content_type(source_kind),
                     "difficulty": infer_difficulty(path, source_kind),
                     "relevance_score": infer_relevance(source_kind),
                     "tags": tags or [topic],
                     "source_kind": source_kind,
                 }
-                text = build_chunk_text(section_title, sent_block, os.path.basename(path))
+                text = build_chunk_text(
+                    section_title, sent_block, os.path.basename(path), signals.highlights
+                )
                 chunk_id = f"{slugify(os.path.basename(path))}-{uuid.uuid4().hex[:8]}"
                 chunks.append(Chunk(text=text, metadata=metadata, id=chunk_id))
     return chunks
@@ -305,18 +508,15 @@ def load_agency_md_chunks() -> List[Chunk]:
         if not os.path.exists(path):
             continue
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            raw = f.read()
-        sections = split_sections(raw)
-        for section_title, section_text in sections:
-            sentences = sentence_split(section_text)
-            for sent_block in chunk_sentences(sentences):
-                topic, subtopic, tags = infer_topic(" ".join(sent_block), name)
+            for section_title, sent_block in iter_section_blocks(f):
+                signals = classify_sentences(sent_block)
+                topic, tags = signals.topic, signals.tags(name)
                 source_kind = "agency"
                 metadata = {
                     "source": name,
                     "section": section_title,
                     "topic": topic,
-                    "subtopic": subtopic,
+                    "subtopic": signals.subtopic,
                     "content_type": "methodology",
                     "difficulty": "intermediate",
                     "relevance_score": infer_relevance(source_kind),
@@ -324,7 +524,7 @@ def load_agency_md_chunks() -> List[Chunk]:
                     "source_kind": source_kind,
                     "priority": 2,
                 }
-                text = build_chunk_text(section_title, sent_block, name)
+                text = build_chunk_text(section_title, sent_block, name, signals.highlights)
                 chunk_id = f"{slugify(name)}-{uuid.uuid4().hex[:8]}"
                 chunks.append(Chunk(text=text, metadata=metadata, id=chunk_id))
     return chunks
@@ -436,27 +636,26 @@ class RAGPipeline:
         source_kind = "agency" if DATA_EXAMPLES_DIR in os.path.abspath(path) else "course"
 
         if ext in (".txt", ".md"):
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                raw = f.read()
-            sections = split_sections(raw)
             chunks: List[Chunk] = []
-            for section_title, section_text in sections:
-                sentences = sentence_split(section_text)
-                for sent_block in chunk_sentences(sentences):
-                    topic, subtopic, tags = infer_topic(" ".join(sent_block), os.path.basename(path))
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                for section_title, sent_block in iter_section_blocks(f):
+                    signals = classify_sentences(sent_block)
+                    topic, tags = signals.topic, signals.tags(os.path.basename(path))
                     metadata = {
                         "source": os.path.basename(path),
                         "section": section_title,
                         "topic": topic,
-                        "subtopic": subtopic,
-                        "content_type": infer_content_type(" ".join(sent_block), source_kind),
+                        "subtopic": signals.subtopic,
+                        "content_type": signals.content_type(source_kind),
                         "difficulty": infer_difficulty(path, source_kind),
                         "relevance_score": infer_relevance(source_kind),
                         "tags": tags or [topic],
                         "source_kind": source_kind,
                         "priority": 2 if source_kind == "agency" else 1,
                     }
-                    text = build_chunk_text(section_title, sent_block, os.path.basename(path))
+                    text = build_chunk_text(
+                        section_title, sent_block, os.path.basename(path), signals.highlights
+                    )
                     chunk_id = f"{slugify(os.path.basename(path))}-{uuid.uuid4().hex[:8]}"
                     chunks.append(Chunk(text=text, metadata=metadata, id=chunk_id))
             unique_chunks = dedupe_chunks(chunks)
@@ -464,10 +663,8 @@ class RAGPipeline:
             return len(unique_chunks)
 
         if ext in (".xlsx", ".csv"):
-            text = self._load_table_text(path)
-            sentences = sentence_split(text)
             chunks: List[Chunk] = []
-            for sent_block in chunk_sentences(sentences):
+            for sent_block in iter_chunks(iter_sentences(self._iter_table_lines(path))):
                 metadata = {
                     "source": os.path.basename(path),
                     "topic": "case_study",
@@ -488,23 +685,62 @@ class RAGPipeline:
 
         raise ValueError(f"Unsupported file type: {ext}")
 
-    def _load_table_text(self, path: str) -> str:
+    def _iter_table_lines(self, path: str) -> Iterator[str]:
+        """Yield table text line by line; Excel sheets are capped at MAX_TABLE_ROWS data rows."""
         if path.lower().endswith(".csv"):
+            yield f"Table: {os.path.basename(path)}"
             with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                return f"Table: {os.path.basename(path)}\n" + f.read()
+                yield from f
+            return
         try:
-            import pandas as pd
+            from openpyxl import load_workbook
         except ImportError as exc:
-            raise RuntimeError("pandas is required to ingest Excel files; install pandas") from exc
-        xls = pd.ExcelFile(path)
-        sheets = []
-        for sheet in xls.sheet_names:
-            df = xls.parse(sheet).dropna(how="all")
-            if df.empty:
-                continue
-            snippet = df.head(40).to_csv(index=False)
-            sheets.append(f"Sheet: {sheet}\n{snippet}")
-        return "\n\n".join(sheets)
+            raise RuntimeError("openpyxl is required to ingest Excel files; install openpyxl") from exc
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            first = True
+            for sheet in workbook.worksheets:
+                rows = []
+                for row in sheet.iter_rows(values_only=True):
+                    if all(cell is None or cell == "" for cell in row):
+                        continue
+                    rows.append(row)
+                    if len(rows) > MAX_TABLE_ROWS:  # header + MAX_TABLE_ROWS data rows
+                        break
+                if len(rows) < 2:
+                    continue
+                if not first:
+                    yield ""
+                first = False
+                yield f"Sheet: {sheet.title}"
+                out = io.StringIO()
+                csv.writer(out, lineterminator="\n").writerows(
+                    ["" if cell is None else cell for cell in row] for row in rows
+                )
+                yield from out.getvalue().splitlines()
+        finally:
+            workbook.close()
+
+    def export_local_index(
+        self, path: str = LOCAL_INDEX_PATH, dtype: str = "int8", batch_size: int = 500
+    ) -> int:
+        """Export the collection to a memory-mapped local index (see backend.rag.local_index)."""
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict[str, object]] = []
+        embeddings: List[List[float]] = []
+        total = self.collection.count()
+        for offset in range(0, total, batch_size):
+            batch = self.collection.get(
+                include=["documents", "metadatas", "embeddings"],
+                limit=batch_size,
+                offset=offset,
+            )
+            ids.extend(batch["ids"])
+            documents.extend(batch["documents"])
+            metadatas.extend(batch["metadatas"])
+            embeddings.extend(batch["embeddings"])
+        return write_local_index(path, ids, documents, metadatas, embeddings, dtype=dtype)
 
     def _persist(self, chunks: List[Chunk], batch_size: int = 64) -> None:
         def normalize(meta: Dict[str, object]) -> Dict[str, object]:
@@ -532,6 +768,14 @@ def main():
     parser = argparse.ArgumentParser(description="Build or extend the RAG database.")
     parser.add_argument("--rebuild", action="store_true", help="Drop and rebuild full DB")
     parser.add_argument("--add", type=str, help="Add a single file without full rebuild")
+    parser.add_argument(
+        "--export-local",
+        action="store_true",
+        help="Export the collection to the memory-mapped local index (after --rebuild/--add if given)",
+    )
+    parser.add_argument(
+        "--dtype", choices=["int8", "float16"], default="int8", help="Local index embedding precision"
+    )
     args = parser.parse_args()
 
     pipeline = RAGPipeline()
@@ -539,14 +783,16 @@ def main():
     if args.rebuild:
         count = pipeline.rebuild()
         print(f"Rebuilt collection with {count} chunks")
-        return
-
-    if args.add:
+    elif args.add:
         count = pipeline.add_file(args.add)
         print(f"Added {count} chunks from {args.add}")
-        return
 
-    parser.print_help()
+    if args.export_local:
+        count = pipeline.export_local_index(dtype=args.dtype)
+        print(f"Exported {count} chunks to {LOCAL_INDEX_PATH} ({args.dtype})")
+
+    if not (args.rebuild or args.add or args.export_local):
+        parser.print_help()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,24 @@
+import argparse
+import hashlib
+import importlib.util
 import json
 import os
-import argparse
+import re
 import sys
-import jsonschema
-from jsonschema import validate
+from typing import Callable, List, Optional, Tuple
+
+import deliverable_rules
+from deliverable_rules import ERROR, Violation
 
 # Load Schemas
 SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "..", "schemas")
 
+# Generated validator modules, keyed by schema file hash (see CompiledSchema).
+VALIDATOR_CACHE_DIR = os.environ.get(
+    "MB_VALIDATOR_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "mb-keyword-analysis", "validators"),
+)
+
 
 def load_schema(name):
     path = os.path.join(SCHEMA_DIR, name)
@@ -19,135 +30,417 @@ def load_schema(name):
         return None
 
 
-SCHEMAS = {
-    "keyword_analysis": load_schema("keyword_analysis.schema.json"),
-    "campaign_structure": load_schema("campaign_structure.schema.json"),
-    "ad_copy": load_schema("ad_copy.schema.json"),
-    "negative_keywords": load_schema("negative_keywords.schema.json"),
+def schema_digest(name) -> str:
+    with open(os.path.join(SCHEMA_DIR, name), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+SCHEMA_FILES = {
+    "keyword_analysis": "keyword_analysis.schema.json",
+    "campaign_structure": "campaign_structure.schema.json",
+    "ad_copy": "ad_copy.schema.json",
+    "negative_keywords": "negative_keywords.schema.json",
 }
 
+SCHEMAS = {key: load_schema(name) for key, name in SCHEMA_FILES.items()}
+
 # Filter out None schemas
 SCHEMAS = {k: v for k, v in SCHEMAS.items() if v is not None}
 
 
-def validate_data(data, schema_type):
+# ---- Compiled validators ---------------------------------------------------
+
+SchemaError = Tuple[List[object], str]  # (path within the validated value, message)
+
+
+def _compile_fast(definition: dict, cache_key: str) -> Optional[Callable]:
     """
-    Validates a list of dictionaries against the specified schema.
-    Returns (True, []) if valid, (False, [errors]) if invalid.
+    Load a fastjsonschema-generated validator from disk, generating it on first use.
+
+    Returns None when fastjsonschema is not installed.
+    """
+    try:
+        import fastjsonschema
+    except ImportError:
+        return None
+
+    module_path = os.path.join(
+        VALIDATOR_CACHE_DIR, f"{cache_key}-fjs{fastjsonschema.VERSION.replace('.', '_')}.py"
+    )
+    if not os.path.exists(module_path):
+        # Formats are not asserted, matching jsonschema's default behaviour.
+        options = {"use_formats": False, "fast_fail": False}
+        try:
+            code = fastjsonschema.compile_to_code(definition, **options)
+        except TypeError:  # fastjsonschema < 2.21 has no fast_fail
+            options.pop("fast_fail")
+            code = fastjsonschema.compile_to_code(definition, **options)
+        os.makedirs(VALIDATOR_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{module_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(code)
+        os.replace(tmp_path, module_path)
+
+    spec = importlib.util.spec_from_file_location(f"mb_validator_{cache_key}", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.validate
+
+
+def _compile_reference(definition: dict):
+    """jsonschema validator built once, without re-checking the meta-schema per call."""
+    try:
+        from jsonschema.validators import validator_for
+    except ImportError:
+        return None
+    return validator_for(definition)(definition)
+
+
+class CompiledSchema:
+    """
+    Validator for one schema, compiled once per process and cached on disk.
+
+    Uses fastjsonschema-generated code when available (cached by schema file
+    hash, so only the first run after a schema edit pays for code generation)
+    and falls back to a prebuilt jsonschema validator. Both report every error
+    in the value, not just the first.
+    """
+
+    def __init__(self, definition: dict, cache_key: str):
+        self.definition = definition
+        self._fast = _compile_fast(definition, cache_key)
+        self._reference = None if self._fast else _compile_reference(definition)
+        if self._fast is None and self._reference is None:
+            raise RuntimeError("Install fastjsonschema or jsonschema to validate deliverables")
+        self.backend = "fastjsonschema" if self._fast else "jsonschema"
+
+    def errors(self, value) -> List[SchemaError]:
+        if self._fast is None:
+            return self._reference_errors(value)
+        try:
+            self._fast(value)
+            return []
+        except Exception as exc:  # JsonSchemaValue(s)Exception
+            failure = exc
+        # Invalid values are rare: re-check with jsonschema so both backends
+        # report the same paths and messages
+        if self._reference is None:
+            self._reference = _compile_reference(self.definition) or False
+        if self._reference:
+            return self._reference_errors(value)
+        found = getattr(failure, "errors", None) or [failure]
+        return [(_resolve_path(value, e.name), e.message) for e in found]
+
+    def _reference_errors(self, value) -> List[SchemaError]:
+        return [
+            (list(e.path), e.message)
+            for e in sorted(self._reference.iter_errors(value), key=lambda e: list(e.path))
+        ]
+
+
+def _resolve_path(value, name: str) -> List[object]:
+    """
+    Path from a fastjsonschema error name ("data.Avg. Monthly Searches"),
+    matching keys against the value instead of splitting on ".".
+    """
+    path: List[object] = []
+    rest = name[len("data"):] if name.startswith("data") else name
+    while rest:
+        if rest.startswith("[") and "]" in rest and isinstance(value, list):
+            index = int(rest[1 : rest.index("]")])
+            path.append(index)
+            value = value[index] if index < len(value) else None
+            rest = rest[rest.index("]") + 1 :]
+            continue
+        rest = rest[1:] if rest.startswith(".") else rest
+        keys = [
+            key for key in (value if isinstance(value, dict) else ())
+            if rest.startswith(key) and rest[len(key) :][:1] in ("", ".", "[")
+        ]
+        if not keys:
+            path.append(rest)
+            break
+        key = max(keys, key=len)
+        path.append(key)
+        value = value[key]
+        rest = rest[len(key) :]
+    return path
+
+
+class DeliverableValidator:
+    """Top-level check plus a per-row validator for array deliverables."""
+
+    def __init__(self, schema_type: str):
+        schema = SCHEMAS[schema_type]
+        digest = schema_digest(SCHEMA_FILES[schema_type])[:16]
+        self.digest = digest
+        items = schema.get("items") if schema.get("type") == "array" else None
+        if isinstance(items, dict):
+            root = {k: v for k, v in schema.items() if k != "items"}
+            self.root = CompiledSchema(root, f"{schema_type}-root-{digest}")
+            self.rows = CompiledSchema(items, f"{schema_type}-items-{digest}")
+        else:
+            self.root = CompiledSchema(schema, f"{schema_type}-{digest}")
+            self.rows = None
+
+    def root_errors(self, data) -> List[SchemaError]:
+        return self.root.errors(data)
+
+    def row_errors(self, index: int, row) -> List[SchemaError]:
+        return [([index] + path, message) for path, message in self.rows.errors(row)]
+
+
+_VALIDATORS = {}
+
+
+def get_validator(schema_type: str) -> DeliverableValidator:
+    if schema_type not in _VALIDATORS:
+        _VALIDATORS[schema_type] = DeliverableValidator(schema_type)
+    return _VALIDATORS[schema_type]
+
+
+def format_schema_error(error: SchemaError) -> str:
+    path, message = error
+    location = " -> ".join(str(p) for p in path) if path else "root"
+    return f"Schema Error at '{location}': {message}"
+
+
+def schema_violation(error: SchemaError) -> Violation:
+    path, _ = error
+    row = path[0] if path and isinstance(path[0], int) else None
+    column = next((str(p) for p in path[1:2]), None) if row is not None else None
+    return Violation(row, column, "schema", ERROR, format_schema_error(error))
+
+
+def validate_table(data, schema_type) -> List[Violation]:
+    """
+    Validates a deliverable and returns its violation table.
+
+    Schema errors come from the compiled per-row validators; business rules
+    are evaluated column-wise by deliverable_rules over the same rows.
     """
     if schema_type not in SCHEMAS:
-        return False, [f"Unknown schema type: {schema_type}"]
+        return [Violation(None, None, "schema", ERROR, f"Unknown schema type: {schema_type}")]
 
-    schema = SCHEMAS[schema_type]
-    errors = []
+    validator = get_validator(schema_type)
 
     # 1. JSON Schema Validation (Structure, Types, MaxLength)
-    try:
-        validate(instance=data, schema=schema)
-    except jsonschema.exceptions.ValidationError as e:
-        # Create a readable error message
-        path = " -> ".join([str(p) for p in e.path]) if e.path else "root"
-        errors.append(f"Schema Error at '{path}': {e.message}")
-        # We continue to check custom rules even if schema fails, if possible
-
-    # 2. Custom Business Logic Validation
-    if isinstance(data, list):
+    violations = [schema_violation(e) for e in validator.root_errors(data)]
+
+    if not isinstance(data, list):
+        return violations
+
+    if validator.rows is not None:
         for i, row in enumerate(data):
-            row_prefix = f"Row {i}"
-
-            # Check Campaign Naming Convention (All tabs)
-            if "Campaign" in row:
-                campaign = row.get("Campaign", "")
-                if campaign and not str(campaign).startswith("mb |"):
-                    errors.append(
-                        f"{row_prefix}: Campaign '{campaign}' must start with 'mb |'"
-                    )
-
-            # Check Ad Group Naming (All tabs)
-            if "Ad Group" in row:
-                ad_group = row.get("Ad Group", "")
-                if ad_group and " | " not in str(ad_group):
-                    # Soft warning or strict? Prompt implies strict pattern check.
-                    # Let's just warn for now to avoid blocking valid variations.
-                    pass
-
-            # Check Sentence Case in Headlines (Ad Copy)
-            if schema_type == "ad_copy":
-                for i in range(1, 16):
-                    key = f"Headline {i}"
-                    if key in row:
-                        h = row[key]
-                        if not isinstance(h, str):
-                            continue
-                        # Check for Title Case (simple heuristic: more than half words capitalized)
-                        words = h.split()
-                        if len(words) > 1:
-                            capitalized_words = sum(1 for w in words if w[0].isupper())
-                            if capitalized_words > len(words) / 2 and not h.isupper():
-                                errors.append(
-                                    f"{row_prefix}: {key} '{h}' appears to be Title Case. Use sentence case."
-                                )
-
-            # NEW: Check Match Type Rationale (Keyword Analysis)
-            if schema_type == "keyword_analysis":
-                # Check Match Type Rationale is present and non-empty
-                if "Match Type" in row:
-                    rationale = row.get("Match Type Rationale", "")
-                    if not rationale or rationale.strip() == "":
-                        errors.append(
-                            f"{row_prefix}: Keyword '{row.get('Keyword', 'unknown')}' has Match Type but no Match Type Rationale"
-                        )
-
-                # Check Service_ID is present (can be null for excluded keywords)
-                if "Include" in row and row.get("Include") is True:
-                    service_id = row.get("Service_ID")
-                    if service_id is None:
-                        errors.append(
-                            f"{row_prefix}: Included keyword '{row.get('Keyword', 'unknown')}' has no Service_ID - validate against $CANONICAL_SERVICES"
-                        )
-
-                # Check Exclusion_Reason for excluded keywords
-                if row.get("Include") is False:
-                    reason = row.get("Exclusion_Reason")
-                    if not reason or reason.strip() == "":
-                        errors.append(
-                            f"{row_prefix}: Excluded keyword '{row.get('Keyword', 'unknown')}' has no Exclusion_Reason"
-                        )
-
-    # NEW: Additional aggregate checks for keyword_analysis
-    if schema_type == "keyword_analysis" and isinstance(data, list):
-        # Check positioning keyword percentage (if any exist)
-        total_included = sum(1 for row in data if row.get("Include") is True)
-        positioning_count = sum(
-            1
-            for row in data
-            if row.get("Positioning") is True and row.get("Include") is True
-        )
+            violations.extend(schema_violation(e) for e in validator.row_errors(i, row))
 
-        if total_included > 0:
-            positioning_pct = (positioning_count / total_included) * 100
-            if positioning_count > 0 and positioning_pct < 10:
-                errors.append(
-                    f"⚠️  Warning: Only {positioning_pct:.1f}% of keywords are positioning keywords. Consider if $POSITIONING_MODE requires 10-20%."
-                )
-
-        # Check for unvalidated keywords
-        unvalidated = [
-            row.get("Keyword")
-            for row in data
-            if row.get("Service_Validation") == "PENDING_REVIEW"
-        ]
-        if unvalidated:
-            errors.append(
-                f"⚠️  Warning: {len(unvalidated)} keywords still marked PENDING_REVIEW - complete Phase 3.5 validation"
-            )
+    # 2. Custom business logic, row and aggregate rules
+    violations.extend(deliverable_rules.evaluate(data, schema_type))
+    return deliverable_rules.sort_violations(violations)
 
+
+def validate_data(data, schema_type):
+    """
+    Validates a list of dictionaries against the specified schema.
+    Returns (True, []) if valid, (False, [errors]) if invalid.
+    """
+    errors = [v.message for v in validate_table(data, schema_type)]
     if errors:
         return False, errors
 
     return True, []
 
 
+# ---- Incremental validation ------------------------------------------------
+
+# Per-client cache of row hashes and their results, kept next to the deliverable.
+VALIDATION_CACHE_FILE = ".validation-cache.json"
+VALIDATION_CACHE_VERSION = 3
+
+# A cached row is its content hash followed by one digest per aggregate rule
+# of the columns that rule reads (hex characters each)
+ROW_HASH_CHARS = 16
+INPUT_DIGEST_CHARS = 8
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _scan_rows(text: str) -> Optional[Tuple[list, List[str]]]:
+    """
+    Decodes a top-level JSON array row by row, hashing each row's source text
+    (far cheaper than re-encoding decoded rows). None if text is not a
+    well-formed array; json.loads then reports the error.
+    """
+    scan = json.JSONDecoder().scan_once
+    skip = _WHITESPACE.match
+    rows, hashes = [], []
+    try:
+        i = skip(text, 0).end()
+        if text[i] != "[":
+            return None
+        i = skip(text, i + 1).end()
+        if text[i] != "]":
+            while True:
+                row, end = scan(text, i)
+                rows.append(row)
+                source = text[i:end].encode("utf-8", "surrogatepass")
+                hashes.append(hashlib.blake2b(source, digest_size=ROW_HASH_CHARS // 2).hexdigest())
+                i = skip(text, end).end()
+                if text[i] == "]":
+                    break
+                if text[i] != ",":
+                    return None
+                i = skip(text, i + 1).end()
+    except (IndexError, StopIteration, ValueError):
+        return None
+    return (rows, hashes) if not text[i + 1 :].strip() else None
+
+
+def _input_digest(row, columns) -> str:
+    values = {c: row[c] for c in columns if c in row} if isinstance(row, dict) else {}
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=INPUT_DIGEST_CHARS // 2).hexdigest()
+
+
+class ValidationCache:
+    """
+    Results of earlier runs for every deliverable in one client directory.
+
+    Each tab entry keeps the file's mtime and size, its rows in order (content
+    hash plus aggregate input digests), the schema errors and rule hits of
+    rows that have any (stored without the row index), and each aggregate
+    rule's result keyed by a hash of its input columns. Entries are dropped
+    when the schema file, validator backend or RULES_VERSION changes.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, VALIDATION_CACHE_FILE)
+        try:
+            with open(self.path, "r") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        if self.data.get("version") != VALIDATION_CACHE_VERSION:
+            self.data = {"version": VALIDATION_CACHE_VERSION, "tabs": {}}
+
+    def tab(self, name: str, fingerprint: str) -> dict:
+        entry = self.data["tabs"].get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            entry = {
+                "fingerprint": fingerprint,
+                "stat": None,
+                "root": [],
+                "rows": [],
+                "findings": {},
+                "aggregates": {},
+            }
+            self.data["tabs"][name] = entry
+        return entry
+
+    def save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            # json.dumps uses the C encoder; json.dump to a file does not
+            encoded = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+            with open(tmp_path, "w") as f:
+                f.write(encoded)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # A read-only client dir just means no reuse next time
+
+
+def _cached_violations(tab: dict) -> List[Violation]:
+    """The violation table of a tab entry, rows re-indexed to their current position."""
+    violations = [schema_violation((p, m)) for p, m in tab["root"]]
+    findings = tab["findings"]
+    for i, entry in enumerate(tab["rows"]):
+        record = findings.get(entry[:ROW_HASH_CHARS])
+        if record is None:
+            continue
+        violations.extend(schema_violation(([i] + p, m)) for p, m in record["schema"])
+        violations.extend(
+            Violation(i, column, rule, severity, deliverable_rules.row_message(i, detail))
+            for rule, column, severity, detail in record["rules"]
+        )
+    for entry in tab["aggregates"].values():
+        violations.extend(Violation(**v) for v in entry["violations"])
+    return deliverable_rules.sort_violations(violations)
+
+
+def validate_file(path: str, schema_type: str, use_cache: bool = True) -> List[Violation]:
+    """
+    Validates a deliverable file, re-checking only rows changed since the last run.
+
+    Produces the same violation table as validate_table. An untouched file
+    (same mtime and size) is not parsed at all. Otherwise rows are matched to
+    earlier results by content hash, only new rows are validated, and
+    aggregate rules re-run only when one of their input columns changed.
+    """
+    if not use_cache or schema_type not in SCHEMAS:
+        with open(path, "r") as f:
+            return validate_table(json.load(f), schema_type)
+
+    validator = get_validator(schema_type)
+    cache = ValidationCache(os.path.dirname(os.path.abspath(path)))
+    fingerprint = f"{validator.digest}:{validator.root.backend}:{deliverable_rules.RULES_VERSION}"
+    tab = cache.tab(f"{os.path.basename(path)}:{schema_type}", fingerprint)
+
+    st = os.stat(path)
+    stat = [st.st_mtime_ns, st.st_size]
+    if tab["stat"] == stat:
+        return _cached_violations(tab)
+
+    with open(path, "r") as f:
+        text = f.read()
+    scanned = _scan_rows(text)
+    if scanned is None:
+        return validate_table(json.loads(text), schema_type)
+    data, hashes = scanned
+    aggregate_rules = deliverable_rules.aggregate_rules_for(schema_type)
+
+    # 1. Rows: validate only content not seen before (first occurrence of each hash)
+    known = {entry[:ROW_HASH_CHARS]: entry for entry in tab["rows"]}
+    fresh = {}
+    for i, digest in enumerate(hashes):
+        if digest not in known and digest not in fresh:
+            fresh[digest] = i
+    records = {digest: {"schema": [], "rules": []} for digest in fresh}
+    if validator.rows is not None:
+        for digest, i in fresh.items():
+            records[digest]["schema"] = [[p, m] for p, m in validator.rows.errors(data[i])]
+    positions = list(fresh.values())
+    frame = deliverable_rules.Frame([data[i] for i in positions])
+    for pos, column, rule, severity, detail in deliverable_rules.row_rule_hits(frame, schema_type):
+        records[hashes[positions[pos]]]["rules"].append([rule, column, severity, detail])
+    for digest, i in fresh.items():
+        known[digest] = digest + "".join(_input_digest(data[i], r.inputs) for r in aggregate_rules)
+
+    findings = tab["findings"]
+    findings.update((digest, record) for digest, record in records.items() if record["schema"] or record["rules"])
+    current = set(hashes)
+    tab["findings"] = {digest: record for digest, record in findings.items() if digest in current}
+    tab["rows"] = [known[digest] for digest in hashes]
+    tab["root"] = [[p, m] for p, m in validator.root_errors(data)]
+
+    # 2. Aggregates: re-run a rule only when its input columns changed
+    aggregates = {}
+    for k, rule in enumerate(aggregate_rules):
+        start = ROW_HASH_CHARS + k * INPUT_DIGEST_CHARS
+        column_digests = "".join(entry[start : start + INPUT_DIGEST_CHARS] for entry in tab["rows"])
+        inputs = hashlib.blake2b(column_digests.encode("ascii"), digest_size=12).hexdigest()
+        entry = tab["aggregates"].get(rule.name)
+        if not entry or entry["inputs"] != inputs:
+            results = deliverable_rules.evaluate_aggregate_rule(
+                rule, deliverable_rules.Frame(data, columns=rule.inputs)
+            )
+            entry = {"inputs": inputs, "violations": [v.to_dict() for v in results]}
+        aggregates[rule.name] = entry
+    tab["aggregates"] = aggregates
+
+    tab["stat"] = stat
+    cache.save()
+    return _cached_violations(tab)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate Google Ads deliverables against Monday Brew schemas."
@@ -159,6 +452,16 @@ def main():
         "--all",
         help="Path to a JSON file containing all 3 tabs (as keys: keyword_analysis, campaign_structure, ad_copy)",
     )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the violation table as JSON instead of a report",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-validate every row instead of reusing {VALIDATION_CACHE_FILE} results",
+    )
 
     args = parser.parse_args()
 
@@ -167,15 +470,21 @@ def main():
         sys.exit(1)
 
     all_valid = True
+    report = {}
 
     def run_validation(path, schema_type):
+        if args.json:
+            try:
+                violations = validate_file(path, schema_type, use_cache=not args.no_cache)
+            except Exception as e:
+                violations = [Violation(None, None, "load", ERROR, f"{path}: {e}")]
+            report[schema_type] = [v.to_dict() for v in violations]
+            return not violations
+
         print(f"Validating {schema_type} from {path}...")
         try:
-            with open(path, "r") as f:
-                data = json.load(f)
-
-            is_valid, errors = validate_data(data, schema_type)
-            if is_valid:
+            errors = [v.message for v in validate_file(path, schema_type, use_cache=not args.no_cache)]
+            if not errors:
                 print(f"✅ {schema_type}: Valid")
                 return True
             else:
@@ -205,7 +514,18 @@ def main():
         if not run_validation(args.ads, "ad_copy"):
             all_valid = False
 
-    if args.all:
+    if args.all and args.json:
+        try:
+            with open(args.all, "r") as f:
+                full_data = json.load(f)
+            for key in ["keyword_analysis", "campaign_structure", "ad_copy"]:
+                if key in full_data:
+                    report[key] = [v.to_dict() for v in validate_table(full_data[key], key)]
+                    all_valid = all_valid and not report[key]
+        except Exception as e:
+            report["all"] = [Violation(None, None, "load", ERROR, f"{args.all}: {e}").to_dict()]
+            all_valid = False
+    elif args.all:
         print(f"Validating full deliverable from {args.all}...")
         try:
             with open(args.all, "r") as f:
@@ -228,6 +548,10 @@ def main():
             print(f"❌ Error processing --all file: {str(e)}")
             all_valid = False
 
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        sys.exit(0 if all_valid else 1)
+
     if not all_valid:
         sys.exit(1)
     else: